@@ -30,7 +30,9 @@ from app.admin.schemas import (
 )
 from app.api.current_user import get_current_user
 from app.api.dependencies import get_db
+from app.bingo import redis_store
 from app.bot.notify import notify_withdrawal_decision
+from app.core import executors
 from app.models.request_tr import WithdrawRequest
 from app.models.user import User
 
@@ -271,6 +273,17 @@ def get_audit(
     return service.audit_feed(db, limit, offset)
 
 
+@router.get("/runtime")
+async def get_runtime_stats(
+    _: User = Depends(require_admin),
+):
+    """This process's Bingo room-lock queueing and DB executor pool stats."""
+    return {
+        "bingo_room_lock": redis_store.room_lock_stats(),
+        "db_executors": executors.stats(),
+    }
+
+
 @router.get("/bingo-bot")
 async def get_bingo_bot(
     _: User = Depends(require_admin),
@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.admin.helpers import mask_account, sanitize
+from app.core import identity
 from app.models.admin_audit_log import AdminAuditLog
 from app.models.aviator_game import AviatorBet, AviatorRound
 from app.models.bingo_game import BingoGame, BingoGameResult
@@ -523,6 +524,7 @@ def adjust_balance(
             target = db.query(User).filter(User.id == user_id).first()
             return {"idempotent": True, "balance": money(target.balance if target else 0)}
         raise
+    identity.invalidate(user_id)
     return {"idempotent": False, "balance": money(after)}
 
 
@@ -798,7 +800,7 @@ async def bingo_bot_status() -> dict:
     room_status = None
     bot_user_id = house_bot.cached_bot_user_id()
     try:
-        room = await redis_store.get_room(room_id)
+        room = await redis_store.get_room(room_id, parts=())
         room_status = room.status if room else None
         if bot_user_id:
             board_map = await redis_store.get_board_map(room_id)
@@ -30,6 +30,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.admin.helpers import is_admin, normalize_username, sanitize
+from app.core import identity
 from app.models.admin_audit_log import AdminAuditLog
 from app.models.aviator_game import AviatorBet
 from app.models.bingo_game import BingoGameResult
@@ -263,6 +264,8 @@ def delete_user_by_query(
             return {"idempotent": True, **(existing.after_data or {})}
         raise
 
+    identity.invalidate(before["id"])
+
     return {"idempotent": False, **after}
 
 
@@ -354,4 +357,6 @@ def delete_all_non_protected_users(
             return {"idempotent": True, **(existing.after_data or {})}
         raise
 
+    identity.invalidate(*deleted_ids)
+
     return {"idempotent": False, **after}
@@ -1,9 +1,10 @@
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_db
+from app.core.identity import Identity, authenticate
 from app.core.security import (
     security_scheme,
     decode_access_token,
@@ -31,4 +32,21 @@ def get_current_user(
     if not user:
         raise Exception("User not found")
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_current_identity(
+    credentials=Depends(security_scheme),
+) -> Identity:
+    """Cached alternative to ``get_current_user`` for routes that only need
+    the caller's id/name - no ``users`` query on a cache hit."""
+
+    identity = await authenticate(credentials.credentials)
+
+    if identity is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    return identity
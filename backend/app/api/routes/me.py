@@ -6,9 +6,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api import profile_service
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity
 from app.api.dependencies import get_db
-from app.models.user import User
+from app.core.identity import Identity
 
 router = APIRouter(prefix="/me", tags=["me"])
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/me", tags=["me"])
 @router.get("/profile-summary")
 def get_profile_summary(
     limit: int = Query(5, ge=1, le=20),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     """Light profile metadata (no heavy per-game history arrays)."""
@@ -28,7 +28,7 @@ def get_history(
     game: str = Query(..., pattern="^(bingo|dama|aviator|plinko|lotto)$"),
     limit: int = Query(5, ge=1, le=20),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     """Paginated history for one game title: {items, total, limit, offset}."""
@@ -45,7 +45,7 @@ def get_payments(
     type: str = Query(..., pattern="^(deposit|withdraw)$"),
     limit: int = Query(5, ge=1, le=20),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     """Current user's deposit or withdraw rows only (never other users)."""
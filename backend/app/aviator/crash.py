@@ -46,6 +46,18 @@ def multiplier_at(elapsed_sec: float) -> float:
     return round(min(MAX_CRASH, raw), 2)
 
 
+def seconds_to_reach(mult: float) -> float:
+    """Flight time at which the curve reaches ``mult`` (inverse of
+    ``multiplier_at``)."""
+    return max(0.0, math.log(max(mult, START_MULT) / START_MULT) / MULT_GROWTH)
+
+
+def growth_curve() -> dict:
+    """Curve parameters sent to clients so they can extrapolate the
+    multiplier locally between sync frames."""
+    return {"start": START_MULT, "growth": MULT_GROWTH, "max": MAX_CRASH}
+
+
 def pool_remaining(total_stake: Decimal, total_payout: Decimal) -> Decimal:
     return (total_stake - total_payout).quantize(Decimal("0.01"))
 
@@ -3,44 +3,60 @@
 A Redis leader lock ensures only one backend process advances the round.
 Followers stay in a continuous retry loop so leadership can fail over when
 the previous owner dies or releases the lock.
+
+The multiplier is a pure function of flight time, so clients draw it from
+the flight-start ``phase`` frame (``flying_started_at``, ``server_now``,
+curve) and only get a sync ``tick`` every ``SYNC_INTERVAL``; the leader
+wakes exactly at the crash time to send the authoritative ``crashed`` frame,
+and at each auto cash-out target to settle the bets waiting on it.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import time
 import uuid
 
 from app.aviator import store
-from app.aviator.crash import START_MULT, generate_crash_point
+from app.aviator.crash import START_MULT, generate_crash_point, seconds_to_reach
 from app.aviator import service
+from app.core.redis_scripts import register_script
 
 logger = logging.getLogger(__name__)
 
 BETTING_SECONDS = 5.0
 # Keep the crash result readable before opening the single 5-second countdown.
 CRASHED_SECONDS = 2.0
-TICK_INTERVAL = 0.12
+SYNC_INTERVAL = 1.0
 LEADER_KEY = "aviator:round:leader"
 LEADER_TTL_MS = 8000
 FOLLOWER_POLL_SECONDS = 1.0
+# How long shutdown waits for auto cash-out credits still being written.
+AUTO_CASHOUT_DRAIN_SECONDS = 5.0
 
-_RENEW_LEADER_SCRIPT = """
+_RENEW_LEADER_SCRIPT = register_script(
+    "aviator.renew_leader",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('pexpire', KEYS[1], ARGV[2])
 else
     return 0
 end
-"""
+""",
+)
 
-_RELEASE_LEADER_SCRIPT = """
+_RELEASE_LEADER_SCRIPT = register_script(
+    "aviator.release_leader",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('del', KEYS[1])
 else
     return 0
 end
-"""
+""",
+)
 
 _loop_task: asyncio.Task | None = None
 _leader_id = uuid.uuid4().hex
@@ -58,8 +74,8 @@ async def _renew_leader() -> bool:
     from app.bingo.redis_store import get_redis
 
     redis = get_redis()
-    result = await redis.eval(
-        _RENEW_LEADER_SCRIPT, 1, LEADER_KEY, _leader_id, LEADER_TTL_MS
+    result = await _RENEW_LEADER_SCRIPT(
+        redis, keys=[LEADER_KEY], args=[_leader_id, LEADER_TTL_MS]
     )
     return bool(result)
 
@@ -68,11 +84,16 @@ async def _release_leader() -> None:
     from app.bingo.redis_store import get_redis
 
     redis = get_redis()
-    await redis.eval(_RELEASE_LEADER_SCRIPT, 1, LEADER_KEY, _leader_id)
+    await _RELEASE_LEADER_SCRIPT(redis, keys=[LEADER_KEY], args=[_leader_id])
 
 
 async def _run_as_leader() -> None:
     logger.info("aviator loop started (leader)")
+    # Pay wins a previous leader claimed but died before crediting.
+    try:
+        await service.reconcile_cashouts()
+    except Exception:
+        logger.exception("aviator cash-out reconciliation failed")
     while True:
         if not await _renew_leader():
             logger.info("aviator loop lost leadership")
@@ -98,22 +119,35 @@ async def _run_as_leader() -> None:
         rnd.phase = "flying"
         rnd.crash_multiplier = crash
         rnd.flying_started_at = time.time()
-        store.recalc_totals(rnd)
         await store.save_round(rnd)
         await service.broadcast_phase(rnd, START_MULT)
 
-        # Flying until crash
+        # Flying until crash. Besides the sparse sync ticks, the leader wakes
+        # exactly when the curve reaches the next auto cash-out target.
+        crash_at = rnd.flying_started_at + seconds_to_reach(crash)
+        auto_cashouts = service.auto_cashout_queue(rnd, await store.get_bets(rnd.round_id))
+        next_sync = rnd.flying_started_at + SYNC_INTERVAL
         while True:
+            wake_at = min(next_sync, crash_at)
+            if auto_cashouts:
+                wake_at = min(wake_at, auto_cashouts[0][0])
+            await asyncio.sleep(max(0.0, wake_at - time.time()))
             if not await _renew_leader():
                 return
+            now = time.time()
+            if now >= crash_at:
+                # Last pass before the crash flip: every queued target is
+                # below the crash point, retries included.
+                await service.run_auto_cashouts(rnd, auto_cashouts, math.inf)
+                break
+            await service.run_auto_cashouts(rnd, auto_cashouts, now)
+            if now < next_sync:
+                continue
+            next_sync += SYNC_INTERVAL
             rnd = await store.get_current_round()
             if rnd is None or rnd.phase != "flying":
                 break
-            mult = service.current_multiplier(rnd)
             await service.broadcast_tick(rnd)
-            if mult >= crash:
-                break
-            await asyncio.sleep(TICK_INTERVAL)
 
         rnd = await store.get_current_round()
         if rnd is None:
@@ -174,3 +208,4 @@ async def stop_game_loop() -> None:
         except asyncio.CancelledError:
             pass
     _loop_task = None
+    await service.drain_auto_cashouts(AUTO_CASHOUT_DRAIN_SECONDS)
@@ -4,9 +4,9 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
 
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity
 from app.aviator import wallet as aviator_wallet
-from app.models.user import User
+from app.core.identity import Identity
 
 router = APIRouter(prefix="/aviator", tags=["aviator"])
 
@@ -26,7 +26,7 @@ def stake_presets():
 def history(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
 ):
     return aviator_wallet.get_user_history(str(user.id), limit=limit, offset=offset)
 
@@ -34,6 +34,6 @@ def history(
 @router.get("/leaderboard")
 def leaderboard(
     limit: int = Query(20, ge=1, le=50),
-    _: User = Depends(get_current_user),
+    _: Identity = Depends(get_current_identity),
 ):
     return aviator_wallet.get_top_gainers(limit=limit)
@@ -3,21 +3,28 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import logging
 import time
 import uuid
-from contextlib import asynccontextmanager
+from dataclasses import replace
 from decimal import Decimal
 
 from app.aviator import store
 from app.aviator import wallet as aviator_wallet
 from app.aviator.crash import (
+    MAX_CRASH,
     MIN_CASHOUT_MULT,
     START_MULT,
     cashout_payout,
+    growth_curve,
     multiplier_at,
+    seconds_to_reach,
 )
 from app.aviator.manager import hub
 
+logger = logging.getLogger(__name__)
+
 
 class AviatorError(Exception):
     def __init__(self, message: str) -> None:
@@ -25,40 +32,15 @@ class AviatorError(Exception):
         self.message = message
 
 
-@asynccontextmanager
-async def _round_mutation_lock(round_id: str):
-    """Serialize bet/cash-out mutations so balances and the pool cannot race."""
-    from app.bingo.redis_store import get_redis
-
-    redis = get_redis()
-    key = f"aviator:round:{round_id}:mutation"
-    token = uuid.uuid4().hex
-    acquired = False
-    for _ in range(40):
-        if await redis.set(key, token, nx=True, px=10000):
-            acquired = True
-            break
-        await asyncio.sleep(0.025)
-    if not acquired:
-        raise AviatorError("Round is busy — please try again")
-
-    try:
-        yield
-    finally:
-        await redis.eval(
-            "if redis.call('get', KEYS[1]) == ARGV[1] "
-            "then return redis.call('del', KEYS[1]) else return 0 end",
-            1,
-            key,
-            token,
-        )
-
-
 def _public_round(round: store.LiveRound, current_mult: float | None = None) -> dict:
     payload = round.to_dict()
     payload["type"] = "round_state"
     if current_mult is not None:
         payload["multiplier"] = current_mult
+    # Clients derive the live multiplier from ``flying_started_at`` and the
+    # curve; ``server_now`` lets them correct for their own clock skew.
+    payload["server_now"] = time.time()
+    payload["curve"] = growth_curve()
     return payload
 
 
@@ -87,7 +69,7 @@ async def end_flying_round(rnd: store.LiveRound, crash_mult: float) -> None:
 
 
 async def snapshot() -> dict:
-    rnd = await store.get_current_round()
+    rnd = await store.get_current_round(with_bets=True)
     history = await store.get_history()
     if rnd is None:
         return {"type": "round_state", "phase": "waiting", "history": history, "bets": []}
@@ -98,11 +80,26 @@ async def snapshot() -> dict:
     return payload
 
 
+def _parse_auto_cashout(raw) -> float | None:
+    if raw is None or raw == "":
+        return None
+    try:
+        target = round(float(raw), 2)
+    except (TypeError, ValueError) as exc:
+        raise AviatorError("Invalid auto cash-out multiplier") from exc
+    if not MIN_CASHOUT_MULT <= target <= MAX_CRASH:
+        raise AviatorError(
+            f"Auto cash-out must be between {MIN_CASHOUT_MULT:.2f}x and {MAX_CRASH:.2f}x"
+        )
+    return target
+
+
 async def place_bet(
     user_id: str,
     display_name: str,
     stake_raw,
     slot: int = 0,
+    auto_cashout_at=None,
 ) -> dict:
     rnd = await store.get_current_round()
     if rnd is None or rnd.phase != "betting":
@@ -111,30 +108,46 @@ async def place_bet(
         raise AviatorError("Only one bet is allowed per round")
 
     stake = aviator_wallet.parse_stake(stake_raw)
-    async with _round_mutation_lock(rnd.round_id):
-        rnd = await store.get_current_round()
-        if rnd is None or rnd.phase != "betting" or _betting_seconds_left(rnd) <= 0:
-            raise AviatorError("Betting window closed")
-        if any(b.user_id == user_id for b in rnd.bets):
+    auto_target = _parse_auto_cashout(auto_cashout_at)
+    if _betting_seconds_left(rnd) <= 0:
+        raise AviatorError("Betting window closed")
+    if await store.get_bet(rnd.round_id, user_id) is not None:
+        raise AviatorError("You already have a bet this round")
+
+    balance = await aviator_wallet.charge_bet_async(user_id, stake, rnd.round_code)
+
+    now = time.time()
+    bet = store.LiveBet(
+        bet_id=uuid.uuid4().hex,
+        user_id=user_id,
+        display_name=display_name,
+        stake=str(stake),
+        slot=0,
+        placed_at=now,
+        auto_cashout_at=auto_target,
+    )
+    # The script re-checks the phase and the one-bet rule atomically; a stake
+    # charged by a request that lost either race goes straight back.
+    try:
+        status = await store.add_bet(rnd, bet, now)
+    except Exception:
+        # A timeout may land after the script ran: only refund a bet that
+        # really isn't there (or can't be checked because Redis is down).
+        try:
+            placed = await store.get_bet(rnd.round_id, user_id)
+        except Exception:
+            placed = None
+        if placed is None or placed.bet_id != bet.bet_id:
+            await aviator_wallet.refund_bet_async(user_id, stake, rnd.round_code)
+        raise
+    if status != "ok":
+        await aviator_wallet.refund_bet_async(user_id, stake, rnd.round_code)
+        if status == "exists":
             raise AviatorError("You already have a bet this round")
+        raise AviatorError("Betting window closed")
 
-        balance = await asyncio.to_thread(
-            aviator_wallet.charge_bet, user_id, stake, rnd.round_code
-        )
-
-        bet = store.LiveBet(
-            bet_id=uuid.uuid4().hex,
-            user_id=user_id,
-            display_name=display_name,
-            stake=str(stake),
-            slot=0,
-        )
-        rnd.bets.append(bet)
-        store.recalc_totals(rnd)
-        await store.save_round(rnd)
-
-    # Delta only — clients merge ``bet`` into local ``round.bets``. Redis still
-    # holds the full growing bet list; we just stop fanning it to every socket.
+    # Delta only — clients merge ``bet`` into local ``round.bets``; the full
+    # list stays in the round's Redis hash.
     msg = {
         "type": "bet_placed",
         "bet": bet.to_dict(),
@@ -153,83 +166,250 @@ async def cash_out(user_id: str, bet_id: str | None = None, slot: int | None = N
     if rnd is None or rnd.phase != "flying":
         raise AviatorError("Cannot cash out now")
 
-    async with _round_mutation_lock(rnd.round_id):
-        rnd = await store.get_current_round()
-        if rnd is None or rnd.phase != "flying":
-            raise AviatorError("Cannot cash out now")
-
-        mult_live = current_multiplier(rnd)
-        if rnd.crash_multiplier is not None and mult_live >= rnd.crash_multiplier:
-            raise AviatorError("Too late — plane flew away")
-        if mult_live < MIN_CASHOUT_MULT:
-            raise AviatorError(f"Wait until at least {MIN_CASHOUT_MULT:.2f}x to cash out")
-
-        target: store.LiveBet | None = None
-        for b in rnd.bets:
-            if b.user_id != user_id or b.status != "active":
-                continue
-            if bet_id and b.bet_id == bet_id:
-                target = b
-                break
-            if slot is not None and b.slot == slot:
-                target = b
-                break
-            if bet_id is None and slot is None:
-                target = b
-                break
-
-        if target is None:
-            raise AviatorError("Bet already cashed out or no active bet exists")
-
-        stake = Decimal(target.stake)
-        win = cashout_payout(stake, mult_live)
-        if win <= 0:
-            raise AviatorError("Invalid cash-out amount")
-
-        balance = await asyncio.to_thread(
-            aviator_wallet.credit_cashout,
-            user_id,
-            win,
-            rnd.round_code,
-            target.bet_id,
-        )
+    mult_live = current_multiplier(rnd)
+    if rnd.crash_multiplier is not None and mult_live >= rnd.crash_multiplier:
+        raise AviatorError("Too late — plane flew away")
+    if mult_live < MIN_CASHOUT_MULT:
+        raise AviatorError(f"Wait until at least {MIN_CASHOUT_MULT:.2f}x to cash out")
+
+    active = await store.get_bet(rnd.round_id, user_id)
+    if (
+        active is None
+        or active.status != "active"
+        or (bet_id and active.bet_id != bet_id)
+        or (not bet_id and slot is not None and active.slot != slot)
+    ):
+        raise AviatorError("Bet already cashed out or no active bet exists")
+
+    msg, balance = await _settle_cash_out(rnd, active, mult_live)
+    await hub.broadcast(msg)
 
-        target.status = "cashed"
-        target.cashout_at = float(mult_live)
-        target.win = str(win)
-        store.recalc_totals(rnd)
-        await store.save_round(rnd)
+    return {**msg, "balance": balance}
 
-    msg = {
+
+async def _claim_cash_out(
+    rnd: store.LiveRound,
+    active: store.LiveBet,
+    mult: float,
+) -> store.LiveBet:
+    """Flip ``active`` to cashed at ``mult`` in Redis and return the cashed
+    bet. The script flips only this user's bet, and only while the round is
+    still flying below its crash point, so concurrent cash-outs never wait
+    on each other."""
+    stake = Decimal(active.stake)
+    win = cashout_payout(stake, mult)
+    if win <= 0:
+        raise AviatorError("Invalid cash-out amount")
+
+    target = replace(active, status="cashed", cashout_at=float(mult), win=str(win))
+    status = await store.cash_out_bet(rnd, target, mult)
+    if status == "crashed":
+        raise AviatorError("Too late — plane flew away")
+    if status == "closed":
+        raise AviatorError("Cannot cash out now")
+    if status != "ok":
+        raise AviatorError("Bet already cashed out or no active bet exists")
+    return target
+
+
+def _cashout_message(rnd: store.LiveRound, bet: store.LiveBet) -> dict:
+    return {
         "type": "cashout",
-        "bet_id": target.bet_id,
-        "user_id": user_id,
-        "cashout_at": float(mult_live),
-        "win": str(win),
-        "multiplier": mult_live,
-        "bet": target.to_dict(),
+        "bet_id": bet.bet_id,
+        "user_id": bet.user_id,
+        "cashout_at": bet.cashout_at,
+        "win": bet.win,
+        "multiplier": bet.cashout_at,
+        "bet": bet.to_dict(),
         "round_id": rnd.round_id,
         "total_stake": rnd.total_stake,
         "total_payout": rnd.total_payout,
         "pool_remaining": str(rnd.pool_left()),
         "player_count": rnd.player_count(),
     }
-    await hub.broadcast(msg)
 
-    return {**msg, "balance": balance}
+
+async def _settle_cash_out(
+    rnd: store.LiveRound,
+    active: store.LiveBet,
+    mult: float,
+) -> tuple[dict, str]:
+    """Cash ``active`` out at ``mult``: claim it in Redis, then credit the
+    wallet, putting the bet back if the credit fails. Returns the
+    ``cashout`` frame and the user's new balance."""
+    target = await _claim_cash_out(rnd, active, mult)
+    msg = _cashout_message(rnd, target)
+
+    try:
+        balance = await aviator_wallet.credit_cashout_async(
+            active.user_id,
+            Decimal(target.win),
+            rnd.round_code,
+            target.bet_id,
+        )
+    except Exception:
+        if not await store.revert_cash_out(rnd, active, target.win):
+            logger.exception(
+                "aviator cash-out %s of %s for user %s not credited after round %s ended; "
+                "left pending for reconciliation",
+                target.bet_id,
+                target.win,
+                active.user_id,
+                rnd.round_code,
+            )
+        raise
+
+    await _clear_pending_credit(target.bet_id)
+    return msg, balance
+
+
+async def _clear_pending_credit(bet_id: str) -> None:
+    # The credit landed; a stale entry only costs ``reconcile_cashouts`` an
+    # idempotent no-op credit, so don't fail the cash-out over it.
+    try:
+        await store.clear_pending_credit(bet_id)
+    except Exception:
+        logger.warning("aviator pending credit %s not cleared", bet_id, exc_info=True)
+
+
+AutoCashout = tuple[float, float, str, store.LiveBet]
+
+# Backoff for a failed auto cash-out claim and between credit attempts.
+AUTO_CASHOUT_RETRY_SECONDS = 0.25
+AUTO_CASHOUT_CREDIT_ATTEMPTS = 5
+
+_auto_credits: set[asyncio.Task] = set()
+
+
+def auto_cashout_queue(rnd: store.LiveRound, bets: list[store.LiveBet]) -> list[AutoCashout]:
+    """Heap of ``(due_at, target, bet_id, bet)`` for active bets whose auto
+    cash-out target the curve reaches before the crash point."""
+    crash = rnd.crash_multiplier or START_MULT
+    queue = [
+        (
+            rnd.flying_started_at + seconds_to_reach(b.auto_cashout_at),
+            b.auto_cashout_at,
+            b.bet_id,
+            b,
+        )
+        for b in bets
+        if b.status == "active" and b.auto_cashout_at and b.auto_cashout_at < crash
+    ]
+    heapq.heapify(queue)
+    return queue
+
+
+async def run_auto_cashouts(rnd: store.LiveRound, queue: list[AutoCashout], now: float) -> None:
+    """Claim every queued bet due by ``now`` at its own target.
+
+    Only Redis is touched here, so the flight loop keeps its timing; a claim
+    that errors goes back on the queue. The wallet credits run in a tracked
+    background task (one ``cashout_writer`` batch) and keep the claim: the
+    target was reached below the crash point, so the win stands and the
+    idempotent credit is retried rather than the bet reverted. The claim
+    also recorded a pending credit, so a credit that never lands (retries
+    exhausted, or the process died) is paid by ``reconcile_cashouts``."""
+    due: list[AutoCashout] = []
+    while queue and queue[0][0] <= now:
+        due.append(heapq.heappop(queue))
+    if not due:
+        return
+
+    results = await asyncio.gather(
+        *(_claim_cash_out(rnd, bet, target) for _, target, _, bet in due),
+        return_exceptions=True,
+    )
+    claimed: list[tuple[store.LiveBet, dict]] = []
+    for (_, target, bet_id, bet), result in zip(due, results):
+        if isinstance(result, AviatorError):
+            continue  # cashed out by hand first
+        if isinstance(result, Exception):
+            logger.warning("aviator auto cash-out claim failed for bet %s; retrying", bet_id, exc_info=result)
+            heapq.heappush(queue, (now + AUTO_CASHOUT_RETRY_SECONDS, target, bet_id, bet))
+            continue
+        claimed.append((result, _cashout_message(rnd, result)))
+
+    if claimed:
+        task = asyncio.create_task(_credit_auto_cashouts(rnd.round_code, claimed))
+        _auto_credits.add(task)
+        task.add_done_callback(_auto_credits.discard)
+
+
+async def _credit_auto_cashouts(round_code: str, claimed: list[tuple[store.LiveBet, dict]]) -> None:
+    results = await asyncio.gather(
+        *(_credit_with_retry(bet, round_code) for bet, _ in claimed),
+        return_exceptions=True,
+    )
+    for (bet, msg), result in zip(claimed, results):
+        if isinstance(result, Exception):
+            # Not announced: the player only sees a cash-out once it's paid.
+            logger.error(
+                "aviator auto cash-out %s of %s for user %s not credited (round %s); "
+                "left pending for reconciliation",
+                bet.bet_id,
+                bet.win,
+                bet.user_id,
+                round_code,
+                exc_info=result,
+            )
+            continue
+        await _clear_pending_credit(bet.bet_id)
+        await hub.broadcast(msg, exclude=bet.user_id)
+        await hub.send(bet.user_id, {**msg, "balance": result})
+
+
+async def _credit_with_retry(bet: store.LiveBet, round_code: str) -> str:
+    for attempt in range(AUTO_CASHOUT_CREDIT_ATTEMPTS):
+        try:
+            return await aviator_wallet.credit_cashout_async(
+                bet.user_id, Decimal(bet.win), round_code, bet.bet_id
+            )
+        except Exception:
+            if attempt == AUTO_CASHOUT_CREDIT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(AUTO_CASHOUT_RETRY_SECONDS * 2**attempt)
+
+
+async def drain_auto_cashouts(timeout: float) -> None:
+    """Wait (up to ``timeout``) for in-flight auto cash-out credits."""
+    if _auto_credits:
+        await asyncio.wait(set(_auto_credits), timeout=timeout)
+
+
+async def reconcile_cashouts() -> None:
+    """Credit cash-outs whose wallet write never landed: retries exhausted,
+    or a process that died between the claim and the credit. Credits are
+    idempotent on bet id, so an entry that did land is just cleared."""
+    for bet, round_code in await store.get_pending_credits():
+        try:
+            await aviator_wallet.credit_cashout_async(
+                bet.user_id, Decimal(bet.win), round_code, bet.bet_id
+            )
+        except Exception:
+            logger.exception(
+                "aviator cash-out %s of %s for user %s still not credited (round %s)",
+                bet.bet_id,
+                bet.win,
+                bet.user_id,
+                round_code,
+            )
+            continue
+        await store.clear_pending_credit(bet.bet_id)
 
 
 async def settle_round(rnd: store.LiveRound) -> None:
     """Mark uncashed bets as lost and persist to Postgres."""
-    for b in rnd.bets:
-        if b.status == "active":
-            b.status = "lost"
+    await reconcile_cashouts()
+    rnd.bets = await store.get_bets(rnd.round_id)
+    lost = [b for b in rnd.bets if b.status == "active"]
+    for b in lost:
+        b.status = "lost"
+    await store.mark_lost(rnd.round_id, lost)
 
     store.recalc_totals(rnd)
     crash = rnd.crash_multiplier or START_MULT
 
-    await asyncio.to_thread(
-        aviator_wallet.record_round_finish,
+    await aviator_wallet.record_round_finish_async(
         round_code=rnd.round_code,
         crash_multiplier=crash,
         player_count=rnd.player_count(),
@@ -244,6 +424,7 @@ async def settle_round(rnd: store.LiveRound) -> None:
 
 
 async def broadcast_tick(rnd: store.LiveRound) -> None:
+    """Sparse in-flight sync frame; clients extrapolate between them."""
     mult = current_multiplier(rnd)
     await hub.broadcast(
         {
@@ -251,11 +432,15 @@ async def broadcast_tick(rnd: store.LiveRound) -> None:
             "round_id": rnd.round_id,
             "multiplier": mult,
             "phase": rnd.phase,
+            "server_now": time.time(),
         }
     )
 
 
 async def broadcast_phase(rnd: store.LiveRound, mult: float | None = None) -> None:
+    # Phase frames carry the full bet list (a handful per round); the round
+    # objects the loop passes around are loaded without it.
+    rnd.bets = await store.get_bets(rnd.round_id)
     payload = _public_round(rnd, mult)
     payload["type"] = "phase"
     payload["history"] = await store.get_history()
@@ -1,4 +1,14 @@
-"""Redis live state for the global Aviator round."""
+"""Redis live state for the global Aviator round.
+
+The round itself (phase, timings, crash point) is one small JSON value at
+``aviator:round:current``. Bets live beside it in a per-round hash keyed by
+user id (``aviator:round:<id>:bets``) and the running totals in a counter
+hash (``aviator:round:<id>:totals``: stake/payout in cents, player count)
+updated atomically in Lua, so placing a bet or cashing out touches one field
+and the flight loop only ever decodes the round core. The bet scripts check
+the round's phase themselves, which is what lets bets and cash-outs run
+without a round-wide lock.
+"""
 
 from __future__ import annotations
 
@@ -13,11 +23,101 @@ from typing import Any, Literal
 
 from app.bingo.redis_store import get_redis
 from app.aviator.crash import pool_remaining
+from app.core.redis_scripts import register_script
 
 ROUND_KEY = "aviator:round:current"
 HISTORY_KEY = "aviator:history"
+# bet_id -> cashed bet still owed its wallet credit. Written by the cash-out
+# script together with the claim, cleared once the credit (or a revert)
+# lands, so a crash in between leaves the win to ``reconcile_cashouts``.
+PENDING_CREDITS_KEY = "aviator:cashouts:pending"
 HISTORY_MAX = 30
 ROUND_TTL = 3600
+CENTS = Decimal("0.01")
+
+# Bet transitions check the round core in the same script, so a bet can only
+# land while betting is open and a cash-out only while the plane is flying
+# below its crash point; each user's bet is its own field, so transitions
+# for different players never contend.
+_ROUND_GUARD = """
+local raw = redis.call('get', KEYS[1])
+if not raw then
+    return {'closed'}
+end
+local round = cjson.decode(raw)
+if round.round_id ~= ARGV[1] or round.phase ~= ARGV[2] then
+    return {'closed'}
+end
+"""
+
+_TOTALS = """
+local totals = redis.call('hmget', KEYS[3], 'stake_cents', 'payout_cents', 'players')
+return {'ok', totals[1], totals[2], totals[3]}
+"""
+
+# Insert a user's bet (at most one per round) while betting is open.
+_ADD_BET_SCRIPT = register_script(
+    "aviator.add_bet",
+    _ROUND_GUARD
+    + """
+local ends = round.betting_ends_at
+if type(ends) ~= 'number' or tonumber(ARGV[3]) >= ends then
+    return {'closed'}
+end
+if redis.call('hsetnx', KEYS[2], ARGV[4], ARGV[5]) == 0 then
+    return {'exists'}
+end
+redis.call('hincrby', KEYS[3], 'stake_cents', ARGV[6])
+redis.call('hincrby', KEYS[3], 'players', 1)
+redis.call('expire', KEYS[2], ARGV[7])
+redis.call('expire', KEYS[3], ARGV[7])
+"""
+    + _TOTALS,
+)
+
+# Move one bet active -> cashed while flying below the crash point.
+_CASH_OUT_SCRIPT = register_script(
+    "aviator.cash_out",
+    _ROUND_GUARD
+    + """
+local crash = round.crash_multiplier
+if type(crash) == 'number' and tonumber(ARGV[3]) >= crash then
+    return {'crashed'}
+end
+local current = redis.call('hget', KEYS[2], ARGV[4])
+if not current then
+    return {'missing'}
+end
+local bet = cjson.decode(current)
+if bet.bet_id ~= ARGV[5] or bet.status ~= 'active' then
+    return {'missing'}
+end
+redis.call('hset', KEYS[2], ARGV[4], ARGV[6])
+redis.call('hincrby', KEYS[3], 'payout_cents', ARGV[7])
+redis.call('hset', KEYS[4], ARGV[5], ARGV[8])
+"""
+    + _TOTALS,
+)
+
+# Put a bet back to active when the credit failed and the round still flies.
+_REVERT_CASH_OUT_SCRIPT = register_script(
+    "aviator.revert_cash_out",
+    _ROUND_GUARD
+    + """
+local current = redis.call('hget', KEYS[2], ARGV[3])
+if not current then
+    return {'missing'}
+end
+local bet = cjson.decode(current)
+if bet.bet_id ~= ARGV[4] or bet.status ~= 'cashed' then
+    return {'missing'}
+end
+redis.call('hset', KEYS[2], ARGV[3], ARGV[5])
+redis.call('hincrby', KEYS[3], 'payout_cents', -tonumber(ARGV[6]))
+redis.call('hdel', KEYS[4], ARGV[4])
+"""
+    + _TOTALS,
+)
 
 Phase = Literal["betting", "flying", "crashed"]
 
@@ -32,6 +132,9 @@ class LiveBet:
     status: Literal["active", "cashed", "lost"] = "active"
     cashout_at: float | None = None
     win: str | None = None
+    placed_at: float = 0.0
+    # Multiplier the leader cashes this bet out at (None = manual only).
+    auto_cashout_at: float | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -47,6 +150,8 @@ class LiveBet:
             status=data.get("status") or "active",
             cashout_at=float(data["cashout_at"]) if data.get("cashout_at") else None,
             win=str(data["win"]) if data.get("win") is not None else None,
+            placed_at=float(data.get("placed_at") or 0.0),
+            auto_cashout_at=float(data["auto_cashout_at"]) if data.get("auto_cashout_at") else None,
         )
 
 
@@ -60,11 +165,13 @@ class LiveRound:
     flying_started_at: float | None = None
     total_stake: str = "0"
     total_payout: str = "0"
+    players: int = 0
+    # Only filled by ``get_current_round(with_bets=True)`` / ``get_bets``.
     bets: list[LiveBet] = field(default_factory=list)
     db_round_id: str | None = None
 
     def player_count(self) -> int:
-        return len({b.user_id for b in self.bets})
+        return self.players
 
     def pool_left(self) -> Decimal:
         return pool_remaining(Decimal(self.total_stake), Decimal(self.total_payout))
@@ -86,9 +193,25 @@ class LiveRound:
             "db_round_id": self.db_round_id,
         }
 
+    def core_dict(self) -> dict[str, Any]:
+        """The fields stored at ``ROUND_KEY`` (no bets, no totals)."""
+        return {
+            "round_id": self.round_id,
+            "round_code": self.round_code,
+            "phase": self.phase,
+            "crash_multiplier": self.crash_multiplier,
+            "betting_ends_at": self.betting_ends_at,
+            "flying_started_at": self.flying_started_at,
+            "db_round_id": self.db_round_id,
+        }
+
+    def apply_totals(self, stake_cents, payout_cents, players) -> None:
+        self.total_stake = str(_from_cents(stake_cents))
+        self.total_payout = str(_from_cents(payout_cents))
+        self.players = int(players or 0)
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> LiveRound:
-        bets = [LiveBet.from_dict(b) for b in data.get("bets") or []]
         return cls(
             round_id=str(data["round_id"]),
             round_code=str(data["round_code"]),
@@ -96,29 +219,173 @@ class LiveRound:
             crash_multiplier=float(data["crash_multiplier"]) if data.get("crash_multiplier") else None,
             betting_ends_at=float(data["betting_ends_at"]) if data.get("betting_ends_at") else None,
             flying_started_at=float(data["flying_started_at"]) if data.get("flying_started_at") else None,
-            total_stake=str(data.get("total_stake") or "0"),
-            total_payout=str(data.get("total_payout") or "0"),
-            bets=bets,
             db_round_id=data.get("db_round_id"),
         )
 
 
+def _to_cents(amount: Decimal | str) -> int:
+    return int(Decimal(amount).quantize(CENTS) * 100)
+
+
+def _from_cents(cents) -> Decimal:
+    return (Decimal(int(cents or 0)) / 100).quantize(CENTS)
+
+
+def bets_key(round_id: str) -> str:
+    return f"aviator:round:{round_id}:bets"
+
+
+def totals_key(round_id: str) -> str:
+    return f"aviator:round:{round_id}:totals"
+
+
 def _round_code() -> str:
     alphabet = string.ascii_uppercase + string.digits
     return "AV" + "".join(secrets.choice(alphabet) for _ in range(8))
 
 
-async def get_current_round() -> LiveRound | None:
+async def get_current_round(*, with_bets: bool = False) -> LiveRound | None:
+    """The live round with its totals; bets only when ``with_bets``."""
     redis = get_redis()
     raw = await redis.get(ROUND_KEY)
     if not raw:
         return None
-    return LiveRound.from_dict(json.loads(raw))
+    rnd = LiveRound.from_dict(json.loads(raw))
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hmget(totals_key(rnd.round_id), "stake_cents", "payout_cents", "players")
+        if with_bets:
+            pipe.hvals(bets_key(rnd.round_id))
+        results = await pipe.execute()
+    rnd.apply_totals(*results[0])
+    if with_bets:
+        rnd.bets = _decode_bets(results[1])
+    return rnd
 
 
 async def save_round(round: LiveRound) -> None:
+    """Persist the round core (phase/timings); bets and totals are written
+    only through the bet functions below."""
+    redis = get_redis()
+    await redis.set(ROUND_KEY, json.dumps(round.core_dict()), ex=ROUND_TTL)
+
+
+def _decode_bets(raw_bets) -> list[LiveBet]:
+    bets = [LiveBet.from_dict(json.loads(raw)) for raw in raw_bets]
+    bets.sort(key=lambda b: b.placed_at)
+    return bets
+
+
+async def get_bets(round_id: str) -> list[LiveBet]:
+    redis = get_redis()
+    return _decode_bets(await redis.hvals(bets_key(round_id)))
+
+
+async def get_bet(round_id: str, user_id: str) -> LiveBet | None:
+    redis = get_redis()
+    raw = await redis.hget(bets_key(round_id), user_id)
+    return LiveBet.from_dict(json.loads(raw)) if raw else None
+
+
+def _round_keys(round: LiveRound) -> list[str]:
+    return [ROUND_KEY, bets_key(round.round_id), totals_key(round.round_id)]
+
+
+def _apply_result(round: LiveRound, result) -> str:
+    status, *totals = result
+    if status == "ok":
+        round.apply_totals(*totals)
+    return status
+
+
+async def add_bet(round: LiveRound, bet: LiveBet, now: float) -> str:
+    """Record ``bet`` if betting is still open at ``now`` and refresh
+    ``round``'s totals. Returns ``ok``, ``exists`` (the user already has a
+    bet this round) or ``closed``."""
+    redis = get_redis()
+    result = await _ADD_BET_SCRIPT(
+        redis,
+        keys=_round_keys(round),
+        args=[
+            round.round_id,
+            "betting",
+            now,
+            bet.user_id,
+            json.dumps(bet.to_dict()),
+            _to_cents(bet.stake),
+            ROUND_TTL,
+        ],
+    )
+    return _apply_result(round, result)
+
+
+async def cash_out_bet(round: LiveRound, bet: LiveBet, multiplier: float) -> str:
+    """Move ``bet`` (already filled in as cashed) from active to cashed, add
+    its ``win`` to the payout total and record it as a pending credit,
+    provided the round is still flying below its crash point at
+    ``multiplier``. Returns ``ok``, ``crashed``, ``closed`` or ``missing``
+    (no active bet with that id)."""
     redis = get_redis()
-    await redis.set(ROUND_KEY, json.dumps(round.to_dict()), ex=ROUND_TTL)
+    result = await _CASH_OUT_SCRIPT(
+        redis,
+        keys=[*_round_keys(round), PENDING_CREDITS_KEY],
+        args=[
+            round.round_id,
+            "flying",
+            multiplier,
+            bet.user_id,
+            bet.bet_id,
+            json.dumps(bet.to_dict()),
+            _to_cents(bet.win or "0"),
+            json.dumps({**bet.to_dict(), "round_code": round.round_code}),
+        ],
+    )
+    return _apply_result(round, result)
+
+
+async def revert_cash_out(round: LiveRound, bet: LiveBet, win: str) -> bool:
+    """Undo ``cash_out_bet`` for ``bet`` (passed back in its active state)
+    while the round is still flying. False once the round has moved on."""
+    redis = get_redis()
+    result = await _REVERT_CASH_OUT_SCRIPT(
+        redis,
+        keys=[*_round_keys(round), PENDING_CREDITS_KEY],
+        args=[
+            round.round_id,
+            "flying",
+            bet.user_id,
+            bet.bet_id,
+            json.dumps(bet.to_dict()),
+            _to_cents(win),
+        ],
+    )
+    return _apply_result(round, result) == "ok"
+
+
+async def get_pending_credits() -> list[tuple[LiveBet, str]]:
+    """Cashed bets still owed their credit, with their round codes."""
+    redis = get_redis()
+    pending = []
+    for raw in (await redis.hgetall(PENDING_CREDITS_KEY)).values():
+        data = json.loads(raw)
+        round_code = data.pop("round_code")
+        pending.append((LiveBet.from_dict(data), round_code))
+    return pending
+
+
+async def clear_pending_credit(bet_id: str) -> None:
+    redis = get_redis()
+    await redis.hdel(PENDING_CREDITS_KEY, bet_id)
+
+
+async def mark_lost(round_id: str, bets: list[LiveBet]) -> None:
+    """Store the final ``lost`` status of uncashed bets in one write."""
+    if not bets:
+        return
+    redis = get_redis()
+    await redis.hset(
+        bets_key(round_id),
+        mapping={b.user_id: json.dumps(b.to_dict()) for b in bets},
+    )
 
 
 async def create_round(betting_seconds: float, db_round_id: str | None = None) -> LiveRound:
@@ -151,11 +418,13 @@ async def get_history() -> list[float]:
 
 
 def recalc_totals(round: LiveRound) -> None:
+    """Recompute totals from ``round.bets`` (settlement's final tally)."""
     total = Decimal("0")
     paid = Decimal("0")
     for b in round.bets:
         total += Decimal(b.stake)
         if b.win:
             paid += Decimal(b.win)
-    round.total_stake = str(total.quantize(Decimal("0.01")))
-    round.total_payout = str(paid.quantize(Decimal("0.01")))
+    round.total_stake = str(total.quantize(CENTS))
+    round.total_payout = str(paid.quantize(CENTS))
+    round.players = len({b.user_id for b in round.bets})
@@ -1,23 +1,35 @@
-"""Aviator wallet: bet charges, cash-out credits, round settlement."""
+"""Aviator wallet: bet charges, cash-out credits, round settlement.
+
+The live-round paths (``charge_bet``, ``credit_cashout``,
+``record_round_finish``) have ``*_async`` twins that run the same ORM core on
+the async engine, so bet placement and cash-outs never wait on the default
+threadpool. Cash-out credits are further batched by ``cashout_writer``."""
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import secrets
 import string
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import UUID
 
 from sqlalchemy import func
 
-from app.db.database import SessionLocal
+from app.core.config import settings
+from app.db.database import SessionLocal, run_async
 from app.models.aviator_game import AviatorBet, AviatorRound
 from app.models.user import User
 from app.models.wallet_transaction import WalletTransaction
-from app.services.wallet_service import credit_wallet
+from app.services.wallet_service import LedgerEntry, apply_ledger_entries, credit_wallet
+
+logger = logging.getLogger(__name__)
 
 BET_TX_TYPE = "AVIATOR_BET"
 CASHOUT_TX_TYPE = "AVIATOR_CASHOUT"
+REFUND_TX_TYPE = "AVIATOR_REFUND"
 
 MIN_STAKE = Decimal("1")
 MAX_STAKE = Decimal("500")
@@ -47,19 +59,9 @@ def _load_user(db, user_id: str, *, for_update: bool = False) -> User | None:
 def charge_bet(user_id: str, stake: Decimal, round_code: str) -> str:
     db = SessionLocal()
     try:
-        user = _load_user(db, user_id, for_update=True)
-        if user is None or user.balance < stake:
-            raise ValueError("Insufficient balance")
-        credit_wallet(
-            db,
-            user,
-            amount=-stake,
-            transaction_type=BET_TX_TYPE,
-            description=f"Aviator bet ({round_code}) - {stake} ETB",
-            reference_type="AVIATOR",
-        )
+        balance = _charge_bet(db, user_id, stake, round_code)
         db.commit()
-        return str(user.balance)
+        return balance
     except Exception:
         db.rollback()
         raise
@@ -67,6 +69,45 @@ def charge_bet(user_id: str, stake: Decimal, round_code: str) -> str:
         db.close()
 
 
+async def charge_bet_async(user_id: str, stake: Decimal, round_code: str) -> str:
+    return await run_async(_charge_bet, user_id, stake, round_code)
+
+
+def _charge_bet(db, user_id: str, stake: Decimal, round_code: str) -> str:
+    user = _load_user(db, user_id, for_update=True)
+    if user is None or user.balance < stake:
+        raise ValueError("Insufficient balance")
+    credit_wallet(
+        db,
+        user,
+        amount=-stake,
+        transaction_type=BET_TX_TYPE,
+        description=f"Aviator bet ({round_code}) - {stake} ETB",
+        reference_type="AVIATOR",
+    )
+    return str(user.balance)
+
+
+async def refund_bet_async(user_id: str, stake: Decimal, round_code: str) -> str:
+    """Return a stake that was charged but never made it into the round."""
+    return await run_async(_refund_bet, user_id, stake, round_code)
+
+
+def _refund_bet(db, user_id: str, stake: Decimal, round_code: str) -> str:
+    user = _load_user(db, user_id, for_update=True)
+    if user is None:
+        raise ValueError("User not found")
+    credit_wallet(
+        db,
+        user,
+        amount=stake,
+        transaction_type=REFUND_TX_TYPE,
+        description=f"Aviator bet refund ({round_code}) - {stake} ETB",
+        reference_type="AVIATOR",
+    )
+    return str(user.balance)
+
+
 def credit_cashout(
     user_id: str,
     amount: Decimal,
@@ -77,33 +118,9 @@ def credit_cashout(
         raise ValueError("Invalid payout")
     db = SessionLocal()
     try:
-        uid = UUID(user_id)
-        reference_id = UUID(bet_id)
-        user = _load_user(db, user_id, for_update=True)
-        if user is None:
-            raise ValueError("User not found")
-        existing = (
-            db.query(WalletTransaction)
-            .filter(
-                WalletTransaction.user_id == uid,
-                WalletTransaction.transaction_type == CASHOUT_TX_TYPE,
-                WalletTransaction.reference_id == reference_id,
-            )
-            .first()
-        )
-        if existing is not None:
-            return str(user.balance)
-        credit_wallet(
-            db,
-            user,
-            amount=amount,
-            transaction_type=CASHOUT_TX_TYPE,
-            description=f"Aviator cash-out ({round_code}) - {amount} ETB",
-            reference_type="AVIATOR",
-            reference_id=reference_id,
-        )
+        balance = _credit_cashout(db, user_id, amount, round_code, bet_id)
         db.commit()
-        return str(user.balance)
+        return balance
     except Exception:
         db.rollback()
         raise
@@ -111,6 +128,153 @@ def credit_cashout(
         db.close()
 
 
+async def credit_cashout_async(
+    user_id: str,
+    amount: Decimal,
+    round_code: str,
+    bet_id: str,
+) -> str:
+    """Queue the credit on ``cashout_writer``; resolves to the new balance
+    once the batch holding it has committed."""
+    if amount <= 0:
+        raise ValueError("Invalid payout")
+    return await cashout_writer.submit(Cashout(user_id, amount, round_code, bet_id))
+
+
+@dataclass(frozen=True, slots=True)
+class Cashout:
+    user_id: str
+    amount: Decimal
+    round_code: str
+    bet_id: str
+
+
+def _credit_cashout(
+    db,
+    user_id: str,
+    amount: Decimal,
+    round_code: str,
+    bet_id: str,
+) -> str:
+    result = _credit_cashouts(db, [Cashout(user_id, amount, round_code, bet_id)])[bet_id]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _credit_cashouts(db, cashouts: list[Cashout]) -> dict[str, str | Exception]:
+    """Credit a batch of cash-outs: lock the users, skip bets that already
+    have an ``AVIATOR_CASHOUT`` row (idempotent on bet id), then one bulk
+    balance UPDATE and one multi-row ledger INSERT. Returns bet_id -> new
+    balance, or the error for that cash-out alone."""
+    results: dict[str, str | Exception] = {}
+    valid: list[tuple[Cashout, UUID, UUID]] = []
+    for cashout in cashouts:
+        try:
+            valid.append((cashout, UUID(cashout.user_id), UUID(cashout.bet_id)))
+        except (ValueError, TypeError):
+            results[cashout.bet_id] = ValueError("User not found")
+    if not valid:
+        return results
+
+    user_ids = sorted({uid for _, uid, _ in valid})
+    balances = dict(
+        db.query(User.id, User.balance)
+        .filter(User.id.in_(user_ids))
+        .order_by(User.id)
+        .with_for_update()
+        .all()
+    )
+    credited = {
+        reference_id
+        for (reference_id,) in db.query(WalletTransaction.reference_id).filter(
+            WalletTransaction.transaction_type == CASHOUT_TX_TYPE,
+            WalletTransaction.reference_id.in_([ref for _, _, ref in valid]),
+        )
+    }
+
+    entries: list[LedgerEntry] = []
+    for cashout, uid, reference_id in valid:
+        if uid not in balances:
+            results[cashout.bet_id] = ValueError("User not found")
+            continue
+        if reference_id in credited:
+            continue
+        credited.add(reference_id)
+        entries.append(
+            LedgerEntry(
+                user_id=uid,
+                amount=cashout.amount,
+                transaction_type=CASHOUT_TX_TYPE,
+                description=f"Aviator cash-out ({cashout.round_code}) - {cashout.amount} ETB",
+                reference_type="AVIATOR",
+                reference_id=reference_id,
+            )
+        )
+
+    balances.update(apply_ledger_entries(db, entries))
+    for cashout, uid, _ in valid:
+        if cashout.bet_id not in results:
+            results[cashout.bet_id] = str(balances[uid])
+    return results
+
+
+class CashoutWriter:
+    """In-process cash-out queue. Credits submitted within
+    ``AVIATOR_CASHOUT_BATCH_MS`` commit together in one transaction, so a
+    crowd cashing out at the same multiplier costs one round trip instead of
+    one transaction (and pooled connection) each."""
+
+    def __init__(self) -> None:
+        self._pending: list[tuple[Cashout, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    def submit(self, cashout: Cashout) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((cashout, future))
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        return future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.AVIATOR_CASHOUT_BATCH_MS / 1000)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        size = max(1, settings.AVIATOR_CASHOUT_BATCH_MAX)
+
+        for start in range(0, len(pending), size):
+            await self._write(pending[start:start + size])
+
+    async def _write(self, batch: list[tuple[Cashout, asyncio.Future]]) -> None:
+        try:
+            results = await run_async(_credit_cashouts, [cashout for cashout, _ in batch])
+        except Exception as exc:
+            if len(batch) > 1:
+                # Don't let one bad row fail everyone: retry one by one.
+                logger.exception("aviator cash-out batch of %d failed; retrying singly", len(batch))
+                for item in batch:
+                    await self._write([item])
+                return
+            results = {batch[0][0].bet_id: exc}
+
+        for cashout, future in batch:
+            if future.done():  # caller went away; the credit still stands
+                continue
+            result = results[cashout.bet_id]
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+cashout_writer = CashoutWriter()
+
+
 def get_balance(user_id: str) -> str | None:
     db = SessionLocal()
     try:
@@ -131,43 +295,20 @@ def record_round_finish(
     bets: list[dict],
 ) -> str:
     """Persist round + bets; return DB round UUID string."""
-    system_fee = (total_stake - total_payout).quantize(Decimal("0.01"))
-    if system_fee < 0:
-        system_fee = Decimal("0")
-
     db = SessionLocal()
     try:
-        rnd = AviatorRound(
+        round_id = _record_round_finish(
+            db,
             round_code=round_code,
-            status="finished",
-            crash_multiplier=Decimal(str(crash_multiplier)),
+            crash_multiplier=crash_multiplier,
             player_count=player_count,
             total_stake=total_stake,
             total_payout=total_payout,
-            system_fee=system_fee,
             max_payout_mult=max_payout_mult,
-            finished_at=datetime.now(timezone.utc),
+            bets=bets,
         )
-        db.add(rnd)
-        db.flush()
-
-        for b in bets:
-            db.add(
-                AviatorBet(
-                    round_id=rnd.id,
-                    user_id=UUID(b["user_id"]),
-                    display_name=b.get("display_name") or "Player",
-                    stake=Decimal(str(b["stake"])),
-                    cashout_multiplier=(
-                        Decimal(str(b["cashout_at"])) if b.get("cashout_at") else None
-                    ),
-                    amount_won=Decimal(str(b.get("win") or "0")),
-                    outcome="won" if b.get("status") == "cashed" else "lost",
-                    slot=int(b.get("slot") or 0),
-                )
-            )
         db.commit()
-        return str(rnd.id)
+        return round_id
     except Exception:
         db.rollback()
         raise
@@ -175,6 +316,75 @@ def record_round_finish(
         db.close()
 
 
+async def record_round_finish_async(
+    *,
+    round_code: str,
+    crash_multiplier: float,
+    player_count: int,
+    total_stake: Decimal,
+    total_payout: Decimal,
+    max_payout_mult: Decimal,
+    bets: list[dict],
+) -> str:
+    return await run_async(
+        _record_round_finish,
+        round_code=round_code,
+        crash_multiplier=crash_multiplier,
+        player_count=player_count,
+        total_stake=total_stake,
+        total_payout=total_payout,
+        max_payout_mult=max_payout_mult,
+        bets=bets,
+    )
+
+
+def _record_round_finish(
+    db,
+    *,
+    round_code: str,
+    crash_multiplier: float,
+    player_count: int,
+    total_stake: Decimal,
+    total_payout: Decimal,
+    max_payout_mult: Decimal,
+    bets: list[dict],
+) -> str:
+    system_fee = (total_stake - total_payout).quantize(Decimal("0.01"))
+    if system_fee < 0:
+        system_fee = Decimal("0")
+
+    rnd = AviatorRound(
+        round_code=round_code,
+        status="finished",
+        crash_multiplier=Decimal(str(crash_multiplier)),
+        player_count=player_count,
+        total_stake=total_stake,
+        total_payout=total_payout,
+        system_fee=system_fee,
+        max_payout_mult=max_payout_mult,
+        finished_at=datetime.now(timezone.utc),
+    )
+    db.add(rnd)
+    db.flush()
+
+    for b in bets:
+        db.add(
+            AviatorBet(
+                round_id=rnd.id,
+                user_id=UUID(b["user_id"]),
+                display_name=b.get("display_name") or "Player",
+                stake=Decimal(str(b["stake"])),
+                cashout_multiplier=(
+                    Decimal(str(b["cashout_at"])) if b.get("cashout_at") else None
+                ),
+                amount_won=Decimal(str(b.get("win") or "0")),
+                outcome="won" if b.get("status") == "cashed" else "lost",
+                slot=int(b.get("slot") or 0),
+            )
+        )
+    return str(rnd.id)
+
+
 def get_user_history(user_id: str, limit: int = 10, offset: int = 0) -> dict:
     db = SessionLocal()
     try:
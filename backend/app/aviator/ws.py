@@ -5,17 +5,14 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.core.security import decode_access_token
 from app.aviator import service
 from app.aviator.game_loop import ensure_game_loop
 from app.aviator.manager import hub
 from app.aviator.service import AviatorError
-from app.db.database import SessionLocal
-from app.models.user import User
+from app.core import executors, identity
 
 logger = logging.getLogger(__name__)
 
@@ -23,40 +20,19 @@ router = APIRouter()
 RECEIVE_TIMEOUT_SECONDS = 60
 
 
-def _authenticate(token: str) -> User | None:
-    try:
-        payload = decode_access_token(token)
-    except Exception:
-        return None
-    user_id = payload.get("sub")
-    if not user_id:
-        return None
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.id == UUID(user_id)).first()
-    except Exception:
-        return None
-    finally:
-        db.close()
-
-
-def _display_name(user: User) -> str:
-    return user.first_name or user.username or f"Player {str(user.id)[:6]}"
-
-
 @router.websocket("/ws/aviator")
 async def aviator_ws(websocket: WebSocket, token: str | None = None):
     if not token:
         await websocket.close(code=4401)
         return
 
-    user = await asyncio.to_thread(_authenticate, token)
+    user = await identity.authenticate(token)
     if user is None:
         await websocket.close(code=4401)
         return
 
     user_id = str(user.id)
-    display_name = _display_name(user)
+    display_name = user.display_name
 
     await websocket.accept()
     ensure_game_loop()
@@ -66,7 +42,7 @@ async def aviator_ws(websocket: WebSocket, token: str | None = None):
         from app.aviator import wallet as aviator_wallet
 
         snap = await service.snapshot()
-        bal = await asyncio.to_thread(aviator_wallet.get_balance, user_id)
+        bal = await executors.history.run(aviator_wallet.get_balance, user_id)
         if bal:
             snap["balance"] = bal
         await websocket.send_text(json.dumps(snap))
@@ -98,7 +74,7 @@ async def aviator_ws(websocket: WebSocket, token: str | None = None):
 
                 elif msg_type == "snapshot":
                     snap = await service.snapshot()
-                    bal = await asyncio.to_thread(aviator_wallet.get_balance, user_id)
+                    bal = await executors.history.run(aviator_wallet.get_balance, user_id)
                     if bal:
                         snap["balance"] = bal
                     await websocket.send_text(json.dumps(snap))
@@ -106,7 +82,13 @@ async def aviator_ws(websocket: WebSocket, token: str | None = None):
                 elif msg_type == "bet":
                     stake = message.get("stake")
                     slot = int(message.get("slot") or 0)
-                    result = await service.place_bet(user_id, display_name, stake, slot)
+                    result = await service.place_bet(
+                        user_id,
+                        display_name,
+                        stake,
+                        slot,
+                        auto_cashout_at=message.get("auto_cashout_at"),
+                    )
                     await websocket.send_text(json.dumps(result))
 
                 elif msg_type == "cashout":
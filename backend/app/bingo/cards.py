@@ -8,16 +8,25 @@ always produces the same 5x5 pattern. The frontend mirrors this exact
 algorithm (see ``frontend/src/utils/cartela.ts``) so it can render lobby
 previews and auto-dab live cards without a round-trip, while the server
 stays the single source of truth for win validation.
+
+Because the pool is fixed, every cartela is generated once per process into
+an immutable table (``cartela_table``: 25 bytes per board, row-major, FREE as
+0) and rounds reference cards by board id instead of rebuilding / storing
+their grids.
 """
 
 from __future__ import annotations
 
 import random
+import threading
 
 from app.bingo.patterns import CARD_SIZE, FREE_COL, FREE_ROW
+from app.core.config import settings
 
 CardGrid = list[list[int | None]]
 
+CELLS_PER_CARD = CARD_SIZE * CARD_SIZE
+
 COLUMN_RANGES: dict[int, tuple[int, int]] = {
     0: (1, 15),
     1: (16, 30),
@@ -28,6 +37,8 @@ COLUMN_RANGES: dict[int, tuple[int, int]] = {
 
 COLUMN_LETTERS = ("B", "I", "N", "G", "O")
 
+ALL_NUMBERS = tuple(range(1, 76))
+
 _UINT32 = 0xFFFFFFFF
 
 
@@ -79,6 +90,62 @@ def generate_card_for_board(board_id: int) -> CardGrid:
     return card
 
 
+_table: bytes = b""
+_table_lock = threading.Lock()
+
+
+def cartela_table(pool_max: int) -> bytes:
+    """Every cartela for boards 1..``pool_max`` packed into one immutable
+    buffer (board ``n`` at ``[(n - 1) * 25:n * 25]``). Built on first use and
+    grown if a larger pool is ever requested."""
+
+    global _table
+
+    if len(_table) >= pool_max * CELLS_PER_CARD:
+        return _table
+
+    with _table_lock:
+        have = len(_table) // CELLS_PER_CARD
+
+        if have < pool_max:
+            _table = _table + b"".join(
+                bytes(
+                    0 if value is None else value
+                    for row in generate_card_for_board(board_id)
+                    for value in row
+                )
+                for board_id in range(have + 1, pool_max + 1)
+            )
+
+    return _table
+
+
+def board_row(board_id: int) -> bytes:
+    """Cached 25-byte row-major cartela for a board (FREE center as 0)."""
+
+    if board_id < 1:
+        raise ValueError(f"Invalid board id {board_id}")
+
+    start = (board_id - 1) * CELLS_PER_CARD
+    table = cartela_table(max(board_id, settings.BINGO_BOARD_POOL_MAX))
+
+    return table[start:start + CELLS_PER_CARD]
+
+
+def card_for_board(board_id: int) -> CardGrid:
+    """Fresh 5x5 grid for a board, served from the cached table."""
+
+    row = board_row(board_id)
+
+    return [
+        [
+            None if value == 0 else value
+            for value in row[r * CARD_SIZE:(r + 1) * CARD_SIZE]
+        ]
+        for r in range(CARD_SIZE)
+    ]
+
+
 def generate_card() -> CardGrid:
     """Random (non-deterministic) cartela - kept for tests / ad-hoc use."""
 
@@ -87,10 +154,7 @@ def generate_card() -> CardGrid:
     return generate_card_for_board(board_id)
 
 
-def empty_marks() -> list[list[bool]]:
-    """Marked-cell grid with the FREE center pre-daubed."""
-
-    marks = [[False] * CARD_SIZE for _ in range(CARD_SIZE)]
-    marks[FREE_ROW][FREE_COL] = True
+def shuffled_draw_order() -> list[int]:
+    """Fresh random call order for one round's balls."""
 
-    return marks
+    return random.sample(ALL_NUMBERS, len(ALL_NUMBERS))
@@ -0,0 +1,202 @@
+"""Optional Bingo cluster mode: consistent-hash room ownership.
+
+With ``BINGO_CLUSTER_MODE`` on, every instance heartbeats into the
+``bingo:cluster:members`` hash (instance id -> public URL + expiry). All
+instances build the same ring from the live members (``VNODES`` points per
+instance, CRC32 so the hash is stable across processes) and therefore agree
+on which instance owns a room without any per-room coordination:
+
+* the owner drives the room's lifecycle (``app.bingo.game_loop``),
+* it keeps the room in memory as the primary copy, with Redis as a
+  write-behind snapshot (``app.bingo.redis_store``), served and flushed only
+  under a per-room Redis lease so two instances that briefly both think
+  they own a room (while the ring converges) never both write it,
+* sockets that land anywhere else get a ``redirect`` hint to the owner.
+
+Rooms must only be mutated on their owner in this mode: joins elsewhere are
+rejected, and an instance that loses a room flushes and evicts it and
+redirects the room's local sockets to the new owner.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import time
+import uuid
+import zlib
+from collections.abc import Awaitable, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MEMBERS_KEY = "bingo:cluster:members"
+VNODES = 64
+HEARTBEAT_SECONDS = 2.0
+MEMBER_TTL_SECONDS = 6.0
+
+instance_id = uuid.uuid4().hex
+
+
+def _point(value: str) -> int:
+    return zlib.crc32(value.encode("utf-8"))
+
+
+class HashRing:
+    """Immutable consistent-hash ring over ``{instance_id: url}``."""
+
+    def __init__(self, members: dict[str, str]) -> None:
+        self.members = dict(members)
+        points = sorted(
+            (_point(f"{member}#{vnode}"), member)
+            for member in self.members
+            for vnode in range(VNODES)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [m for _, m in points]
+
+    def owner(self, room_id: str) -> str | None:
+        if not self._owners:
+            return None
+
+        index = bisect.bisect(self._hashes, _point(room_id)) % len(self._hashes)
+
+        return self._owners[index]
+
+
+_ring = HashRing({})
+_task: asyncio.Task | None = None
+_on_change: list[Callable[[], Awaitable[None]]] = []
+
+
+def enabled() -> bool:
+    return settings.BINGO_CLUSTER_MODE
+
+
+def ring() -> HashRing:
+    return _ring
+
+
+def is_owner(room_id: str) -> bool:
+    """True when this instance owns ``room_id`` (always, outside cluster mode).
+    Before the first heartbeat the ring is empty and nothing is owned."""
+
+    if not enabled():
+        return True
+
+    return _ring.owner(room_id) == instance_id
+
+
+def owner_url(room_id: str) -> str | None:
+    owner = _ring.owner(room_id)
+
+    if owner is None or owner == instance_id:
+        return None
+
+    return _ring.members.get(owner) or None
+
+
+def on_ring_change(callback: Callable[[], Awaitable[None]]) -> None:
+    _on_change.append(callback)
+
+
+async def heartbeat() -> None:
+    """Publish our membership, drop expired members, rebuild the ring."""
+
+    global _ring
+
+    from app.bingo.redis_store import get_redis
+
+    redis = get_redis()
+    now = time.time()
+    me = json.dumps({
+        "url": settings.BINGO_CLUSTER_PUBLIC_URL,
+        "expires_at": now + MEMBER_TTL_SECONDS,
+    })
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(MEMBERS_KEY, instance_id, me)
+        pipe.hgetall(MEMBERS_KEY)
+        _, raw = await pipe.execute()
+
+    members: dict[str, str] = {}
+    expired: list[str] = []
+
+    for member, value in raw.items():
+        try:
+            info = json.loads(value)
+        except (TypeError, ValueError):
+            expired.append(member)
+            continue
+
+        if float(info.get("expires_at", 0)) < now:
+            expired.append(member)
+        else:
+            members[member] = str(info.get("url") or "")
+
+    if expired:
+        await redis.hdel(MEMBERS_KEY, *expired)
+
+    if members != _ring.members:
+        logger.info("bingo cluster ring: %d member(s)", len(members))
+        _ring = HashRing(members)
+
+        for callback in _on_change:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("bingo cluster ring change handler failed")
+
+
+async def _heartbeat_loop() -> None:
+    while True:
+        try:
+            await heartbeat()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("bingo cluster heartbeat failed")
+
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+
+
+async def start() -> None:
+    global _task
+
+    if not enabled() or (_task is not None and not _task.done()):
+        return
+
+    if not settings.BINGO_CLUSTER_PUBLIC_URL:
+        # Other instances redirect this instance's rooms to that URL; without
+        # it their sockets would have nowhere to go.
+        raise RuntimeError("BINGO_CLUSTER_MODE requires BINGO_CLUSTER_PUBLIC_URL")
+
+    await heartbeat()
+    _task = asyncio.create_task(_heartbeat_loop(), name="bingo:cluster")
+
+
+async def stop() -> None:
+    global _task, _ring
+
+    if _task is not None:
+        _task.cancel()
+
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+
+        _task = None
+
+    if enabled():
+        from app.bingo.redis_store import get_redis
+
+        try:
+            await get_redis().hdel(MEMBERS_KEY, instance_id)
+        except Exception:
+            logger.exception("bingo cluster leave failed")
+
+    _ring = HashRing({})
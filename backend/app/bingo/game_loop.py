@@ -1,38 +1,52 @@
-"""Per-room lifecycle worker.
+"""Bingo room lifecycle scheduler.
 
-One asyncio task runs per active room and drives the whole cycle:
+Each room cycles through:
 
     lobby (shared 40s countdown)
       -> in_progress (draw a ball every few seconds, auto-dab client-side)
       -> finished (winner splash)
       -> lobby (fresh countdown)  ...
 
-A Redis-backed leader lock (renewed each iteration) makes sure that if this
-app is ever scaled to multiple instances, only one of them advances a given
-room's state / draws balls - every instance still receives the resulting
-broadcasts via Pub/Sub, so the loop's owner is invisible to clients.
+One scheduler task per process drives every room it leads. Rooms are
+hashed onto ``LEADER_SHARDS`` Redis leases (``bingo:loop:shard:{n}``); a
+process claims / renews all the shards it needs in one pipelined call, so
+only one instance advances a given room while every instance still receives
+the resulting broadcasts via Pub/Sub. Rooms wait in a deadline heap keyed by
+their next event (lobby tick, next ball, end of the winner splash) and cost
+nothing in between.
+
+Rooms are announced in ``bingo:loop:rooms`` by whichever instance saw the
+join, so a shard's leader picks them up even if it has no local players. In
+cluster mode (``app.bingo.cluster``) the shard leases are skipped: each
+instance leads exactly the rooms the hash ring assigns to it.
 """
 
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import logging
 import math
 import random
 import time
 import uuid
+import zlib
+from dataclasses import dataclass
 
 from app.bingo import redis_store, service
-from app.bingo import house_bot
+from app.bingo import cluster, house_bot
+from app.bingo.cards import ALL_NUMBERS
 from app.bingo.manager import manager
 from app.bingo.redis_store import room_lock
 from app.core.config import settings
+from app.core.redis_scripts import eval_many, register_script
 
 logger = logging.getLogger(__name__)
 
-ALL_NUMBERS = tuple(range(1, 76))
-
-LEADER_KEY = "bingo:room:{room_id}:draw_leader"
+LEADER_KEY = "bingo:loop:shard:{shard}"
+ACTIVE_ROOMS_KEY = "bingo:loop:rooms"
+LEADER_SHARDS = 16
 LEADER_TTL_MS = 8000
 LEADER_RENEW_INTERVAL_SECONDS = 3.0
 IDLE_POLL_SECONDS = 1.0
@@ -42,81 +56,266 @@ ABANDON_SECONDS = 20.0
 # shared countdown out from under everyone else.
 LOBBY_EMPTY_GRACE_SECONDS = 5.0
 
-_RENEW_LEADER_SCRIPT = """
-if redis.call('get', KEYS[1]) == ARGV[1] then
+# Take a free shard or extend our own; 1 when we hold it afterwards.
+_CLAIM_SHARD_SCRIPT = register_script(
+    "bingo.claim_loop_shard",
+    """
+local owner = redis.call('get', KEYS[1])
+if owner == ARGV[1] then
     return redis.call('pexpire', KEYS[1], ARGV[2])
-else
-    return 0
 end
-"""
+if not owner then
+    redis.call('set', KEYS[1], ARGV[1], 'px', ARGV[2])
+    return 1
+end
+return 0
+""",
+)
 
-_RELEASE_LEADER_SCRIPT = """
+_RELEASE_SHARD_SCRIPT = register_script(
+    "bingo.release_loop_shard",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('del', KEYS[1])
 else
     return 0
 end
-"""
+""",
+)
 
-_room_tasks: dict[str, asyncio.Task] = {}
 
+def room_shard(room_id: str) -> int:
+    """Stable across processes (``hash()`` is salted per interpreter)."""
 
-def ensure_game_loop(room_id: str) -> None:
-    """Idempotent: safe to call whenever a room might need a running loop
-    (on join, after a manual start, ...)."""
+    return zlib.crc32(room_id.encode("utf-8")) % LEADER_SHARDS
 
-    existing = _room_tasks.get(room_id)
 
-    if existing is not None and not existing.done():
-        return
+@dataclass
+class _RoomSlot:
+    room_id: str
+    due: float | None = None
+    running: bool = False
+    empty_since: float | None = None
+    lobby_empty_since: float | None = None
+    # Set once the wait before the next ball / the winner splash has been
+    # scheduled, so the following wake-up performs the action itself.
+    draw_armed: bool = False
+    finish_armed: bool = False
 
-    task = asyncio.create_task(_run_room_loop(room_id))
-    _room_tasks[room_id] = task
 
+class _Scheduler:
+    def __init__(self) -> None:
+        self.token = uuid.uuid4().hex
+        self.rooms: dict[str, _RoomSlot] = {}
+        self.shards: set[int] = set()
+        self._heap: list[tuple[float, int, str]] = []
+        self._order = itertools.count()
+        self._announce: set[str] = set()
+        self._steps: set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._next_lease = 0.0
+        self._task: asyncio.Task | None = None
 
-async def stop_game_loop(room_id: str) -> None:
-    task = _room_tasks.pop(room_id, None)
+    def leads(self, room_id: str) -> bool:
+        if cluster.enabled():
+            return cluster.is_owner(room_id)
+
+        return room_shard(room_id) in self.shards
+
+    # -- room registry -----------------------------------------------------
+
+    def ensure(self, room_id: str) -> None:
+        # Re-announce even a room we already hold a slot for: another
+        # instance's leader may have dropped it from ``ACTIVE_ROOMS_KEY``, and
+        # the next lease refresh would then discard our parked slot too.
+        self._announce.add(room_id)
+
+        if room_id not in self.rooms:
+            self.rooms[room_id] = _RoomSlot(room_id)
+            # New room: claim its shard now rather than at the next renewal.
+            self._next_lease = 0.0
+
+        slot = self.rooms[room_id]
+
+        if slot.due is None and not slot.running:
+            self._schedule(slot, 0.0)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="bingo:scheduler")
+
+        self._wake.set()
+
+    def _schedule(self, slot: _RoomSlot, delay: float) -> None:
+        slot.due = time.monotonic() + delay
+        heapq.heappush(self._heap, (slot.due, next(self._order), slot.room_id))
+        self._wake.set()
 
-    if task is not None and not task.done():
-        task.cancel()
+    async def drop(self, room_id: str) -> None:
+        self.rooms.pop(room_id, None)
+        self._announce.discard(room_id)
+        await redis_store.get_redis().srem(ACTIVE_ROOMS_KEY, room_id)
+
+    # -- leases --------------------------------------------------------------
+
+    async def _refresh_leases(self) -> None:
+        redis = redis_store.get_redis()
+        announce, self._announce = self._announce, set()
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                if announce:
+                    pipe.sadd(ACTIVE_ROOMS_KEY, *announce)
+                pipe.smembers(ACTIVE_ROOMS_KEY)
+                active = (await pipe.execute())[-1]
+        except Exception:
+            self._announce |= announce
+            raise
+
+        for room_id in active:
+            if room_id not in self.rooms:
+                self.rooms[room_id] = _RoomSlot(room_id)
+
+        for room_id, slot in list(self.rooms.items()):
+            if room_id not in active and not slot.running:
+                del self.rooms[room_id]
+
+        wanted = (
+            set() if cluster.enabled()
+            else {room_shard(room_id) for room_id in self.rooms}
+        )
+        claim = sorted(wanted)
+        release = sorted(self.shards - wanted)
+        calls = [
+            (_CLAIM_SHARD_SCRIPT, [LEADER_KEY.format(shard=n)], [self.token, LEADER_TTL_MS])
+            for n in claim
+        ] + [
+            (_RELEASE_SHARD_SCRIPT, [LEADER_KEY.format(shard=n)], [self.token])
+            for n in release
+        ]
+        results = await eval_many(redis, calls) if calls else []
+
+        self.shards = {n for n, ok in zip(claim, results) if ok}
+
+        for slot in self.rooms.values():
+            if slot.due is None and not slot.running and self.leads(slot.room_id):
+                self._schedule(slot, 0.0)
+
+    async def release_leases(self) -> None:
+        if not self.shards:
+            return
+
+        await eval_many(redis_store.get_redis(), [
+            (_RELEASE_SHARD_SCRIPT, [LEADER_KEY.format(shard=n)], [self.token])
+            for n in self.shards
+        ])
+        self.shards = set()
+
+    # -- main loop -----------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                now = time.monotonic()
+
+                if now >= self._next_lease:
+                    self._next_lease = now + LEADER_RENEW_INTERVAL_SECONDS
+                    await self._refresh_leases()
+
+                while self._heap and self._heap[0][0] <= time.monotonic():
+                    due, _, room_id = heapq.heappop(self._heap)
+                    slot = self.rooms.get(room_id)
+
+                    if slot is None or slot.due != due:
+                        continue  # dropped, or rescheduled since this entry
+
+                    slot.due = None
+
+                    if not self.leads(room_id):
+                        continue  # parked until we lead it
+
+                    slot.running = True
+                    task = asyncio.create_task(self._step(slot))
+                    self._steps.add(task)
+                    task.add_done_callback(self._steps.discard)
+
+                deadline = self._next_lease
+
+                if self._heap:
+                    deadline = min(deadline, self._heap[0][0])
+
+                self._wake.clear()
+
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        max(0.0, deadline - time.monotonic()),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("bingo scheduler iteration error")
+                await asyncio.sleep(IDLE_POLL_SECONDS)
 
+    async def _step(self, slot: _RoomSlot) -> None:
+        # Every step is individually protected: a transient Redis hiccup or a
+        # single failed broadcast must never stop a room (that used to
+        # silently stop lobby ticks -> frozen countdown for everyone until the
+        # next join happened to restart it).
         try:
-            await task
+            delay = await _advance_room(slot)
         except asyncio.CancelledError:
-            pass
+            raise
+        except Exception:
+            logger.exception("bingo room step error for room %s", slot.room_id)
+            delay = IDLE_POLL_SECONDS
+        finally:
+            slot.running = False
 
+        if delay is None:
+            await self.drop(slot.room_id)
+        elif self.rooms.get(slot.room_id) is slot:
+            self._schedule(slot, delay)
 
-async def stop_all() -> None:
-    for room_id in list(_room_tasks.keys()):
-        await stop_game_loop(room_id)
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, *self._steps) if t is not None]
 
+        for task in tasks:
+            task.cancel()
 
-async def _try_acquire_leader(room_id: str, token: str) -> bool:
-    redis = redis_store.get_redis()
-    key = LEADER_KEY.format(room_id=room_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._steps.clear()
 
-    return bool(await redis.set(key, token, nx=True, px=LEADER_TTL_MS))
+        try:
+            await self.release_leases()
+        except Exception:
+            logger.exception("bingo scheduler lease release failed")
 
 
-async def _renew_leader(room_id: str, token: str) -> bool:
-    redis = redis_store.get_redis()
-    key = LEADER_KEY.format(room_id=room_id)
+_scheduler = _Scheduler()
 
-    result = await redis.eval(_RENEW_LEADER_SCRIPT, 1, key, token, LEADER_TTL_MS)
 
-    return bool(result)
+def ensure_game_loop(room_id: str) -> None:
+    """Idempotent: safe to call whenever a room might need driving (on join,
+    after a manual start, ...)."""
 
+    _scheduler.ensure(room_id)
 
-async def _release_leader(room_id: str, token: str) -> None:
-    redis = redis_store.get_redis()
-    key = LEADER_KEY.format(room_id=room_id)
 
-    await redis.eval(_RELEASE_LEADER_SCRIPT, 1, key, token)
+async def stop_game_loop(room_id: str) -> None:
+    await _scheduler.drop(room_id)
+
+
+async def stop_all() -> None:
+    await _scheduler.stop()
 
 
 async def _clear_lobby_timer(room_id: str) -> None:
     async with room_lock(room_id):
-        room = await redis_store.get_room(room_id)
+        room = await redis_store.get_room(room_id, parts=())
 
         if room is not None and room.status == "lobby":
             room.lobby_ends_at = None
@@ -130,125 +329,112 @@ async def _real_connected_count(room: redis_store.RoomState) -> int:
     return house_bot.count_real_connected(room, bot_id)
 
 
-async def _run_room_loop(room_id: str) -> None:
-    token = uuid.uuid4().hex
-    last_renew = 0.0
-    is_leader = False
-    empty_since: float | None = None
-    lobby_empty_since: float | None = None
+async def _advance_room(slot: _RoomSlot) -> float | None:
+    """Run one due event for a room we lead. Returns the delay until its next
+    event, or None once the room no longer needs driving."""
 
-    try:
-        while True:
-            # Every iteration is individually protected: a transient Redis
-            # hiccup or a single failed broadcast must never kill the loop
-            # (that used to silently stop lobby ticks -> frozen countdown for
-            # everyone until the next join happened to restart it).
+    room_id = slot.room_id
+    room = await redis_store.get_room(room_id, parts=("players",))
+
+    if room is None:
+        return None
+
+    real_connected = await _real_connected_count(room)
+
+    if real_connected == 0:
+        # Let the bot release/leave before we treat the lobby as empty.
+        # Always tick so a Redis-disabled bot can still drain boards.
+        if room.status == "lobby":
             try:
-                room = await redis_store.get_room(room_id)
-
-                if room is None:
-                    return
-
-                real_connected = await _real_connected_count(room)
-
-                if real_connected == 0:
-                    # Let the bot release/leave before we treat the lobby as empty.
-                    # Always tick so a Redis-disabled bot can still drain boards.
-                    if room.status == "lobby":
-                        try:
-                            await house_bot.tick_room(room_id)
-                        except Exception:
-                            logger.exception(
-                                "bingo house bot tick failed (empty) room=%s", room_id
-                            )
-                        room = await redis_store.get_room(room_id)
-                        if room is None:
-                            return
-                        real_connected = await _real_connected_count(room)
-
-                if real_connected == 0:
-                    if room.status == "lobby":
-                        now = time.monotonic()
-                        lobby_empty_since = lobby_empty_since or now
-
-                        # Only pause the countdown once the lobby has stayed
-                        # empty past the grace window - a quick reconnect keeps
-                        # the shared countdown running untouched.
-                        if now - lobby_empty_since > LOBBY_EMPTY_GRACE_SECONDS:
-                            await _clear_lobby_timer(room_id)
-                            return
-
-                        await asyncio.sleep(IDLE_POLL_SECONDS)
-                        continue
-
-                    # Give disconnected players a grace window to reconnect
-                    # before abandoning an in-progress / finished round.
-                    now = time.monotonic()
-                    empty_since = empty_since or now
-
-                    if now - empty_since > ABANDON_SECONDS:
-                        await service.reset_to_lobby(room_id)
-                        return
-
-                    await asyncio.sleep(IDLE_POLL_SECONDS)
-                    continue
-
-                empty_since = None
-                lobby_empty_since = None
+                await house_bot.tick_room(room_id)
+            except Exception:
+                logger.exception(
+                    "bingo house bot tick failed (empty) room=%s", room_id
+                )
+            room = await redis_store.get_room(room_id, parts=("players",))
+            if room is None:
+                return None
+            real_connected = await _real_connected_count(room)
 
-                now = time.monotonic()
+    if real_connected == 0:
+        now = time.monotonic()
 
-                if now - last_renew > LEADER_RENEW_INTERVAL_SECONDS:
-                    is_leader = await _renew_leader(room_id, token) or await _try_acquire_leader(room_id, token)
-                    last_renew = now
+        if room.status == "lobby":
+            slot.lobby_empty_since = slot.lobby_empty_since or now
 
-                if not is_leader:
-                    await asyncio.sleep(IDLE_POLL_SECONDS)
-                    continue
+            # Only pause the countdown once the lobby has stayed empty past
+            # the grace window - a quick reconnect keeps the shared countdown
+            # running untouched.
+            if now - slot.lobby_empty_since > LOBBY_EMPTY_GRACE_SECONDS:
+                await _clear_lobby_timer(room_id)
+                return None
 
-                if room.status == "lobby":
-                    await _tick_lobby(room_id, room)
-                    await asyncio.sleep(IDLE_POLL_SECONDS)
+            return IDLE_POLL_SECONDS
 
-                elif room.status == "in_progress":
-                    delay = random.uniform(
-                        settings.BINGO_DRAW_INTERVAL_MIN,
-                        settings.BINGO_DRAW_INTERVAL_MAX,
-                    )
-                    await asyncio.sleep(delay)
+        # Give disconnected players a grace window to reconnect before
+        # abandoning an in-progress / finished round.
+        slot.empty_since = slot.empty_since or now
 
-                    outcome = await _draw_number(room_id)
+        if now - slot.empty_since > ABANDON_SECONDS:
+            await service.reset_to_lobby(room_id)
+            return None
 
-                    if outcome == "drawn":
-                        # Auto-claim: end the round the instant any board
-                        # completes so the winner dialog shows immediately.
-                        await service.auto_detect_winners(room_id)
-                    elif outcome == "exhausted":
-                        await service.finish_without_winner(room_id)
+        return IDLE_POLL_SECONDS
 
-                elif room.status == "finished":
-                    await asyncio.sleep(settings.BINGO_WINNER_OVERLAY_SECONDS)
-                    await service.reset_to_lobby(room_id)
+    slot.empty_since = None
+    slot.lobby_empty_since = None
 
-            except asyncio.CancelledError:
-                raise
-            except Exception:
-                logger.exception("bingo room loop iteration error for room %s", room_id)
-                await asyncio.sleep(IDLE_POLL_SECONDS)
+    if room.status != "in_progress":
+        slot.draw_armed = False
 
-    except asyncio.CancelledError:
-        raise
-    except Exception:
-        logger.exception("bingo room loop crashed for room %s", room_id)
-    finally:
-        if is_leader:
-            await _release_leader(room_id, token)
+    if room.status != "finished":
+        slot.finish_armed = False
+
+    if room.status == "lobby":
+        await _tick_lobby(room_id, room)
+        return IDLE_POLL_SECONDS
+
+    if room.status == "in_progress":
+        if slot.draw_armed:
+            outcome = await _draw_number(room_id)
+
+            if outcome == "drawn":
+                # Auto-claim: end the round the instant any board completes
+                # so the winner dialog shows immediately.
+                _, won = await service.auto_detect_winners(room_id)
+            else:
+                won = False
+
+                if outcome == "exhausted":
+                    await service.finish_without_winner(room_id)
+
+            if won or outcome != "drawn":
+                # Round is over: pick up the winner splash right away.
+                slot.draw_armed = False
+                return 0.0
+
+        slot.draw_armed = True
+        return random.uniform(
+            settings.BINGO_DRAW_INTERVAL_MIN,
+            settings.BINGO_DRAW_INTERVAL_MAX,
+        )
+
+    if room.status == "finished":
+        if slot.finish_armed:
+            slot.finish_armed = False
+            await service.reset_to_lobby(room_id)
+            return 0.0
+
+        slot.finish_armed = True
+        return settings.BINGO_WINNER_OVERLAY_SECONDS
+
+    return IDLE_POLL_SECONDS
 
 
 async def _tick_lobby(room_id: str, room: redis_store.RoomState) -> None:
     if room.lobby_ends_at is None:
         async with room_lock(room_id):
-            fresh = await redis_store.get_room(room_id)
+            fresh = await redis_store.get_room(room_id, parts=())
             if fresh is not None and fresh.status == "lobby" and fresh.lobby_ends_at is None:
                 fresh.lobby_ends_at = time.time() + settings.BINGO_LOBBY_SECONDS
                 await redis_store.save_room(fresh)
@@ -297,31 +483,48 @@ async def _tick_lobby(room_id: str, room: redis_store.RoomState) -> None:
         logger.exception("bingo house bot tick failed room=%s", room_id)
 
 
-async def _draw_number(room_id: str) -> str:
-    """Returns 'drawn', 'exhausted', or 'stopped'."""
+async def _reseed_sequence(room_id: str) -> bool:
+    """Rebuild the draw sequence from whatever hasn't been called yet.
+
+    Only needed for a round started before pre-shuffled sequences existed
+    (or whose sequence key was lost); returns False once every ball is out."""
 
     async with room_lock(room_id):
-        room = await redis_store.get_room(room_id)
+        room = await redis_store.get_room(room_id, parts=("drawn",))
 
         if room is None or room.status != "in_progress":
-            return "stopped"
+            return False
+
+        drawn = set(room.drawn)
+        remaining = [n for n in ALL_NUMBERS if n not in drawn]
+        random.shuffle(remaining)
+        await redis_store.set_draw_sequence(room_id, remaining)
+
+    return bool(remaining)
+
+
+async def _draw_number(room_id: str) -> str:
+    """Returns 'drawn', 'exhausted', or 'stopped'."""
 
-        remaining = [n for n in ALL_NUMBERS if n not in room.drawn]
+    code, drawn = await redis_store.draw_ball(room_id)
 
-        if not remaining:
-            return "exhausted"
+    if code == redis_store.DrawResult.EXHAUSTED and len(drawn) < len(ALL_NUMBERS):
+        if await _reseed_sequence(room_id):
+            code, drawn = await redis_store.draw_ball(room_id)
 
-        number = random.choice(remaining)
-        room.drawn.append(number)
-        room.current_ball = number
+    if code == redis_store.DrawResult.STOPPED:
+        return "stopped"
 
-        await redis_store.save_room(room)
-        drawn_snapshot = list(room.drawn)
+    if code != redis_store.DrawResult.DRAWN:
+        return "exhausted"
 
+    # Constant-size delta: ``seq`` is the ball's 1-based position in the
+    # round. A client that sees a gap asks for a ``resync`` and gets a full
+    # room_state (which carries the whole drawn list) instead.
     await manager.broadcast(room_id, {
         "type": "ball",
-        "number": number,
-        "drawn": drawn_snapshot,
+        "seq": len(drawn),
+        "number": drawn[-1],
     })
 
     return "drawn"
@@ -51,7 +51,6 @@ toggles apply without a process restart.
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import random
@@ -63,7 +62,9 @@ from typing import Literal
 from app.bingo import redis_store, service, wallet
 from app.bingo.redis_store import ReserveResult
 from app.bingo.service import BingoError, DEFAULT_ROOM_ID
+from app.core import executors
 from app.core.config import settings
+from app.core.redis_scripts import register_script
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +84,17 @@ RESERVE_COUNT_MIN = 0
 RESERVE_COUNT_MAX = 50
 DEFAULT_RESERVE_COUNT = 20
 
+_RELEASE_TICK_LOCK_SCRIPT = register_script(
+    "bingo.bot_release_tick_lock",
+    """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+""",
+)
+
 _cached_bot_id: str | None = None
 
 
@@ -386,17 +398,8 @@ async def _acquire_tick_lock(room_id: str, token: str) -> bool:
 
 async def _release_tick_lock(room_id: str, token: str) -> None:
     redis = redis_store.get_redis()
-    await redis.eval(
-        """
-        if redis.call('get', KEYS[1]) == ARGV[1] then
-            return redis.call('del', KEYS[1])
-        else
-            return 0
-        end
-        """,
-        1,
-        BOT_TICK_LOCK_KEY.format(room_id=room_id),
-        token,
+    await _RELEASE_TICK_LOCK_SCRIPT(
+        redis, keys=[BOT_TICK_LOCK_KEY.format(room_id=room_id)], args=[token]
     )
 
 
@@ -458,22 +461,22 @@ def ensure_bot_user() -> str:
 
 
 async def ensure_bot_user_async() -> str:
-    return await asyncio.to_thread(ensure_bot_user)
+    return await executors.admin.run(ensure_bot_user)
 
 
 async def ensure_bot_funds(bot_user_id: str) -> None:
-    await asyncio.to_thread(wallet.ensure_bot_balance, bot_user_id)
+    await executors.admin.run(wallet.ensure_bot_balance, bot_user_id)
 
 
 async def _ensure_bot_in_room(room_id: str, bot_user_id: str) -> None:
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players",))
     if room is None:
         return
 
     if bot_user_id in room.players and room.players[bot_user_id].connected:
         return
 
-    balance = await asyncio.to_thread(wallet.get_balance, bot_user_id)
+    balance = await executors.settlement.run(wallet.get_balance, bot_user_id)
     await service.join_room(
         room_id,
         bot_user_id,
@@ -483,7 +486,7 @@ async def _ensure_bot_in_room(room_id: str, bot_user_id: str) -> None:
 
 
 async def _leave_if_present(room_id: str, bot_user_id: str) -> None:
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players",))
     if room is None or bot_user_id not in room.players:
         return
     await service.leave_room(room_id, bot_user_id)
@@ -495,7 +498,7 @@ async def bot_claim_board(room_id: str, bot_user_id: str, board_id: int) -> int:
     Returns a ``ReserveResult`` code. Idempotent for already-held boards.
     """
 
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players",))
     if room is None:
         raise BingoError("Room not found")
     if room.status != "lobby":
@@ -507,12 +510,12 @@ async def bot_claim_board(room_id: str, bot_user_id: str, board_id: int) -> int:
     board_map = await redis_store.get_board_map(room_id)
     if board_map.get(board_id) != bot_user_id:
         held = sum(1 for owner in board_map.values() if owner == bot_user_id)
-        balance = Decimal(await asyncio.to_thread(wallet.get_balance, bot_user_id))
+        balance = Decimal(await executors.settlement.run(wallet.get_balance, bot_user_id))
         price = Decimal(room.board_price)
         needed = price * (held + 1)
         if balance < needed:
             await ensure_bot_funds(bot_user_id)
-            balance = Decimal(await asyncio.to_thread(wallet.get_balance, bot_user_id))
+            balance = Decimal(await executors.settlement.run(wallet.get_balance, bot_user_id))
             if balance < needed:
                 raise BingoError("Bot insufficient balance")
 
@@ -548,11 +551,9 @@ async def bot_release_board(room_id: str, bot_user_id: str, board_id: int) -> bo
 
 
 async def bot_release_all(room_id: str, bot_user_id: str) -> list[int]:
-    board_map = await redis_store.get_board_map(room_id)
-    held = bot_held_boards(board_map, bot_user_id)
+    held = await redis_store.release_user_boards(room_id, bot_user_id)
     if not held:
         return []
-    await redis_store.release_all_boards(room_id, bot_user_id)
     await service.broadcast_board_delta(
         room_id,
         action="released_all",
@@ -709,7 +710,7 @@ async def _tick_when_disabled(room_id: str) -> None:
         await clear_intent(room_id)
         return
 
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players",))
     if room is None:
         await clear_intent(room_id)
         return
@@ -755,7 +756,7 @@ async def tick_room(room_id: str, *, now: float | None = None) -> None:
 
 async def _tick_room_locked(room_id: str, *, now: float | None = None) -> None:
     bot_user_id = await ensure_bot_user_async()
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players",))
     if room is None:
         return
 
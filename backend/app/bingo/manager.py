@@ -2,21 +2,28 @@
 
 Delivery to *other* backend instances happens through Redis Pub/Sub
 (``app.bingo.pubsub``); this manager only ever touches sockets that are
-physically connected to this process.
+physically connected to this process. Per-socket send queues, writers and
+encoding come from ``app.core.ws_hub``.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import time
-import uuid
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass, field
 
 from fastapi import WebSocket
 
 from app.bingo import pubsub
+from app.core.redis_fanout import KIND_FIELD
+from app.core.ws_hub import (
+    REPLACED_CLOSE_CODE,
+    SEND_TIMEOUT_SECONDS,
+    Connection,
+    SocketHub,
+    encode,
+    frame_kind,
+)
 
 # Tag every message this process publishes with its own id so that when the
 # Redis Pub/Sub fanout echoes the message back to us we can recognise it as
@@ -27,26 +34,12 @@ ORIGIN_FIELD = "_origin"
 Dispatcher = Callable[[str, dict], Awaitable[None]]
 
 
-@dataclass
-class ConnectionInfo:
-    websocket: WebSocket
-    user_id: str
-    display_name: str
-    # Unique per physical socket. When a user reopens the Mini App (new tab,
-    # reconnect, React StrictMode double-mount) the newer socket replaces the
-    # older one under the same user_id; the token lets us tell the two apart so
-    # the *older* socket tearing down can never clobber the *newer* live one.
-    token: str = ""
-    last_seen: float = field(default_factory=time.time)
-
-
-class ConnectionManager:
+class ConnectionManager(SocketHub):
     def __init__(self) -> None:
-        self._rooms: dict[str, dict[str, ConnectionInfo]] = {}
-        self._lock = asyncio.Lock()
+        super().__init__()
+        self._rooms: dict[str, dict[str, Connection]] = {}
         self._pubsub_listener: pubsub.PubSubListener | None = None
         self._dispatch: Dispatcher | None = None
-        self.instance_id = uuid.uuid4().hex
 
     def bind_pubsub(self, listener: pubsub.PubSubListener) -> None:
         self._pubsub_listener = listener
@@ -70,31 +63,21 @@ class ConnectionManager:
         must be handed back to ``disconnect`` so a replaced/stale socket can
         never remove the newer live connection for the same user."""
 
-        stale: ConnectionInfo | None = None
-        token = uuid.uuid4().hex
+        conn = self._open(websocket, user_id, display_name)
 
         async with self._lock:
             room_connections = self._rooms.setdefault(room_id, {})
             stale = room_connections.get(user_id)
-
-            room_connections[user_id] = ConnectionInfo(
-                websocket=websocket,
-                user_id=user_id,
-                display_name=display_name,
-                token=token,
-            )
+            room_connections[user_id] = conn
 
         if stale is not None:
             # A previous tab/session for this user was open - replace it.
-            try:
-                await stale.websocket.close(code=4409, reason="Replaced by new connection")
-            except Exception:
-                pass
+            await self._close(stale, REPLACED_CLOSE_CODE, "Replaced by new connection")
 
         if self._pubsub_listener is not None:
             await self._pubsub_listener.subscribe(room_id)
 
-        return token
+        return conn.token
 
     async def disconnect(
         self,
@@ -111,7 +94,7 @@ class ConnectionManager:
         should then mark the player disconnected. Returns False for a no-op
         (stale socket, or user already gone)."""
 
-        removed_current = False
+        removed: Connection | None = None
         empty = False
 
         async with self._lock:
@@ -123,18 +106,20 @@ class ConnectionManager:
             conn = room_connections.get(user_id)
 
             if conn is not None and (token is None or conn.token == token):
-                room_connections.pop(user_id, None)
-                removed_current = True
+                removed = room_connections.pop(user_id, None)
 
             empty = len(room_connections) == 0
 
             if empty:
                 self._rooms.pop(room_id, None)
 
+        if removed is not None:
+            self._release(removed)
+
         if empty and self._pubsub_listener is not None:
             await self._pubsub_listener.unsubscribe(room_id)
 
-        return removed_current
+        return removed is not None
 
     def touch(self, room_id: str, user_id: str) -> None:
         conn = self._rooms.get(room_id, {}).get(user_id)
@@ -148,13 +133,54 @@ class ConnectionManager:
     def local_user_ids(self, room_id: str) -> list[str]:
         return list(self._rooms.get(room_id, {}).keys())
 
+    def local_room_ids(self) -> list[str]:
+        return list(self._rooms)
+
+    async def close_room(
+        self,
+        room_id: str,
+        code: int,
+        reason: str,
+        farewell: dict | None = None,
+    ) -> None:
+        """Close every local socket in ``room_id``, sending ``farewell`` as
+        its last frame. The handlers then run the normal ``disconnect``."""
+
+        payload = encode(farewell) if farewell is not None else None
+
+        async def close(conn: Connection) -> None:
+            self._release(conn)
+
+            if payload is not None:
+                try:
+                    await asyncio.wait_for(
+                        conn.websocket.send_text(payload),
+                        timeout=SEND_TIMEOUT_SECONDS,
+                    )
+                except Exception:
+                    pass
+
+            await self._close(conn, code, reason)
+
+        await asyncio.gather(*(close(conn) for conn in list(self._rooms.get(room_id, {}).values())))
+
     async def send_personal(self, room_id: str, user_id: str, message: dict) -> None:
         conn = self._rooms.get(room_id, {}).get(user_id)
 
         if conn is None:
             return
 
-        await self._safe_send(conn, message)
+        self._push(conn, encode(message))
+
+    async def send_personal_text(self, room_id: str, user_id: str, payload: str) -> None:
+        """Like ``send_personal`` for a message that is already encoded."""
+
+        conn = self._rooms.get(room_id, {}).get(user_id)
+
+        if conn is None:
+            return
+
+        self._push(conn, payload)
 
     async def send_to_user(self, user_id: str, message: dict) -> bool:
         """Deliver ``message`` to ``user_id`` in any Bingo room on this process.
@@ -170,10 +196,7 @@ class ConnectionManager:
         ]
         if not targets:
             return False
-        await asyncio.gather(
-            *(self._safe_send(conn, message) for conn in targets),
-            return_exceptions=True,
-        )
+        self._push_all(targets, encode(message))
         return True
 
     async def deliver_local(self, room_id: str, message: dict) -> None:
@@ -181,39 +204,22 @@ class ConnectionManager:
         room. Called both for locally-produced events and for events fanned
         in from Redis Pub/Sub.
 
-        Sends are dispatched concurrently (``asyncio.gather``) rather than in a
-        serial ``await`` loop: with thousands of sockets in a lobby, a single
-        slow/backpressured client must not delay ball/tick delivery to
-        everyone else. Serialization is done once and reused across sockets."""
+        The message is serialized once and appended to each socket's outbound
+        queue; the per-socket writers do the actual sends, so a slow or
+        backpressured client never delays delivery to everyone else."""
 
-        connections = list(self._rooms.get(room_id, {}).values())
+        await self.deliver_local_encoded(room_id, encode(message), frame_kind(message))
 
-        if not connections:
-            return
-
-        payload = json.dumps(message)
-
-        results = await asyncio.gather(
-            *(
-                asyncio.wait_for(conn.websocket.send_text(payload), timeout=2.0)
-                for conn in connections
-            ),
-            return_exceptions=True,
-        )
-
-        dead_user_ids = [
-            conn.user_id
-            for conn, result in zip(connections, results)
-            if isinstance(result, Exception)
-        ]
-
-        if dead_user_ids:
-            async with self._lock:
-                room_connections = self._rooms.get(room_id)
+    async def deliver_local_encoded(
+        self,
+        room_id: str,
+        payload: str,
+        kind: str | None = None,
+    ) -> None:
+        """``deliver_local`` for a message that is already JSON text.
+        ``kind`` is its type when a newer frame may supersede it."""
 
-                if room_connections:
-                    for user_id in dead_user_ids:
-                        room_connections.pop(user_id, None)
+        self._push_all(list(self._rooms.get(room_id, {}).values()), payload, kind)
 
     async def broadcast(self, room_id: str, message: dict) -> None:
         """Fan a message out to every connected client in the room.
@@ -230,18 +236,32 @@ class ConnectionManager:
           echoes it back here, ``dispatch_pubsub_event`` skips it (we already
           delivered locally) - preventing double sends while staying correct
           across a horizontally-scaled deployment.
+
+        Client-bound messages are encoded once and the same text goes to local
+        sockets and onto the (batched) Pub/Sub frame. Internal ``_``-prefixed
+        events such as ``_room_sync`` go through the dispatcher instead.
         """
 
-        if self._dispatch is not None:
-            await self._dispatch(room_id, message)
+        if str(message.get("type", "")).startswith("_"):
+            if self._dispatch is not None:
+                await self._dispatch(room_id, message)
+
+            await pubsub.publish_event(
+                room_id,
+                {**message, ORIGIN_FIELD: self.instance_id},
+                control=True,
+            )
+            return
+
+        payload = encode(message)
+        meta = {ORIGIN_FIELD: self.instance_id}
+        kind = frame_kind(message)
 
-        await pubsub.publish_event(room_id, {**message, ORIGIN_FIELD: self.instance_id})
+        if kind is not None:
+            meta[KIND_FIELD] = kind
 
-    async def _safe_send(self, conn: ConnectionInfo, message: dict) -> None:
-        try:
-            await conn.websocket.send_text(json.dumps(message))
-        except Exception:
-            pass
+        await self.deliver_local_encoded(room_id, payload, kind)
+        pubsub.publish_encoded(room_id, payload, **meta)
 
 
 manager = ConnectionManager()
@@ -3,17 +3,26 @@ not just the one that produced the event.
 
 Local delivery to actual WebSocket connections is handled by
 ``app.bingo.manager.ConnectionManager`` - this module is purely the
-cross-instance transport.
+cross-instance transport. Publishes share the batched frame format of
+``app.core.redis_fanout`` (one frame per room channel per flush window).
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 from collections.abc import Awaitable, Callable
 
 from app.bingo.redis_store import get_redis
+from app.core.redis_fanout import (
+    CONTROL_FIELD,
+    decode_frame,
+    dispatch_entries,
+    frame_batcher,
+    split_routing,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +36,7 @@ CHANNEL_SUFFIX = ":events"
 _KEEPALIVE_CHANNEL = f"{CHANNEL_PREFIX}_keepalive{CHANNEL_SUFFIX}"
 
 Dispatcher = Callable[[str, dict], Awaitable[None]]
+EncodedDispatcher = Callable[[str, dict, str], Awaitable[None]]
 
 
 def room_channel(room_id: str) -> str:
@@ -37,9 +47,20 @@ def room_id_from_channel(channel: str) -> str:
     return channel[len(CHANNEL_PREFIX):-len(CHANNEL_SUFFIX)]
 
 
-async def publish_event(room_id: str, message: dict) -> None:
-    redis = get_redis()
-    await redis.publish(room_channel(room_id), json.dumps(message))
+async def publish_event(room_id: str, message: dict, *, control: bool = False) -> None:
+    """Queue a dict event; ``control`` events are decoded by the receiving
+    dispatcher instead of being forwarded to sockets verbatim."""
+
+    meta, body = split_routing(message)
+
+    if control:
+        meta[CONTROL_FIELD] = 1
+
+    publish_encoded(room_id, json.dumps(body), **meta)
+
+
+def publish_encoded(room_id: str, payload: str, **meta) -> None:
+    frame_batcher.add(room_channel(room_id), meta, payload)
 
 
 class PubSubListener:
@@ -47,8 +68,13 @@ class PubSubListener:
     on demand (as rooms get their first local connection) and fans incoming
     messages out via the provided dispatcher."""
 
-    def __init__(self, dispatch: Dispatcher) -> None:
+    def __init__(
+        self,
+        dispatch: Dispatcher,
+        dispatch_encoded: EncodedDispatcher | None = None,
+    ) -> None:
         self._dispatch = dispatch
+        self._dispatch_encoded = dispatch_encoded
         self._pubsub = None
         self._task: asyncio.Task | None = None
         self._subscribed_rooms: set[str] = set()
@@ -62,6 +88,8 @@ class PubSubListener:
         self._task = asyncio.create_task(self._listen())
 
     async def stop(self) -> None:
+        await frame_batcher.flush()
+
         if self._task is not None:
             self._task.cancel()
 
@@ -129,14 +157,25 @@ class PubSubListener:
                 continue
 
             try:
-                payload = json.loads(data)
+                entries = decode_frame(data)
+                # Plain JSON message from a publisher without batching.
+                payload = json.loads(data) if entries is None else None
             except (TypeError, ValueError):
                 continue
 
             room_id = room_id_from_channel(channel)
 
             try:
-                await self._dispatch(room_id, payload)
+                if entries is not None:
+                    await dispatch_entries(
+                        entries,
+                        functools.partial(self._dispatch, room_id),
+                        functools.partial(self._dispatch_encoded, room_id)
+                        if self._dispatch_encoded is not None
+                        else None,
+                    )
+                elif isinstance(payload, dict):
+                    await self._dispatch(room_id, payload)
             except Exception:
                 logger.exception("bingo pubsub dispatch error for room %s", room_id)
 
@@ -1,62 +1,265 @@
 """Redis-backed room/player/card state.
 
 All Bingo game state lives in Redis (never Postgres) since the rest of the
-app's database access is synchronous. Rooms are stored as a single JSON blob
-per room - state is tiny (a handful of players, up to
-``settings.BINGO_MAX_CARDS`` cards each, 75 numbers) so read-modify-write
-under a short-lived distributed lock (``room_lock``) is simple and correct
-across multiple backend instances, without needing per-field Redis
-operations.
+app's database access is synchronous. A room is split across a few
+field-level structures instead of one JSON blob, so a hot-path mutation only
+rewrites the part it touches:
+
+* ``bingo:room:{id}:meta``    - hash of scalar round metadata (status,
+  countdown, winners, ...), one JSON-encoded value per field
+* ``bingo:room:{id}:players`` - hash of user_id -> ``PlayerState`` JSON
+* ``bingo:room:{id}:cards``   - hash of card/board id -> ``CardState`` JSON
+* ``bingo:room:{id}:drawn``   - list of drawn ball numbers, in draw order
+
+``get_room`` / ``save_room`` accept ``parts`` so callers that only need the
+status or roster skip decoding every cartela. Read-modify-write still
+happens under a short-lived distributed lock (``room_lock``) so concurrent
+joins / settles / claims across instances can't race. The lock is a FIFO
+ticket queue (``bingo:room:{id}:lock:queue``); waiters block on a release
+notification published on ``ROOM_LOCK_CHANNEL`` instead of spinning
+``SET NX``, with a slow poll as the fallback for a crashed holder. The per-ball draw is
+the exception: it pops the round's pre-shuffled sequence
+(``bingo:room:{id}:sequence``) in one Lua script (``draw_ball``) and takes
+no lock at all.
+
+In cluster mode (``app.bingo.cluster``) the instance that owns a room keeps
+it in memory as the primary copy: ``get_room`` is served from memory,
+``save_room`` is flushed to the keys above write-behind
+(``BINGO_CLUSTER_FLUSH_MS``), and ``room_lock`` is a local asyncio lock.
 
 Retention policy
 ----------------
-Room JSON (``bingo:room:{id}``) and lobby board hashes
-(``bingo:room:{id}:boards``) receive a sliding TTL of ``ROOM_TTL_SECONDS``
-(24h) on every ``save_room`` / board mutation. Active games keep refreshing
-via lobby ticks, draws, and joins, so TTL never expires mid-round. Idle
-abandoned rooms (no saves for 24h) expire and are swept from the rooms
-index on the next ``list_rooms`` call. This bounds Redis growth without
-deleting an in-progress game.
+Room keys and lobby board hashes (``bingo:room:{id}:boards``) receive a
+sliding TTL of ``ROOM_TTL_SECONDS`` (24h) on every ``save_room`` / board
+mutation. Active games keep refreshing via lobby ticks, draws, and joins, so
+TTL never expires mid-round. Idle abandoned rooms (no saves for 24h) expire
+and are swept from the rooms index on the next ``list_rooms`` call. This
+bounds Redis growth without deleting an in-progress game.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import time
 import uuid
+from collections.abc import Iterable, Sequence
 from contextlib import asynccontextmanager
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields, replace
 
 from redis.asyncio import Redis
 
-from app.bingo.cards import CardGrid, empty_marks
+from app.bingo import cluster
+from app.bingo.cards import CardGrid, board_row, card_for_board
+from app.bingo.validator import flatten_card
 from app.core.config import settings
+from app.core.redis_scripts import register_script
 
+logger = logging.getLogger(__name__)
+
+# Pre-split single-blob room JSON. Only ever read as a fallback so rooms
+# written by an older deploy keep working; the next save replaces it.
 ROOM_KEY = "bingo:room:{room_id}"
+ROOM_META_KEY = "bingo:room:{room_id}:meta"
+ROOM_PLAYERS_KEY = "bingo:room:{room_id}:players"
+ROOM_CARDS_KEY = "bingo:room:{room_id}:cards"
+ROOM_DRAWN_KEY = "bingo:room:{room_id}:drawn"
+# Pre-shuffled balls still to be called this round, popped by ``draw_ball``.
+ROOM_SEQUENCE_KEY = "bingo:room:{room_id}:sequence"
 ROOM_LOCK_KEY = "bingo:room:{room_id}:lock"
+# Waiting tokens, scored by enqueue time (ms); the lowest score goes next.
+ROOM_LOCK_QUEUE_KEY = "bingo:room:{room_id}:lock:queue"
+# Payload is the room id; published on release only when someone is queued.
+ROOM_LOCK_CHANNEL = "bingo:room-lock:released"
 ROOMS_INDEX_KEY = "bingo:rooms"
+# Cluster mode: "<instance id>:<epoch>" of the instance serving the room from
+# memory, and the epoch counter bumped on every new claim (fencing token).
+ROOM_OWNER_KEY = "bingo:room:{room_id}:owner"
+ROOM_OWNER_EPOCH_KEY = "bingo:room:{room_id}:owner:epoch"
 # Authoritative lobby board ownership: Redis hash of board_id -> user_id. This
 # is the single source of truth for "who holds cartela N" during the lobby, so
 # claims are atomic (a Lua script) instead of funnelling every tap through the
 # coarse room lock.
 BOARDS_KEY = "bingo:room:{room_id}:boards"
+# Companion indexes kept in lockstep with BOARDS_KEY by the same Lua scripts,
+# so reserve / release never scan the whole ownership hash: user_id -> number
+# of boards held, and one set of board ids per holder.
+BOARD_COUNTS_KEY = "bingo:room:{room_id}:board_counts"
+USER_BOARDS_KEY_PREFIX = "bingo:room:{room_id}:user_boards:"
 # Fixed-window rate limiter counter per user+action.
 RATE_KEY = "bingo:rl:{user_id}:{action}"
 
 ROOM_LOCK_TTL_MS = 4000
-ROOM_LOCK_RETRY_DELAY_SECONDS = 0.02
 ROOM_LOCK_MAX_WAIT_SECONDS = 3.0
+# Waiters are woken by ROOM_LOCK_CHANNEL; this re-check only covers a lost
+# notification or a holder that died and let the lock expire.
+ROOM_LOCK_FALLBACK_POLL_SECONDS = 0.25
+# Room ownership lease (cluster mode). Renewed on use once half has elapsed;
+# a dead owner's rooms free up after this long.
+ROOM_LEASE_TTL_MS = 10000
 # Sliding retention for room JSON + board hash. Refreshed on every save /
 # board mutation so live rooms stay alive; idle rooms expire after 24h.
 ROOM_TTL_SECONDS = 24 * 60 * 60
 
-_RELEASE_LOCK_SCRIPT = """
-if redis.call('get', KEYS[1]) == ARGV[1] then
-    return redis.call('del', KEYS[1])
-else
+# Fair room lock. KEYS[1] = lock, KEYS[2] = ticket queue.
+# Acquire: ARGV = token, lock TTL ms, max wait ms. Enqueues the token on first
+# call, prunes tickets older than the max wait (waiters that died), and only
+# grants the lock to the head of the queue. Returns 1 when acquired.
+_ACQUIRE_LOCK_SCRIPT = register_script(
+    "bingo.acquire_room_lock",
+    """
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local max_wait = tonumber(ARGV[3])
+redis.call('zremrangebyscore', KEYS[2], '-inf', now - max_wait)
+if not redis.call('zscore', KEYS[2], ARGV[1]) then
+    redis.call('zadd', KEYS[2], now, ARGV[1])
+end
+redis.call('pexpire', KEYS[2], max_wait * 2)
+if redis.call('exists', KEYS[1]) == 1 then
+    return 0
+end
+if redis.call('zrange', KEYS[2], 0, 0)[1] ~= ARGV[1] then
+    return 0
+end
+redis.call('zrem', KEYS[2], ARGV[1])
+redis.call('set', KEYS[1], ARGV[1], 'px', ARGV[2])
+return 1
+""",
+)
+
+# Release: ARGV = token, channel, room id. Wakes waiters only if any queued.
+_RELEASE_LOCK_SCRIPT = register_script(
+    "bingo.release_room_lock",
+    """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('del', KEYS[1])
+if redis.call('zcard', KEYS[2]) > 0 then
+    redis.call('publish', ARGV[2], ARGV[3])
+end
+return 1
+""",
+)
+
+# Give up a ticket (timeout / cancellation). If that leaves the lock free with
+# others still queued, wake them so the new head doesn't wait for the poll.
+_ABANDON_LOCK_SCRIPT = register_script(
+    "bingo.abandon_room_lock",
+    """
+redis.call('zrem', KEYS[2], ARGV[1])
+if redis.call('exists', KEYS[1]) == 0 and redis.call('zcard', KEYS[2]) > 0 then
+    redis.call('publish', ARGV[2], ARGV[3])
+end
+return 1
+""",
+)
+
+# Claim a room's ownership lease. KEYS[1] = owner, KEYS[2] = epoch counter;
+# ARGV = instance id, lease TTL ms, epoch key TTL seconds. Returns the epoch
+# (kept if this instance already holds it), or -1 while another holds it.
+_CLAIM_ROOM_LEASE_SCRIPT = register_script(
+    "bingo.claim_room_lease",
+    """
+local held = redis.call('get', KEYS[1])
+if held then
+    local sep = string.find(held, ':', 1, true)
+    if string.sub(held, 1, sep - 1) ~= ARGV[1] then
+        return -1
+    end
+    redis.call('pexpire', KEYS[1], ARGV[2])
+    return tonumber(string.sub(held, sep + 1))
+end
+local epoch = redis.call('incr', KEYS[2])
+redis.call('expire', KEYS[2], ARGV[3])
+redis.call('set', KEYS[1], ARGV[1] .. ':' .. epoch, 'px', ARGV[2])
+return epoch
+""",
+)
+
+# Extend (ARGV[2] = TTL ms) or, with no TTL, release the lease, but only
+# while it is still ARGV[1]. Returns 1 when it was.
+_RENEW_ROOM_LEASE_SCRIPT = register_script(
+    "bingo.renew_room_lease",
+    """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
     return 0
 end
+if ARGV[2] then
+    redis.call('pexpire', KEYS[1], ARGV[2])
+else
+    redis.call('del', KEYS[1])
+end
+return 1
+""",
+)
+
+# Pop the next pre-shuffled ball for an in-progress round and append it to
+# the drawn list in one server-side step (no room lock on the per-ball path).
+# Replies with a status code followed by the full drawn list:
+#   {1, ...drawn}  -> ball drawn (the last element)
+#   {0}            -> room is not in progress
+#   {-1, ...drawn} -> sequence empty
+_DRAW_BALL_SCRIPT = register_script(
+    "bingo.draw_ball",
+    """
+if redis.call('hget', KEYS[1], 'status') ~= '"in_progress"' then
+    return {0}
+end
+local number = redis.call('lpop', KEYS[2])
+if not number then
+    local drawn = redis.call('lrange', KEYS[3], 0, -1)
+    table.insert(drawn, 1, -1)
+    return drawn
+end
+redis.call('rpush', KEYS[3], number)
+redis.call('hset', KEYS[1], 'current_ball', number)
+redis.call('expire', KEYS[1], ARGV[1])
+redis.call('expire', KEYS[3], ARGV[1])
+local drawn = redis.call('lrange', KEYS[3], 0, -1)
+table.insert(drawn, 1, 1)
+return drawn
+""",
+)
+
+# Shared prelude for the board scripts. KEYS[1] = ownership hash, KEYS[2] =
+# per-user counts, KEYS[3] = the acting user's board set, ARGV[1] = TTL
+# seconds, ARGV[2] = user id. If ownership exists without the counts index
+# (hash written before the index existed) the counts are backfilled once;
+# a holder whose set is missing (same deploy, or the set outlived its TTL)
+# gets it rebuilt on their next action, so caps stay exact across a deploy.
+_BOARD_INDEX_PRELUDE = """
+local ttl = ARGV[1]
+local uid = ARGV[2]
+local all
+if redis.call('exists', KEYS[2]) == 0 and redis.call('hlen', KEYS[1]) > 0 then
+    all = redis.call('hgetall', KEYS[1])
+    for i = 1, #all, 2 do
+        redis.call('hincrby', KEYS[2], all[i + 1], 1)
+    end
+end
+if redis.call('exists', KEYS[3]) == 0 and redis.call('hexists', KEYS[2], uid) == 1 then
+    all = all or redis.call('hgetall', KEYS[1])
+    for i = 1, #all, 2 do
+        if all[i + 1] == uid then
+            redis.call('sadd', KEYS[3], all[i])
+        end
+    end
+end
+local function touch()
+    redis.call('expire', KEYS[1], ttl)
+    redis.call('expire', KEYS[2], ttl)
+    redis.call('expire', KEYS[3], ttl)
+end
+local function drop(board)
+    redis.call('hdel', KEYS[1], board)
+    redis.call('srem', KEYS[3], board)
+    if redis.call('hincrby', KEYS[2], uid, -1) <= 0 then
+        redis.call('hdel', KEYS[2], uid)
+    end
+end
 """
 
 # Atomically claim a board only if it is free (or already held by this user)
@@ -66,11 +269,12 @@ end
 #  -1  -> taken by another player
 #  -2  -> board id out of range
 #  -3  -> user already at their max board count
-_RESERVE_BOARD_SCRIPT = """
-local board = ARGV[1]
-local uid = ARGV[2]
-local maxb = tonumber(ARGV[3])
-local pool = tonumber(ARGV[4])
+_RESERVE_BOARD_SCRIPT = register_script(
+    "bingo.reserve_board",
+    _BOARD_INDEX_PRELUDE + """
+local board = ARGV[3]
+local maxb = tonumber(ARGV[4])
+local pool = tonumber(ARGV[5])
 local bnum = tonumber(board)
 if bnum == nil or bnum < 1 or bnum > pool then
     return -2
@@ -78,50 +282,84 @@ end
 local owner = redis.call('hget', KEYS[1], board)
 if owner then
     if owner == uid then
+        touch()
         return 0
     end
     return -1
 end
-local held = 0
-local all = redis.call('hvals', KEYS[1])
-for i = 1, #all do
-    if all[i] == uid then
-        held = held + 1
-    end
-end
+local held = tonumber(redis.call('hget', KEYS[2], uid) or '0')
 if held >= maxb then
     return -3
 end
 redis.call('hset', KEYS[1], board, uid)
+redis.call('hincrby', KEYS[2], uid, 1)
+redis.call('sadd', KEYS[3], board)
+touch()
 return 1
-"""
+""",
+)
 
 # Release a single board only if the requesting user actually owns it.
-_RELEASE_BOARD_SCRIPT = """
-if redis.call('hget', KEYS[1], ARGV[1]) == ARGV[2] then
-    return redis.call('hdel', KEYS[1], ARGV[1])
+_RELEASE_BOARD_SCRIPT = register_script(
+    "bingo.release_board",
+    _BOARD_INDEX_PRELUDE + """
+local board = ARGV[3]
+if redis.call('hget', KEYS[1], board) ~= uid then
+    return 0
 end
-return 0
-"""
-
-# Drop every board currently held by a user (deselect-all / cleanup).
-_RELEASE_ALL_BOARDS_SCRIPT = """
-local uid = ARGV[1]
-local all = redis.call('hgetall', KEYS[1])
-local removed = 0
-for i = 1, #all, 2 do
-    if all[i + 1] == uid then
-        redis.call('hdel', KEYS[1], all[i])
-        removed = removed + 1
+drop(board)
+touch()
+return 1
+""",
+)
+
+# Drop every board currently held by a user (deselect-all / cleanup). Only
+# walks that user's own set; returns the released board ids.
+_RELEASE_ALL_BOARDS_SCRIPT = register_script(
+    "bingo.release_user_boards",
+    _BOARD_INDEX_PRELUDE + """
+local released = {}
+local boards = redis.call('smembers', KEYS[3])
+for i = 1, #boards do
+    if redis.call('hget', KEYS[1], boards[i]) == uid then
+        redis.call('hdel', KEYS[1], boards[i])
+        released[#released + 1] = boards[i]
     end
 end
-return removed
-"""
+redis.call('del', KEYS[3])
+redis.call('hdel', KEYS[2], uid)
+return released
+""",
+)
+
+# Wipe ownership plus both indexes (round kickoff / reset). KEYS[3..] are the
+# holders' set keys and ARGV the matching user ids, read from the counts hash
+# beforehand; returns -1 without touching anything if the holders changed in
+# between, so the caller re-reads and retries.
+_CLEAR_BOARDS_SCRIPT = register_script(
+    "bingo.clear_boards",
+    """
+if redis.call('hlen', KEYS[2]) ~= #ARGV then
+    return -1
+end
+for i = 1, #ARGV do
+    if redis.call('hexists', KEYS[2], ARGV[i]) == 0 then
+        return -1
+    end
+end
+for i = 3, #KEYS do
+    redis.call('del', KEYS[i])
+end
+return redis.call('del', KEYS[1], KEYS[2])
+""",
+)
 
 # Fixed-window token bucket: increment the counter, set its TTL on first hit,
 # and report whether the caller is still within the allowance. Returns 1 when
 # the action is allowed, 0 when the limit is exceeded for the window.
-_RATE_LIMIT_SCRIPT = """
+_RATE_LIMIT_SCRIPT = register_script(
+    "bingo.rate_limit",
+    """
 local count = redis.call('incr', KEYS[1])
 if count == 1 then
     redis.call('pexpire', KEYS[1], ARGV[1])
@@ -130,7 +368,8 @@ if count > tonumber(ARGV[2]) then
     return 0
 end
 return 1
-"""
+""",
+)
 
 _redis_client: Redis | None = None
 
@@ -150,40 +389,213 @@ def get_redis() -> Redis:
 async def close_redis() -> None:
     global _redis_client
 
+    try:
+        await _owned_rooms.flush()
+        await _owned_rooms.release()
+    except Exception:
+        pass  # already logged; the rooms are lost only if Redis stays down
+
+    await _room_lock_wakeups.close()
+
     if _redis_client is not None:
         await _redis_client.close()
         _redis_client = None
 
 
+class _RoomLockWakeups:
+    """Process-wide subscriber to ``ROOM_LOCK_CHANNEL``. Local waiters park on
+    an ``asyncio.Event`` per room; one Redis connection serves all of them.
+    The subscription starts lazily with the first contended wait."""
+
+    def __init__(self) -> None:
+        self._events: dict[str, set[asyncio.Event]] = {}
+        self._task: asyncio.Task | None = None
+
+    def ensure_listening(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self._listen(), name="bingo:room-lock-wakeups"
+            )
+
+    async def _listen(self) -> None:
+        pubsub = get_redis().pubsub()
+
+        try:
+            await pubsub.subscribe(ROOM_LOCK_CHANNEL)
+
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self.notify(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Waiters fall back to polling; the next contended wait resubscribes.
+            logger.exception("room lock wake-up listener stopped")
+        finally:
+            await pubsub.close()
+
+    def notify(self, room_id: str) -> None:
+        for event in self._events.get(room_id, ()):
+            event.set()
+
+    def register(self, room_id: str) -> asyncio.Event:
+        event = asyncio.Event()
+        self._events.setdefault(room_id, set()).add(event)
+        return event
+
+    def unregister(self, room_id: str, event: asyncio.Event) -> None:
+        waiters = self._events.get(room_id)
+
+        if waiters is None:
+            return
+
+        waiters.discard(event)
+
+        if not waiters:
+            del self._events[room_id]
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+
+_room_lock_wakeups = _RoomLockWakeups()
+
+
+@dataclass
+class RoomLockStats:
+    """In-process counters for ``room_lock`` (wait = time to acquire,
+    hold = time inside the ``async with`` body)."""
+
+    acquired: int = 0
+    contended: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    hold_seconds_total: float = 0.0
+    hold_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float, contended: bool) -> None:
+        self.acquired += 1
+        self.contended += int(contended)
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        self.hold_seconds_total += seconds
+        self.hold_seconds_max = max(self.hold_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        acquired = max(self.acquired, 1)
+        return {
+            **asdict(self),
+            "wait_seconds_avg": self.wait_seconds_total / acquired,
+            "hold_seconds_avg": self.hold_seconds_total / acquired,
+        }
+
+
+room_lock_metrics = RoomLockStats()
+
+
+def room_lock_stats() -> dict:
+    return room_lock_metrics.snapshot()
+
+
 @asynccontextmanager
 async def room_lock(room_id: str):
     """Short-lived distributed mutex guarding read-modify-write of a room's
-    JSON blob, so concurrent joins/draws/claims across instances don't race."""
+    state, so concurrent joins/settles/claims across instances don't race.
 
-    redis = get_redis()
-    key = ROOM_LOCK_KEY.format(room_id=room_id)
-    token = uuid.uuid4().hex
+    Waiters are served in arrival order and sleep until the holder's release
+    notification rather than polling Redis."""
 
-    deadline = time.monotonic() + ROOM_LOCK_MAX_WAIT_SECONDS
-    acquired = False
+    if _owned_rooms.holds(room_id):
+        # The owner is the only writer in cluster mode: a local lock, fenced
+        # by the room's ownership lease.
+        async with _owned_rooms.lock(room_id):
+            await _owned_rooms.acquire(room_id)
+            yield
+        return
 
-    while time.monotonic() < deadline:
-        acquired = bool(
-            await redis.set(key, token, nx=True, px=ROOM_LOCK_TTL_MS)
-        )
+    redis = get_redis()
+    keys = [
+        ROOM_LOCK_KEY.format(room_id=room_id),
+        ROOM_LOCK_QUEUE_KEY.format(room_id=room_id),
+    ]
+    token = uuid.uuid4().hex
+    max_wait_ms = int(ROOM_LOCK_MAX_WAIT_SECONDS * 1000)
 
-        if acquired:
-            break
+    started = time.monotonic()
+    deadline = started + ROOM_LOCK_MAX_WAIT_SECONDS
+    acquired = bool(await _ACQUIRE_LOCK_SCRIPT(
+        redis, keys=keys, args=[token, ROOM_LOCK_TTL_MS, max_wait_ms]
+    ))
+    contended = not acquired
 
-        await asyncio.sleep(ROOM_LOCK_RETRY_DELAY_SECONDS)
+    if not acquired:
+        _room_lock_wakeups.ensure_listening()
+        wake = _room_lock_wakeups.register(room_id)
+
+        try:
+            while not acquired:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                try:
+                    await asyncio.wait_for(
+                        wake.wait(),
+                        min(remaining, ROOM_LOCK_FALLBACK_POLL_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                wake.clear()
+                acquired = bool(await _ACQUIRE_LOCK_SCRIPT(
+                    redis, keys=keys, args=[token, ROOM_LOCK_TTL_MS, max_wait_ms]
+                ))
+        finally:
+            _room_lock_wakeups.unregister(room_id, wake)
+
+            if not acquired:
+                await _ABANDON_LOCK_SCRIPT(
+                    redis, keys=keys, args=[token, ROOM_LOCK_CHANNEL, room_id]
+                )
 
     if not acquired:
+        room_lock_metrics.timeouts += 1
         raise TimeoutError(f"Could not acquire lock for bingo room {room_id}")
 
+    held_from = time.monotonic()
+    room_lock_metrics.record_wait(held_from - started, contended)
+
     try:
         yield
     finally:
-        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+        held = time.monotonic() - held_from
+        room_lock_metrics.record_hold(held)
+
+        if held * 1000 > ROOM_LOCK_TTL_MS:
+            logger.warning(
+                "bingo room %s lock held %.2fs (ttl %dms)",
+                room_id,
+                held,
+                ROOM_LOCK_TTL_MS,
+            )
+
+        await _RELEASE_LOCK_SCRIPT(
+            redis, keys=keys, args=[token, ROOM_LOCK_CHANNEL, room_id]
+        )
+        # Same-process waiters don't need the pub/sub round trip.
+        _room_lock_wakeups.notify(room_id)
 
 
 @dataclass
@@ -201,8 +613,40 @@ class PlayerState:
 class CardState:
     card_id: str
     user_id: str
-    numbers: CardGrid
-    marks: list[list[bool]] = field(default_factory=empty_marks)
+    # Only set for a non-standard grid. Pool boards leave it ``None`` and
+    # resolve their deterministic cartela from the cached table by id, so
+    # Redis never stores 25 numbers per card. Marks are never stored: they
+    # are derived from the drawn balls whenever needed (``marked_mask``).
+    numbers: CardGrid | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CardState":
+        # Older saves carried a persisted ``marks`` grid - ignore it.
+        return cls(
+            card_id=data["card_id"],
+            user_id=data["user_id"],
+            numbers=data.get("numbers"),
+        )
+
+    def grid(self) -> CardGrid:
+        if self.numbers is not None:
+            return self.numbers
+
+        return card_for_board(int(self.card_id))
+
+    def row(self) -> Sequence[int]:
+        """Row-major 25-number form for the batch validator (the cached
+        ``bytes`` row for pool boards, which every backend accepts)."""
+
+        if self.numbers is not None:
+            return flatten_card(self.numbers)
+
+        return board_row(int(self.card_id))
+
+
+# Independently stored parts of a room. Metadata (everything else on
+# ``RoomState``) is always loaded and saved.
+ROOM_PARTS: tuple[str, ...] = ("players", "cards", "drawn")
 
 
 @dataclass
@@ -239,6 +683,9 @@ class RoomState:
     winners: list[dict] = field(default_factory=list)
     # Per-board share of the derash when the prize is split across boards.
     derash_share: str = "0"
+    # Which of ``ROOM_PARTS`` this instance was loaded with; ``save_room``
+    # writes only those back. Not persisted.
+    loaded_parts: tuple[str, ...] = field(default=ROOM_PARTS, repr=False, compare=False)
 
     def connected_player_count(self) -> int:
         return sum(1 for p in self.players.values() if p.connected)
@@ -255,7 +702,9 @@ class RoomState:
         return sum(len(boards) for boards in self.selections.values())
 
     def to_json(self) -> str:
-        return json.dumps(asdict(self))
+        data = asdict(self)
+        del data["loaded_parts"]
+        return json.dumps(data)
 
     @classmethod
     def from_json(cls, raw: str) -> "RoomState":
@@ -267,38 +716,521 @@ class RoomState:
         }
 
         cards = {
-            card_id: CardState(**card)
+            card_id: CardState.from_dict(card)
             for card_id, card in data.get("cards", {}).items()
         }
 
         data["players"] = players
         data["cards"] = cards
+        data.pop("loaded_parts", None)
 
         return cls(**data)
 
 
+_META_FIELDS: tuple[str, ...] = tuple(
+    f.name
+    for f in fields(RoomState)
+    if f.name not in ROOM_PARTS and f.name != "loaded_parts"
+)
+
+
 def _room_key(room_id: str) -> str:
     return ROOM_KEY.format(room_id=room_id)
 
 
-async def get_room(room_id: str) -> RoomState | None:
-    redis = get_redis()
-    raw = await redis.get(_room_key(room_id))
+def _meta_key(room_id: str) -> str:
+    return ROOM_META_KEY.format(room_id=room_id)
+
+
+def _players_key(room_id: str) -> str:
+    return ROOM_PLAYERS_KEY.format(room_id=room_id)
+
+
+def _cards_key(room_id: str) -> str:
+    return ROOM_CARDS_KEY.format(room_id=room_id)
+
+
+def _drawn_key(room_id: str) -> str:
+    return ROOM_DRAWN_KEY.format(room_id=room_id)
+
+
+def _sequence_key(room_id: str) -> str:
+    return ROOM_SEQUENCE_KEY.format(room_id=room_id)
+
+
+def _room_keys(room_id: str) -> list[str]:
+    return [
+        _meta_key(room_id),
+        _players_key(room_id),
+        _cards_key(room_id),
+        _drawn_key(room_id),
+        _sequence_key(room_id),
+    ]
+
+
+def _queue_room_read(pipe, room_id: str, parts: tuple[str, ...]) -> None:
+    pipe.hgetall(_meta_key(room_id))
+
+    if "players" in parts:
+        pipe.hgetall(_players_key(room_id))
+    if "cards" in parts:
+        pipe.hgetall(_cards_key(room_id))
+    if "drawn" in parts:
+        pipe.lrange(_drawn_key(room_id), 0, -1)
+
 
-    if raw is None:
+def _room_from_parts(raw: list, parts: tuple[str, ...]) -> RoomState | None:
+    """Rebuild a ``RoomState`` from the replies queued by ``_queue_room_read``
+    (same order). Unknown meta fields are ignored so a rolling deploy that
+    adds/removes a field never breaks decoding."""
+
+    values = iter(raw)
+    meta = next(values)
+
+    if not meta:
         return None
 
-    return RoomState.from_json(raw)
+    room = RoomState(**{
+        name: json.loads(meta[name])
+        for name in _META_FIELDS
+        if name in meta
+    })
+
+    if "players" in parts:
+        room.players = {
+            user_id: PlayerState(**json.loads(player))
+            for user_id, player in next(values).items()
+        }
+    if "cards" in parts:
+        room.cards = {
+            card_id: CardState.from_dict(json.loads(card))
+            for card_id, card in next(values).items()
+        }
+    if "drawn" in parts:
+        room.drawn = [int(n) for n in next(values)]
+
+    return room
+
+
+def _card_json(card: CardState) -> str:
+    data = asdict(card)
+
+    if card.numbers is None:
+        del data["numbers"]
+
+    return json.dumps(data)
+
+
+def _queue_room_write(pipe, room: RoomState, parts: Iterable[str]) -> None:
+    room_id = room.room_id
+
+    pipe.hset(_meta_key(room_id), mapping={
+        name: json.dumps(getattr(room, name)) for name in _META_FIELDS
+    })
+    pipe.expire(_meta_key(room_id), ROOM_TTL_SECONDS)
+
+    # Each part is replaced wholesale (DEL + refill) inside the same MULTI so
+    # readers never observe a half-written roster / card set.
+    if "players" in parts:
+        key = _players_key(room_id)
+        pipe.delete(key)
+        if room.players:
+            pipe.hset(key, mapping={
+                user_id: json.dumps(asdict(player))
+                for user_id, player in room.players.items()
+            })
+            pipe.expire(key, ROOM_TTL_SECONDS)
+    if "cards" in parts:
+        key = _cards_key(room_id)
+        pipe.delete(key)
+        if room.cards:
+            pipe.hset(key, mapping={
+                card_id: _card_json(card)
+                for card_id, card in room.cards.items()
+            })
+            pipe.expire(key, ROOM_TTL_SECONDS)
+    if "drawn" in parts:
+        key = _drawn_key(room_id)
+        pipe.delete(key)
+        if room.drawn:
+            pipe.rpush(key, *room.drawn)
+            pipe.expire(key, ROOM_TTL_SECONDS)
+
+    pipe.delete(_room_key(room_id))
+
+
+async def get_room(
+    room_id: str,
+    parts: Iterable[str] = ROOM_PARTS,
+) -> RoomState | None:
+    """Load a room. ``parts`` limits which of ``ROOM_PARTS`` are fetched;
+    the rest are left empty on the returned state (and ``save_room`` will not
+    overwrite them when that state is saved back)."""
+
+    parts = tuple(p for p in ROOM_PARTS if p in parts)
+
+    if _owned_rooms.holds(room_id):
+        return await _owned_rooms.get(room_id, parts)
+
+    return await _load_room(room_id, parts)
+
+
+async def commit_room(room_id: str) -> None:
+    """Cluster mode: write the owner's copy of ``room_id`` through to Redis
+    now, under its lease. Raises ``RoomLeaseError`` if this instance no
+    longer holds the room. A no-op otherwise: saves already hit Redis."""
+
+    if _owned_rooms.holds(room_id):
+        await _owned_rooms.acquire(room_id)
+        await _owned_rooms.flush([room_id])
 
 
-async def save_room(room: RoomState) -> None:
+async def _load_room(room_id: str, parts: tuple[str, ...]) -> RoomState | None:
     redis = get_redis()
-    await redis.set(
-        _room_key(room.room_id),
-        room.to_json(),
-        ex=ROOM_TTL_SECONDS,
+
+    async with redis.pipeline(transaction=False) as pipe:
+        _queue_room_read(pipe, room_id, parts)
+        raw = await pipe.execute()
+
+    room = _room_from_parts(raw, parts)
+
+    if room is None:
+        legacy = await redis.get(_room_key(room_id))
+
+        if legacy is None:
+            return None
+
+        room = RoomState.from_json(legacy)
+        parts = ROOM_PARTS
+
+    room.loaded_parts = parts
+
+    return room
+
+
+async def save_room(room: RoomState, parts: Iterable[str] | None = None) -> None:
+    """Persist a room. Defaults to the parts it was loaded with, so a
+    status-only read never wipes the roster or cards it didn't fetch."""
+
+    if parts is None:
+        parts = room.loaded_parts
+
+    if _owned_rooms.holds(room.room_id):
+        await _owned_rooms.put(room, tuple(parts))
+        return
+
+    redis = get_redis()
+
+    async with redis.pipeline(transaction=True) as pipe:
+        _queue_room_write(pipe, room, parts)
+        await pipe.execute()
+
+
+def _copy_room(room: RoomState, parts: tuple[str, ...]) -> RoomState:
+    """Detached copy carrying metadata plus ``parts`` (others left empty)."""
+
+    copy = replace(
+        room,
+        players={},
+        cards={},
+        drawn=[],
+        selections={uid: list(boards) for uid, boards in room.selections.items()},
+        winners=list(room.winners),
     )
 
+    if "players" in parts:
+        copy.players = {uid: replace(p) for uid, p in room.players.items()}
+
+    if "cards" in parts:
+        # Cards are immutable once dealt, so sharing the instances is safe.
+        copy.cards = dict(room.cards)
+
+    if "drawn" in parts:
+        copy.drawn = list(room.drawn)
+
+    copy.loaded_parts = parts
+
+    return copy
+
+
+class RoomLeaseError(TimeoutError):
+    """Cluster mode: another instance holds the room's ownership lease (the
+    ring has not converged yet, or this instance's lease lapsed)."""
+
+
+def _owner_key(room_id: str) -> str:
+    return ROOM_OWNER_KEY.format(room_id=room_id)
+
+
+class _OwnedRooms:
+    """Cluster mode: in-memory primary copy of the rooms this instance owns,
+    snapshotted to Redis write-behind.
+
+    The ring only says who *should* own a room; while it converges two
+    instances may both think they do. Each room is therefore served only
+    under a Redis lease, and every write-behind flush is fenced on it, so a
+    stale owner can neither load the room nor overwrite the new owner's."""
+
+    def __init__(self) -> None:
+        self._rooms: dict[str, RoomState] = {}
+        self._dirty: dict[str, set[str]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # room_id -> (lease token, monotonic time to renew it by).
+        self._leases: dict[str, tuple[str, float]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def holds(self, room_id: str) -> bool:
+        return cluster.enabled() and cluster.is_owner(room_id)
+
+    def lock(self, room_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(room_id, asyncio.Lock())
+
+    async def acquire(self, room_id: str) -> None:
+        """Make sure this instance holds ``room_id``'s lease, claiming it if
+        needed. Raises ``RoomLeaseError`` while another instance holds it."""
+
+        lease = self._leases.get(room_id)
+        now = time.monotonic()
+
+        if lease is not None and now < lease[1]:
+            return
+
+        redis = get_redis()
+        renew_by = now + ROOM_LEASE_TTL_MS / 2000
+
+        if lease is not None:
+            if await _RENEW_ROOM_LEASE_SCRIPT(
+                redis, keys=[_owner_key(room_id)], args=[lease[0], ROOM_LEASE_TTL_MS]
+            ):
+                self._leases[room_id] = (lease[0], renew_by)
+                return
+
+            # Lapsed, maybe with another owner in between: the memory copy
+            # can't be trusted any more.
+            logger.warning("bingo room %s lease lapsed; reloading", room_id)
+            self._drop(room_id)
+
+        epoch = int(await _CLAIM_ROOM_LEASE_SCRIPT(
+            redis,
+            keys=[_owner_key(room_id), ROOM_OWNER_EPOCH_KEY.format(room_id=room_id)],
+            args=[cluster.instance_id, ROOM_LEASE_TTL_MS, ROOM_TTL_SECONDS],
+        ))
+
+        if epoch < 0:
+            raise RoomLeaseError(f"bingo room {room_id} is held by another instance")
+
+        self._leases[room_id] = (f"{cluster.instance_id}:{epoch}", renew_by)
+
+    async def get(self, room_id: str, parts: tuple[str, ...]) -> RoomState | None:
+        await self.acquire(room_id)
+        room = self._rooms.get(room_id)
+
+        if room is None:
+            room = await _load_room(room_id, ROOM_PARTS)
+
+            if room is None:
+                return None
+
+            # A concurrent miss may have filled (and mutated) it meanwhile.
+            room = self._rooms.setdefault(room_id, room)
+
+        return _copy_room(room, parts)
+
+    async def put(self, room: RoomState, parts: tuple[str, ...]) -> None:
+        cached = self._rooms.get(room.room_id)
+
+        if cached is None:
+            cached = await _load_room(room.room_id, ROOM_PARTS) or _copy_room(room, ())
+            cached = self._rooms.setdefault(room.room_id, cached)
+
+        saved = _copy_room(room, parts)
+
+        for name in _META_FIELDS:
+            setattr(cached, name, getattr(saved, name))
+
+        for part in parts:
+            setattr(cached, part, getattr(saved, part))
+
+        self._dirty.setdefault(room.room_id, set()).update(parts)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def apply_draw(self, room_id: str, drawn: list[int]) -> None:
+        cached = self._rooms.get(room_id)
+
+        if cached is not None and drawn:
+            cached.drawn = list(drawn)
+            cached.current_ball = drawn[-1]
+
+    async def _flush_later(self) -> None:
+        delay = settings.BINGO_CLUSTER_FLUSH_MS / 1000
+
+        while True:
+            await asyncio.sleep(delay)
+
+            try:
+                await self.flush()
+                return
+            except RoomLeaseError:
+                return  # stale rooms were dropped; the rest were written
+            except Exception:
+                # ``flush`` kept the rooms dirty; back off and retry.
+                delay = max(delay, 1.0)
+
+    async def flush(self, room_ids: Iterable[str] | None = None) -> None:
+        """Write dirty rooms to Redis, each only while this instance still
+        holds its lease (WATCHed, so a takeover mid-flush aborts the write).
+
+        Rooms named in ``room_ids`` are checked even when clean. A room whose
+        lease moved on is dropped from memory, unflushed changes included,
+        and ``RoomLeaseError`` is raised once the others are written."""
+
+        targets = list(self._dirty) if room_ids is None else list(room_ids)
+
+        if not targets:
+            return
+
+        # None: named but clean, only its lease is checked.
+        dirty = {room_id: self._dirty.pop(room_id, None) for room_id in targets}
+        stale: list[str] = []
+
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                keys = [_owner_key(room_id) for room_id in dirty]
+                await pipe.watch(*keys)
+                held = await pipe.mget(keys)
+                pipe.multi()
+
+                for (room_id, parts), token in zip(dirty.items(), held):
+                    lease = self._leases.get(room_id)
+
+                    if lease is None or token != lease[0]:
+                        stale.append(room_id)
+                        continue
+
+                    room = self._rooms.get(room_id)
+
+                    if room is not None and parts is not None:
+                        _queue_room_write(pipe, room, parts)
+
+                await pipe.execute()
+        except Exception:
+            for room_id, parts in dirty.items():
+                if parts is not None:
+                    self._dirty.setdefault(room_id, set()).update(parts)
+            logger.exception("bingo write-behind flush failed for %d room(s)", len(dirty))
+            raise
+
+        if stale:
+            for room_id in stale:
+                logger.error(
+                    "bingo room %s lease lost; dropping its unflushed changes (%s)",
+                    room_id,
+                    ", ".join(sorted(dirty[room_id] or ())) or "none",
+                )
+                self._drop(room_id)
+
+            raise RoomLeaseError(f"bingo room lease lost: {', '.join(stale)}")
+
+    async def rebalance(self) -> None:
+        """Flush and drop rooms whose ownership moved to another instance,
+        then give up their leases so the new owner can claim them."""
+
+        moved = [room_id for room_id in {**self._rooms, **self._leases} if not self.holds(room_id)]
+
+        if not moved:
+            return
+
+        try:
+            await self.flush(moved)
+        except RoomLeaseError:
+            pass  # already dropped
+
+        await self.release(moved)
+
+    async def release(self, room_ids: Iterable[str] | None = None) -> None:
+        room_ids = list(self._leases) if room_ids is None else list(room_ids)
+        redis = get_redis()
+
+        for room_id in room_ids:
+            lease = self._leases.get(room_id)
+            self.evict(room_id)
+
+            if lease is not None:
+                await _RENEW_ROOM_LEASE_SCRIPT(redis, keys=[_owner_key(room_id)], args=[lease[0]])
+
+    def evict(self, room_id: str) -> None:
+        self._drop(room_id)
+        self._locks.pop(room_id, None)
+
+    def _drop(self, room_id: str) -> None:
+        # Keeps the room's lock: a holder may be waiting on it right now.
+        self._rooms.pop(room_id, None)
+        self._dirty.pop(room_id, None)
+        self._leases.pop(room_id, None)
+
+
+_owned_rooms = _OwnedRooms()
+cluster.on_ring_change(_owned_rooms.rebalance)
+
+
+class DrawResult:
+    DRAWN = 1
+    STOPPED = 0
+    EXHAUSTED = -1
+
+
+async def set_draw_sequence(room_id: str, numbers: list[int]) -> None:
+    """Store the round's pre-shuffled ball order for ``draw_ball`` to pop."""
+
+    redis = get_redis()
+    key = _sequence_key(room_id)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        if numbers:
+            pipe.rpush(key, *numbers)
+            pipe.expire(key, ROOM_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def draw_ball(room_id: str) -> tuple[int, list[int]]:
+    """Pop the next ball of an in-progress round in a single EVALSHA.
+
+    Returns ``(DrawResult code, drawn numbers so far)``; on ``DRAWN`` the new
+    ball is the last element of the list."""
+
+    redis = get_redis()
+    owned = _owned_rooms.holds(room_id)
+
+    if owned:
+        # The script checks the status in Redis: make the snapshot current
+        # (and make sure this instance still owns the room).
+        await _owned_rooms.acquire(room_id)
+        await _owned_rooms.flush([room_id])
+
+    reply = await _DRAW_BALL_SCRIPT(
+        redis,
+        keys=[_meta_key(room_id), _sequence_key(room_id), _drawn_key(room_id)],
+        args=[ROOM_TTL_SECONDS],
+    )
+    code, drawn = int(reply[0]), [int(n) for n in reply[1:]]
+
+    if owned and code == DrawResult.DRAWN:
+        _owned_rooms.apply_draw(room_id, drawn)
+
+    return code, drawn
+
+
+async def _insert_room(room: RoomState) -> None:
+    redis = get_redis()
+
+    async with redis.pipeline(transaction=True) as pipe:
+        _queue_room_write(pipe, room, ROOM_PARTS)
+        pipe.sadd(ROOMS_INDEX_KEY, room.room_id)
+        await pipe.execute()
+
 
 async def create_room(
     name: str,
@@ -316,10 +1248,7 @@ async def create_room(
         max_boards=max_boards,
     )
 
-    redis = get_redis()
-
-    await redis.set(_room_key(room.room_id), room.to_json(), ex=ROOM_TTL_SECONDS)
-    await redis.sadd(ROOMS_INDEX_KEY, room.room_id)
+    await _insert_room(room)
 
     return room
 
@@ -363,33 +1292,42 @@ async def get_or_create_room(
             max_boards=max_boards,
         )
 
-        redis = get_redis()
-
-        await redis.set(_room_key(room.room_id), room.to_json(), ex=ROOM_TTL_SECONDS)
-        await redis.sadd(ROOMS_INDEX_KEY, room.room_id)
+        await _insert_room(room)
 
         return room
 
 
-async def list_rooms() -> list[RoomState]:
+async def list_rooms(parts: Iterable[str] = ("players", "drawn")) -> list[RoomState]:
+    """Every indexed room (oldest first). Defaults to the parts needed for a
+    lobby listing - cartelas are skipped."""
+
+    parts = tuple(p for p in ROOM_PARTS if p in parts)
     redis = get_redis()
-    room_ids = await redis.smembers(ROOMS_INDEX_KEY)
+    room_ids = list(await redis.smembers(ROOMS_INDEX_KEY))
 
     if not room_ids:
         return []
 
-    keys = [_room_key(room_id) for room_id in room_ids]
-    raw_rooms = await redis.mget(keys)
+    async with redis.pipeline(transaction=False) as pipe:
+        for room_id in room_ids:
+            _queue_room_read(pipe, room_id, parts)
+        raw = await pipe.execute()
 
+    per_room = 1 + len(parts)
     rooms: list[RoomState] = []
     missing_ids: list[str] = []
 
-    for room_id, raw in zip(room_ids, raw_rooms):
-        if raw is None:
+    for index, room_id in enumerate(room_ids):
+        room = _room_from_parts(raw[index * per_room:(index + 1) * per_room], parts)
+
+        if room is None:
+            room = await get_room(room_id, parts)
+
+        if room is None:
             missing_ids.append(room_id)
             continue
 
-        rooms.append(RoomState.from_json(raw))
+        rooms.append(room)
 
     if missing_ids:
         await redis.srem(ROOMS_INDEX_KEY, *missing_ids)
@@ -400,11 +1338,12 @@ async def list_rooms() -> list[RoomState]:
 
 
 async def delete_room(room_id: str) -> None:
+    _owned_rooms.evict(room_id)
     redis = get_redis()
 
-    await redis.delete(_room_key(room_id))
+    await redis.delete(_room_key(room_id), *_room_keys(room_id))
     await redis.srem(ROOMS_INDEX_KEY, room_id)
-    await redis.delete(_boards_key(room_id))
+    await clear_boards(room_id)
 
 
 # ---------------------------------------------------------------------------
@@ -415,6 +1354,22 @@ def _boards_key(room_id: str) -> str:
     return BOARDS_KEY.format(room_id=room_id)
 
 
+def _board_counts_key(room_id: str) -> str:
+    return BOARD_COUNTS_KEY.format(room_id=room_id)
+
+
+def _user_boards_key(room_id: str, user_id: str) -> str:
+    return USER_BOARDS_KEY_PREFIX.format(room_id=room_id) + user_id
+
+
+def _board_script_keys(room_id: str, user_id: str) -> list[str]:
+    return [_boards_key(room_id), _board_counts_key(room_id), _user_boards_key(room_id, user_id)]
+
+
+def _board_script_args(user_id: str) -> list[str]:
+    return [str(ROOM_TTL_SECONDS), user_id]
+
+
 class ReserveResult:
     CLAIMED = 1
     ALREADY_MINE = 0
@@ -431,49 +1386,65 @@ async def reserve_board(
     pool_max: int,
 ) -> int:
     """Atomically claim ``board_id`` for ``user_id`` iff it is free and the
-    user is under ``max_boards``. See ``ReserveResult`` for return codes."""
+    user is under ``max_boards``. See ``ReserveResult`` for return codes.
+    O(1): the cap is checked against the per-user counter."""
 
     redis = get_redis()
-    result = await redis.eval(
-        _RESERVE_BOARD_SCRIPT,
-        1,
-        _boards_key(room_id),
-        str(board_id),
-        user_id,
-        str(max_boards),
-        str(pool_max),
+    result = await _RESERVE_BOARD_SCRIPT(
+        redis,
+        keys=_board_script_keys(room_id, user_id),
+        args=[
+            *_board_script_args(user_id),
+            str(board_id),
+            str(max_boards),
+            str(pool_max),
+        ],
     )
-    code = int(result)
-    if code in (ReserveResult.CLAIMED, ReserveResult.ALREADY_MINE):
-        await redis.expire(_boards_key(room_id), ROOM_TTL_SECONDS)
-    return code
+    return int(result)
 
 
 async def release_board(room_id: str, user_id: str, board_id: int) -> bool:
     redis = get_redis()
-    removed = await redis.eval(
-        _RELEASE_BOARD_SCRIPT,
-        1,
-        _boards_key(room_id),
-        str(board_id),
-        user_id,
+    removed = await _RELEASE_BOARD_SCRIPT(
+        redis,
+        keys=_board_script_keys(room_id, user_id),
+        args=[*_board_script_args(user_id), str(board_id)],
     )
-    if removed:
-        await redis.expire(_boards_key(room_id), ROOM_TTL_SECONDS)
     return bool(removed)
 
 
-async def release_all_boards(room_id: str, user_id: str) -> int:
+async def release_user_boards(room_id: str, user_id: str) -> list[int]:
+    """Release everything ``user_id`` holds; returns the freed board ids."""
+
     redis = get_redis()
-    removed = await redis.eval(
-        _RELEASE_ALL_BOARDS_SCRIPT,
-        1,
-        _boards_key(room_id),
-        user_id,
+    released = await _RELEASE_ALL_BOARDS_SCRIPT(
+        redis,
+        keys=_board_script_keys(room_id, user_id),
+        args=_board_script_args(user_id),
     )
-    if removed:
-        await redis.expire(_boards_key(room_id), ROOM_TTL_SECONDS)
-    return int(removed)
+    return sorted(int(board_id) for board_id in released)
+
+
+async def get_user_boards(room_id: str, user_id: str) -> list[int]:
+    """Boards ``user_id`` holds in the lobby, from their own index set."""
+
+    redis = get_redis()
+    raw = await redis.smembers(_user_boards_key(room_id, user_id))
+
+    return sorted(int(board_id) for board_id in raw)
+
+
+async def get_board_summary(room_id: str) -> tuple[list[int], int]:
+    """``(taken board ids, distinct holders)`` without fetching owners."""
+
+    redis = get_redis()
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hkeys(_boards_key(room_id))
+        pipe.hlen(_board_counts_key(room_id))
+        taken, holders = await pipe.execute()
+
+    return sorted(int(board_id) for board_id in taken), int(holders)
 
 
 async def get_board_map(room_id: str) -> dict[int, str]:
@@ -487,7 +1458,20 @@ async def get_board_map(room_id: str) -> dict[int, str]:
 
 async def clear_boards(room_id: str) -> None:
     redis = get_redis()
-    await redis.delete(_boards_key(room_id))
+    counts_key = _board_counts_key(room_id)
+    while True:
+        users = await redis.hkeys(counts_key)
+        cleared = await _CLEAR_BOARDS_SCRIPT(
+            redis,
+            keys=[
+                _boards_key(room_id),
+                counts_key,
+                *(_user_boards_key(room_id, user_id) for user_id in users),
+            ],
+            args=users,
+        )
+        if int(cleared) >= 0:
+            return
 
 
 async def check_rate_limit(
@@ -501,12 +1485,10 @@ async def check_rate_limit(
 
     redis = get_redis()
     key = RATE_KEY.format(user_id=user_id, action=action)
-    allowed = await redis.eval(
-        _RATE_LIMIT_SCRIPT,
-        1,
-        key,
-        str(window_ms),
-        str(limit),
+    allowed = await _RATE_LIMIT_SCRIPT(
+        redis,
+        keys=[key],
+        args=[str(window_ms), str(limit)],
     )
 
     return bool(allowed)
@@ -9,11 +9,10 @@ state can never disagree between them.
 
 from __future__ import annotations
 
-import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity, get_current_user
 from app.bingo import redis_store, service, wallet
 from app.bingo.schemas import (
     CreateRoomRequest,
@@ -22,8 +21,10 @@ from app.bingo.schemas import (
     RoomListResponse,
     RoomSummary,
 )
-from app.bingo.service import BingoError
+from app.bingo.service import BingoError, RoomNotOwnedError
+from app.core import executors
 from app.core.config import settings
+from app.core.identity import Identity
 from app.models.user import User
 
 router = APIRouter(
@@ -48,7 +49,7 @@ async def lobby():
 
 @router.get("/history", response_model=GameHistoryResponse)
 async def history(
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
 ):
@@ -59,7 +60,7 @@ async def history(
     played, and any derash won. Only the requested page is loaded.
     """
 
-    payload = await asyncio.to_thread(
+    payload = await executors.history.run(
         wallet.get_user_history,
         str(user.id),
         limit,
@@ -88,7 +89,7 @@ async def create_room(request: CreateRoomRequest):
 
 @router.get("/rooms/{room_id}", response_model=RoomSummary)
 async def get_room(room_id: str):
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=("players", "drawn"))
 
     if room is None:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -108,6 +109,8 @@ async def join_room(
             user.first_name or user.username or "Player",
             str(user.balance),
         )
+    except RoomNotOwnedError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except BingoError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
 
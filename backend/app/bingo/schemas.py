@@ -51,8 +51,10 @@ class JoinRoomResponse(BaseModel):
 
 class CardOut(BaseModel):
     card_id: str
-    numbers: CardGrid
-    marks: list[list[bool]]
+    # Omitted for pool boards (rendered from card_id); set for custom grids.
+    numbers: CardGrid | None = None
+    # 25-bit row-major marked mask derived from the drawn balls (FREE = bit 12).
+    marks: int
 
 
 class GameHistoryEntry(BaseModel):
@@ -107,6 +109,12 @@ class WSClaimBingoMessage(BaseModel):
     card_id: str
 
 
+class WSResyncMessage(BaseModel):
+    """Sent when the client detects a gap in ``BallMessage.seq``."""
+
+    type: Literal["resync"] = "resync"
+
+
 class WSPingMessage(BaseModel):
     type: Literal["ping"] = "ping"
 
@@ -177,8 +185,17 @@ class ToastMessage(BaseModel):
 
 class BallMessage(BaseModel):
     type: Literal["ball"] = "ball"
+    # 1-based position of this ball in the round (== call_count after it).
+    seq: int
     number: int
-    drawn: list[int]
+
+
+class RedirectMessage(BaseModel):
+    """Cluster mode: the room is owned by another instance. The client should
+    reconnect to the same path on ``origin`` (e.g. ``wss://bingo-2.example.com``)."""
+
+    type: Literal["redirect"] = "redirect"
+    origin: str
 
 
 class BingoResultMessage(BaseModel):
@@ -10,7 +10,7 @@ out through Redis Pub/Sub to every backend instance).
 The Ethiopian lobby model: players pick up to ``max_boards`` cartela ids
 (1..``BINGO_BOARD_POOL_MAX``) during a shared 40s countdown. When the
 countdown expires the round starts, each selected board is charged
-``board_price`` ETB, deterministic cartelas are generated, and the ball
+``board_price`` ETB, its deterministic cartela is referenced by id, and the ball
 draw begins. After a house cut based on staked-board count (0% for ≤4,
 10% for 5–10, 20% for 11+), winners share the remaining derash equally;
 after a short winner splash the room resets to a fresh lobby.
@@ -19,18 +19,22 @@ after a short winner splash the room resets to a fresh lobby.
 from __future__ import annotations
 
 import asyncio
+import json
 import math
 import secrets
 import time
 from decimal import ROUND_DOWN, Decimal
 
 from app.bingo import cards as cards_module
-from app.bingo import redis_store, wallet
+from app.bingo import cluster, redis_store, wallet
 from app.bingo.manager import ORIGIN_FIELD, manager
 from app.bingo.patterns import DEFAULT_PATTERNS, Pattern
 from app.bingo.redis_store import CardState, PlayerState, RoomState, get_room, room_lock, save_room
-from app.bingo.validator import find_winning_pattern
+from app.bingo.validator import drawn_bitset, find_winning_boards, marked_mask
+from app.bingo.win_index import RoundWinIndex
+from app.core import executors
 from app.core.config import settings
+from app.core.redis_fanout import KIND_FIELD
 
 
 def system_fee_rate(player_count: int) -> Decimal:
@@ -109,6 +113,20 @@ class BingoError(Exception):
     """Raised for expected, user-facing failures (bad selection, ...)."""
 
 
+class RoomNotOwnedError(BingoError):
+    """Cluster mode: the room is owned by another instance. ``origin`` is the
+    owner's public URL, or None while the ring has no live owner for it."""
+
+    def __init__(self, origin: str | None) -> None:
+        super().__init__("Room is served by another instance")
+        self.origin = origin
+
+
+def require_owner(room_id: str) -> None:
+    if not cluster.is_owner(room_id):
+        raise RoomNotOwnedError(cluster.owner_url(room_id))
+
+
 # The whole app runs one continuously-cycling public lobby (lobby -> game ->
 # winner -> lobby). Everyone shares this single fixed room id so that two
 # players who open the Mini App independently always join the *same* room and
@@ -143,13 +161,20 @@ def _seconds_left(room: RoomState) -> int:
     return max(0, math.ceil(room.lobby_ends_at - time.time()))
 
 
-def _card_out(card: CardState) -> dict:
-    return {
+def _card_out(card: CardState, drawn_bits: int) -> dict:
+    out = {
         "card_id": card.card_id,
-        "numbers": card.numbers,
-        "marks": card.marks,
+        # 25-bit row-major mask (bit = row * 5 + col), derived on demand.
+        "marks": marked_mask(card.row(), drawn_bits),
     }
 
+    # Pool boards are rendered client-side from the board id (same
+    # deterministic generator); only a custom grid needs to travel.
+    if card.numbers is not None:
+        out["numbers"] = card.numbers
+
+    return out
+
 
 def _player_out(player: PlayerState) -> dict:
     return {
@@ -220,7 +245,7 @@ async def sync_player_balance(
     stale cached value, are reflected immediately)."""
 
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=("players",))
 
         if room is None:
             return None
@@ -234,20 +259,28 @@ async def sync_player_balance(
     return await load_room_for_client(room_id)
 
 
-def room_state_message(room: RoomState, user_id: str) -> dict:
-    """Personalized room snapshot: the recipient's own boards/cards +
-    balance, plus the public roster and round metadata."""
+def _board_sort_key(card: CardState) -> int:
+    return int(card.card_id) if card.card_id.isdigit() else 0
 
-    player = room.players.get(user_id)
-    own_cards = [
-        _card_out(card)
-        for card in room.cards.values()
-        if card.user_id == user_id
-    ]
-    # Stable order matching lobby board numbers so the UI never shuffles.
-    own_cards.sort(
-        key=lambda c: int(c["card_id"]) if str(c["card_id"]).isdigit() else 0
-    )
+
+def _cards_by_user(room: RoomState) -> dict[str, list[CardState]]:
+    """One pass over the cartelas, grouped per owner in board order."""
+
+    grouped: dict[str, list[CardState]] = {}
+
+    for card in room.cards.values():
+        grouped.setdefault(card.user_id, []).append(card)
+
+    for owned in grouped.values():
+        # Stable order matching lobby board numbers so the UI never shuffles.
+        owned.sort(key=_board_sort_key)
+
+    return grouped
+
+
+def room_state_public(room: RoomState) -> dict:
+    """The part of ``room_state`` that is identical for every recipient:
+    roster, drawn balls, round metadata. Built (and encoded) once per sync."""
 
     # Live lobby economics: while players are still picking, the "derash" (pot)
     # and player count shown must be the *projected* values from the current
@@ -260,19 +293,12 @@ def room_state_message(room: RoomState, user_id: str) -> dict:
     if room.status == "lobby":
         derash_display = projected_derash
         players_display = selectors
-        my_boards = list(room.selections.get(user_id, []))
         taken_boards = room.taken_boards()
     else:
         # During the active / finished round the source of truth is ``cards``,
         # not lobby reservations (the boards hash was cleared at kickoff).
         derash_display = room.derash
         players_display = room.round_players
-        my_boards = [
-            int(card.card_id)
-            for card in room.cards.values()
-            if card.user_id == user_id and str(card.card_id).isdigit()
-        ]
-        my_boards.sort()
         taken_boards = sorted(
             int(card.card_id)
             for card in room.cards.values()
@@ -285,17 +311,14 @@ def room_state_message(room: RoomState, user_id: str) -> dict:
         "name": room.name,
         "status": room.status,
         "players": [_player_out(p) for p in room.players.values()],
-        "cards": own_cards,
         "drawn": room.drawn,
         "current_ball": room.current_ball,
         "entry_fee": room.entry_fee,
-        "player_balance": player.balance if player else "0",
         "max_cards_per_player": room.max_cards_per_player,
         # Ethiopian lobby / round fields
         "board_price": room.board_price,
         "max_boards": room.max_boards,
         "board_pool_max": settings.BINGO_BOARD_POOL_MAX,
-        "my_boards": my_boards,
         "taken_boards": taken_boards,
         "seconds_left": _seconds_left(room),
         # Absolute countdown deadline so clients can interpolate locally and
@@ -327,6 +350,66 @@ def room_state_message(room: RoomState, user_id: str) -> dict:
     return message
 
 
+def room_state_overlay(
+    room: RoomState,
+    user_id: str,
+    cards_by_user: dict[str, list[CardState]],
+    drawn_bits: int,
+) -> dict:
+    """The recipient-specific part of ``room_state``: own cards, own boards
+    and wallet balance."""
+
+    player = room.players.get(user_id)
+    own_cards = cards_by_user.get(user_id, [])
+
+    if room.status == "lobby":
+        my_boards = list(room.selections.get(user_id, []))
+    else:
+        my_boards = [
+            int(card.card_id)
+            for card in own_cards
+            if card.card_id.isdigit()
+        ]
+
+    return {
+        "cards": [_card_out(card, drawn_bits) for card in own_cards],
+        "player_balance": player.balance if player else "0",
+        "my_boards": my_boards,
+    }
+
+
+def room_state_message(room: RoomState, user_id: str) -> dict:
+    """Personalized room snapshot: the recipient's own boards/cards +
+    balance, plus the public roster and round metadata."""
+
+    message = room_state_public(room)
+    message.update(
+        room_state_overlay(room, user_id, _cards_by_user(room), drawn_bitset(room.drawn))
+    )
+
+    return message
+
+
+def room_state_payloads(room: RoomState, user_ids: list[str]) -> dict[str, str]:
+    """Encoded ``room_state`` per user for a full sync. The public part is
+    serialized once and each user's small overlay is spliced onto it, so a
+    lobby resync costs O(cards + users) rather than O(users x cards)."""
+
+    public = json.dumps(room_state_public(room))
+    # ``{...public}`` -> ``{...public,`` so an overlay object (minus its own
+    # opening brace) can be appended as raw text.
+    prefix = public[:-1] + ","
+    cards_by_user = _cards_by_user(room)
+    drawn_bits = drawn_bitset(room.drawn)
+
+    return {
+        user_id: prefix + json.dumps(
+            room_state_overlay(room, user_id, cards_by_user, drawn_bits)
+        )[1:]
+        for user_id in user_ids
+    }
+
+
 async def _broadcast_player_count(room: RoomState) -> None:
     await manager.broadcast(room.room_id, {
         "type": "player_count",
@@ -335,15 +418,14 @@ async def _broadcast_player_count(room: RoomState) -> None:
 
 
 async def _board_economics(room_id: str, board_price: str) -> dict:
-    board_map = await redis_store.get_board_map(room_id)
-    total_selected = len(board_map)
-    selectors = len(set(board_map.values()))
+    taken_boards, selectors = await redis_store.get_board_summary(room_id)
+    total_selected = len(taken_boards)
     return {
         "selected_boards_count": total_selected,
         "players_in_round": selectors,
         "projected_derash": str(Decimal(board_price) * total_selected),
         "derash": str(Decimal(board_price) * total_selected),
-        "taken_boards": sorted(board_map.keys()),
+        "taken_boards": taken_boards,
     }
 
 
@@ -356,7 +438,7 @@ async def _broadcast_board_delta(
     board_ids: list[int] | None = None,
 ) -> None:
     """Lightweight lobby sync — clients merge taken/my boards locally."""
-    room = await get_room(room_id)
+    room = await get_room(room_id, parts=())
     if room is None or room.status != "lobby":
         return
 
@@ -406,29 +488,45 @@ async def dispatch_pubsub_event(room_id: str, message: dict) -> None:
         return
 
     if message.get("type") == "_room_sync":
-        local_user_ids = manager.local_user_ids(room_id)
+        await send_room_state(room_id, manager.local_user_ids(room_id))
+        return
 
-        if not local_user_ids:
-            return
+    await manager.deliver_local(room_id, message)
 
-        room = await load_room_for_client(room_id)
 
-        if room is None:
-            return
-
-        # Personalize once per local socket, but fan the sends out concurrently
-        # so a slow/backpressured client can't stall the rest of the room.
-        await asyncio.gather(
-            *(
-                manager.send_personal(room_id, user_id, room_state_message(room, user_id))
-                for user_id in local_user_ids
-            ),
-            return_exceptions=True,
-        )
+async def dispatch_pubsub_frame(room_id: str, meta: dict, payload: str) -> None:
+    """Fast path for batched frame entries: forward the encoded payload."""
 
+    if meta.get(ORIGIN_FIELD) == manager.instance_id:
         return
 
-    await manager.deliver_local(room_id, message)
+    await manager.deliver_local_encoded(room_id, payload, meta.get(KIND_FIELD))
+
+
+async def send_room_state(room_id: str, user_ids: list[str]) -> None:
+    """Push a fresh personalized ``room_state`` to local sockets. Used for
+    room-wide ``_room_sync`` events and for a single client's ``resync``
+    request after it noticed a gap in the ``ball`` sequence."""
+
+    if not user_ids:
+        return
+
+    room = await load_room_for_client(room_id)
+
+    if room is None:
+        return
+
+    payloads = room_state_payloads(room, user_ids)
+
+    # Fan the sends out concurrently so a slow/backpressured client can't
+    # stall the rest of the room.
+    await asyncio.gather(
+        *(
+            manager.send_personal_text(room_id, user_id, payload)
+            for user_id, payload in payloads.items()
+        ),
+        return_exceptions=True,
+    )
 
 
 async def join_room(
@@ -437,8 +535,10 @@ async def join_room(
     display_name: str,
     balance: str,
 ) -> RoomState:
+    require_owner(room_id)
+
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=("players",))
 
         if room is None:
             raise BingoError("Room not found")
@@ -490,7 +590,7 @@ async def leave_room(room_id: str, user_id: str) -> RoomState | None:
     removed = False
 
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=("players",))
 
         if room is None:
             return None
@@ -501,12 +601,7 @@ async def leave_room(room_id: str, user_id: str) -> RoomState | None:
             return room
 
         if room.status == "lobby":
-            board_map = await redis_store.get_board_map(room_id)
-            released_boards = sorted(
-                board_id for board_id, owner in board_map.items() if owner == user_id
-            )
-            if released_boards:
-                await redis_store.release_all_boards(room_id, user_id)
+            released_boards = await redis_store.release_user_boards(room_id, user_id)
             room.selections.pop(user_id, None)
             room.players.pop(user_id, None)
             removed = True
@@ -544,7 +639,7 @@ async def select_board(room_id: str, user_id: str, board_id: int) -> None:
     the same board even under heavy concurrent tapping, and no coarse room
     lock is taken on the hot path."""
 
-    room = await get_room(room_id)
+    room = await get_room(room_id, parts=("players",))
 
     if room is None:
         raise BingoError("Room not found")
@@ -557,10 +652,10 @@ async def select_board(room_id: str, user_id: str, board_id: int) -> None:
 
     # Affordability gate: balance must cover stake * (current boards + 1).
     # Reject before the Redis claim so an empty wallet can't lock a seat.
-    board_map = await redis_store.get_board_map(room_id)
-    if board_map.get(board_id) != user_id:
-        held = sum(1 for owner in board_map.values() if owner == user_id)
-        balance = Decimal(await asyncio.to_thread(wallet.get_balance, user_id))
+    held_boards = await redis_store.get_user_boards(room_id, user_id)
+    if board_id not in held_boards:
+        held = len(held_boards)
+        balance = Decimal(await executors.settlement.run(wallet.get_balance, user_id))
         price = Decimal(room.board_price)
         needed = price * (held + 1)
 
@@ -603,7 +698,7 @@ async def select_board(room_id: str, user_id: str, board_id: int) -> None:
 
 
 async def deselect_board(room_id: str, user_id: str, board_id: int) -> None:
-    room = await get_room(room_id)
+    room = await get_room(room_id, parts=())
 
     if room is None:
         raise BingoError("Room not found")
@@ -623,7 +718,7 @@ async def deselect_board(room_id: str, user_id: str, board_id: int) -> None:
 
 
 async def deselect_all(room_id: str, user_id: str) -> None:
-    room = await get_room(room_id)
+    room = await get_room(room_id, parts=())
 
     if room is None:
         raise BingoError("Room not found")
@@ -631,13 +726,9 @@ async def deselect_all(room_id: str, user_id: str) -> None:
     if room.status != "lobby":
         raise BingoError("Boards can only be changed in the lobby")
 
-    board_map = await redis_store.get_board_map(room_id)
-    released = sorted(
-        board_id for board_id, owner in board_map.items() if owner == user_id
-    )
-    removed = await redis_store.release_all_boards(room_id, user_id)
+    released = await redis_store.release_user_boards(room_id, user_id)
 
-    if removed:
+    if released:
         await _broadcast_board_delta(
             room_id,
             action="released_all",
@@ -669,7 +760,7 @@ async def start_round(room_id: str) -> tuple[RoomState | None, bool]:
     board_map = await redis_store.get_board_map(room_id)
 
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=())
 
         if room is None:
             return None, False
@@ -696,11 +787,11 @@ async def start_round(room_id: str) -> tuple[RoomState | None, bool]:
 
     game_id = _new_game_id()
 
-    # DB stake deduction happens off the event loop (sync SQLAlchemy).
-    paid = await asyncio.to_thread(wallet.charge_stakes, charges, game_id)
+    # DB stake deduction runs on the async engine (no threadpool hop).
+    paid = await wallet.charge_stakes_async(charges, game_id)
 
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=("players",))
 
         if room is None:
             return None, False
@@ -729,12 +820,7 @@ async def start_round(room_id: str) -> tuple[RoomState | None, bool]:
                 player.cards_count = len(boards)
 
             for board_id in boards:
-                card = CardState(
-                    card_id=str(board_id),
-                    user_id=uid,
-                    numbers=cards_module.generate_card_for_board(board_id),
-                    marks=cards_module.empty_marks(),
-                )
+                card = CardState(card_id=str(board_id), user_id=uid)
                 room.cards[card.card_id] = card
                 total_boards += 1
 
@@ -746,7 +832,7 @@ async def start_round(room_id: str) -> tuple[RoomState | None, bool]:
             # Everyone failed to pay - back to lobby.
             room.selections = {}
             room.lobby_ends_at = time.time() + settings.BINGO_LOBBY_SECONDS
-            await save_room(room)
+            await save_room(room, parts=redis_store.ROOM_PARTS)
             return room, False
 
         room.status = "in_progress"
@@ -773,11 +859,17 @@ async def start_round(room_id: str) -> tuple[RoomState | None, bool]:
         room.prize_awarded = False
         room.lobby_ends_at = None
 
-        await save_room(room)
+        # Balls are called from this pre-shuffled order by the lock-free
+        # ``redis_store.draw_ball``; seed it before the room flips to
+        # in_progress so the first draw never finds it missing.
+        await redis_store.set_draw_sequence(room_id, cards_module.shuffled_draw_order())
+
+        # Only the roster was loaded, but the fresh cartelas and the emptied
+        # drawn list must replace whatever the previous round left behind.
+        await save_room(room, parts=redis_store.ROOM_PARTS)
 
-    # Durably record the round for history/tracking (best-effort, off-loop).
-    await asyncio.to_thread(
-        wallet.record_round_start,
+    # Durably record the round for history/tracking (best-effort).
+    await wallet.record_round_start_async(
         game_id,
         room_id,
         board_price,
@@ -845,7 +937,7 @@ async def reset_to_lobby(room_id: str) -> RoomState | None:
         await save_room(room)
 
     if abandoned_game_id:
-        await asyncio.to_thread(wallet.record_round_abandoned, abandoned_game_id)
+        await wallet.record_round_abandoned_async(abandoned_game_id)
 
     await broadcast_room_sync(room_id)
 
@@ -901,13 +993,13 @@ async def _settle_winners(
         if room is None or room.status != "in_progress":
             return room, False
 
-        drawn_numbers = set(room.drawn)
-
-        winning: list[tuple[CardState, Pattern]] = []
-        for card in room.cards.values():
-            pattern = find_winning_pattern(card.numbers, drawn_numbers, patterns)
-            if pattern is not None:
-                winning.append((card, pattern))
+        all_cards = list(room.cards.values())
+        winning: list[tuple[CardState, Pattern]] = find_winning_boards(
+            [card.row() for card in all_cards],
+            all_cards,
+            drawn_bitset(room.drawn),
+            patterns,
+        )
 
         if not winning:
             return room, False
@@ -1005,15 +1097,20 @@ async def _settle_winners(
         room.derash_share = str(share)
         game_id = room.game_id or ""
 
-        await save_room(room)
+        # Only round metadata changed - leave the cartelas / drawn list as is.
+        await save_room(room, parts=())
         room_snapshot = room
 
+    # Cluster mode: the finished round reaches Redis under this instance's
+    # room lease before any money moves, so a stale owner can't settle too.
+    await redis_store.commit_room(room_id)
+
     if plan:
-        new_balances = await asyncio.to_thread(wallet.award_prizes, plan, game_id)
+        new_balances = await wallet.award_prizes_async(plan, game_id)
 
         if new_balances:
             async with room_lock(room_id):
-                room2 = await get_room(room_id)
+                room2 = await get_room(room_id, parts=("players",))
                 if room2 is not None:
                     for uid, balance in new_balances.items():
                         player = room2.players.get(uid)
@@ -1026,15 +1123,14 @@ async def _settle_winners(
     # Bot won: move real-player stake revenue onto the bot wallet. Stakes were
     # already debited from reals on select; this is not a second charge to them.
     if bot_won and bot_user_id and real_stake_total > 0:
-        bot_balance = await asyncio.to_thread(
-            wallet.credit_bot_system_gain,
+        bot_balance = await wallet.credit_bot_system_gain_async(
             bot_user_id,
             real_stake_total,
             game_id,
         )
         if bot_balance is not None and room_snapshot is not None:
             async with room_lock(room_id):
-                room2 = await get_room(room_id)
+                room2 = await get_room(room_id, parts=("players",))
                 if room2 is not None:
                     player = room2.players.get(bot_user_id)
                     if player is not None:
@@ -1054,8 +1150,7 @@ async def _settle_winners(
                 name = (meta.get("name") or "").strip()
                 if uid and name and uid not in public_names:
                     public_names[uid] = name
-        await asyncio.to_thread(
-            wallet.record_round_finish,
+        await wallet.record_round_finish_async(
             game_id,
             plan,
             room_snapshot.winning_pattern if room_snapshot else None,
@@ -1092,14 +1187,50 @@ async def _settle_winners(
     return room_snapshot, True
 
 
+# Per-room incremental win index for the round currently being drawn on this
+# instance (the draw leader). Rebuilt whenever the round's game_id changes.
+_win_indexes: dict[str, RoundWinIndex] = {}
+
+
 async def auto_detect_winners(
     room_id: str,
     patterns: tuple[Pattern, ...] = DEFAULT_PATTERNS,
 ) -> tuple[RoomState | None, bool]:
     """Server-side auto-claim: called after every ball so a completed card
-    ends the game immediately, without waiting for a manual BINGO click."""
+    ends the game immediately, without waiting for a manual BINGO click.
+
+    Each ball only updates the boards that contain it (``RoundWinIndex``);
+    the locked full settlement runs once some board has actually completed.
+    """
+
+    room = await get_room(room_id, parts=("drawn",))
 
-    return await _settle_winners(room_id, patterns)
+    if room is None or room.status != "in_progress":
+        _win_indexes.pop(room_id, None)
+        return room, False
+
+    index = _win_indexes.get(room_id)
+
+    if index is None or index.game_id != room.game_id or index.applied > len(room.drawn):
+        room = await get_room(room_id, parts=("cards", "drawn"))
+
+        if room is None or room.status != "in_progress":
+            return room, False
+
+        index = RoundWinIndex(room.game_id, room.cards, settings.BINGO_BOARD_POOL_MAX)
+        _win_indexes[room_id] = index
+
+    # ``advance`` keeps reporting completed boards until the index is
+    # dropped, so a settlement that raises or declines is retried next ball.
+    if not index.advance(room.drawn, patterns):
+        return room, False
+
+    settled_room, won = await _settle_winners(room_id, patterns)
+
+    if won:
+        _win_indexes.pop(room_id, None)
+
+    return settled_room, won
 
 
 async def claim_bingo(
@@ -1112,7 +1243,7 @@ async def claim_bingo(
     winning boards on the current drawn ball so co-winners split the derash."""
 
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=("cards", "drawn"))
 
         if room is None:
             raise BingoError("Room not found")
@@ -1125,12 +1256,18 @@ async def claim_bingo(
         if card is None or card.user_id != user_id:
             raise BingoError("Invalid card")
 
-        drawn_numbers = set(room.drawn)
-        pattern = find_winning_pattern(card.numbers, drawn_numbers, patterns)
+        hits = find_winning_boards(
+            [card.row()],
+            [card_id],
+            drawn_bitset(room.drawn),
+            patterns,
+        )
 
-        if pattern is None:
+        if not hits:
             return False, None, room
 
+        pattern = hits[0][1]
+
     settled_room, _ = await _settle_winners(room_id, patterns)
 
     return True, pattern, settled_room or room
@@ -1138,7 +1275,7 @@ async def claim_bingo(
 
 async def finish_without_winner(room_id: str) -> RoomState | None:
     async with room_lock(room_id):
-        room = await get_room(room_id)
+        room = await get_room(room_id, parts=())
 
         if room is None:
             return None
@@ -1149,7 +1286,7 @@ async def finish_without_winner(room_id: str) -> RoomState | None:
         await save_room(room)
 
     if game_id:
-        await asyncio.to_thread(wallet.record_round_abandoned, game_id)
+        await wallet.record_round_abandoned_async(game_id)
 
     await manager.broadcast(room_id, {
         "type": "game_over",
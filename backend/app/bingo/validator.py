@@ -5,13 +5,30 @@ The card is fixed at 5x5 (25 cells), so the marked state is packed into a
 (``app.bingo.patterns``). Validating a claim is then a handful of O(1)
 bitwise AND/compare operations - O(number of patterns), independent of how
 many numbers have been drawn.
+
+``find_winning_boards`` is the batch form used for settlement: a stack of
+cartelas (one row of 25 numbers per board, FREE as 0) is checked against a
+drawn bitset in one pass. NumPy is used when installed; otherwise the same
+API falls back to a pure-Python loop.
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
+
 from app.bingo.patterns import DEFAULT_PATTERNS, Pattern
 
+try:
+    import numpy as np
+except ImportError:  # optional accelerator - pure-Python path below
+    np = None
+
 CardGrid = list[list[int | None]]
+# One board flattened row-major into 25 ints, FREE center as 0: a tuple from
+# ``flatten_card`` or the cached ``bytes`` row from ``cards.board_row``.
+CardRow = Sequence[int]
+
+FREE_NUMBER = 0
 
 
 def compute_marked_mask(card: CardGrid, drawn_numbers: set[int]) -> int:
@@ -51,3 +68,109 @@ def is_winning_card(
     patterns: tuple[Pattern, ...] = DEFAULT_PATTERNS,
 ) -> bool:
     return find_winning_pattern(card, drawn_numbers, patterns) is not None
+
+
+def flatten_card(card: CardGrid) -> tuple[int, ...]:
+    """Row-major 25-int form of a grid (FREE -> ``FREE_NUMBER``) for stacking."""
+
+    return tuple(FREE_NUMBER if value is None else value for row in card for value in row)
+
+
+def drawn_bitset(drawn_numbers: Iterable[int]) -> int:
+    """Bit ``n`` set for every drawn number ``n``; bit 0 (FREE) always set."""
+
+    bits = 1 << FREE_NUMBER
+
+    for number in drawn_numbers:
+        bits |= 1 << number
+
+    return bits
+
+
+def marked_mask(row: CardRow, drawn_bits: int) -> int:
+    """25-bit marked mask of one flattened board against a drawn bitset."""
+
+    mask = 0
+
+    for bit, value in enumerate(row):
+        if (drawn_bits >> value) & 1:
+            mask |= 1 << bit
+
+    return mask
+
+
+def _find_winning_boards_py(
+    stack: Sequence[CardRow],
+    board_ids: Sequence,
+    drawn_bits: int,
+    patterns: tuple[Pattern, ...],
+) -> list[tuple[object, Pattern]]:
+    winners: list[tuple[object, Pattern]] = []
+
+    for board_id, row in zip(board_ids, stack):
+        row_mask = marked_mask(row, drawn_bits)
+
+        for pattern in patterns:
+            if (row_mask & pattern.mask) == pattern.mask:
+                winners.append((board_id, pattern))
+                break
+
+    return winners
+
+
+def _stack_cells(stack: Sequence[CardRow]):
+    if all(isinstance(row, (bytes, bytearray)) for row in stack):
+        flat = np.frombuffer(b"".join(stack), dtype=np.uint8)
+        return flat.reshape(len(stack), -1).astype(np.intp)
+
+    return np.array(
+        [
+            np.frombuffer(row, dtype=np.uint8) if isinstance(row, (bytes, bytearray)) else np.asarray(row)
+            for row in stack
+        ],
+        dtype=np.intp,
+    )
+
+
+def _find_winning_boards_np(
+    stack,
+    board_ids: Sequence,
+    drawn_bits: int,
+    patterns: tuple[Pattern, ...],
+) -> list[tuple[object, Pattern]]:
+    cells = _stack_cells(stack)
+    lookup = np.array(
+        [(drawn_bits >> n) & 1 for n in range(max(drawn_bits.bit_length(), int(cells.max()) + 1))],
+        dtype=np.uint32,
+    )
+    weights = np.left_shift(np.uint32(1), np.arange(cells.shape[1], dtype=np.uint32))
+    marked = (lookup[cells] * weights).sum(axis=1, dtype=np.uint32)
+
+    pattern_masks = np.array([p.mask for p in patterns], dtype=np.uint32)
+    hits = (marked[:, None] & pattern_masks) == pattern_masks
+    rows = np.flatnonzero(hits.any(axis=1))
+    first = hits[rows].argmax(axis=1)
+
+    return [(board_ids[row], patterns[idx]) for row, idx in zip(rows.tolist(), first.tolist())]
+
+
+def find_winning_boards(
+    stack: Sequence[CardRow],
+    board_ids: Sequence,
+    drawn_bits: int,
+    patterns: tuple[Pattern, ...] = DEFAULT_PATTERNS,
+) -> list[tuple[object, Pattern]]:
+    """Every ``(board_id, first matching pattern)`` among a stack of boards.
+
+    ``stack`` is N rows of 25 numbers (see ``flatten_card``) aligned with
+    ``board_ids``; ``drawn_bits`` comes from ``drawn_bitset``. Results keep
+    the stack's order. Pattern precedence matches ``find_winning_pattern``.
+    """
+
+    if len(board_ids) == 0 or not patterns:
+        return []
+
+    if np is not None:
+        return _find_winning_boards_np(stack, board_ids, drawn_bits, patterns)
+
+    return _find_winning_boards_py(stack, board_ids, drawn_bits, patterns)
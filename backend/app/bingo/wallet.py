@@ -1,23 +1,27 @@
-"""Bridge between the async Bingo engine and the synchronous SQLAlchemy
-wallet.
-
-The rest of the app talks to Postgres synchronously (``SessionLocal`` +
-``wallet_service``), so these helpers do their DB work inside a plain
-session and are invoked from the async game loop via ``asyncio.to_thread``.
-Every balance change is mirrored into ``wallet_transactions`` so staking a
-board and winning a derash show up in the same ledger as deposits.
+"""Bridge between the async Bingo engine and the SQLAlchemy wallet.
+
+The settlement logic is written once as plain session functions
+(``_charge_stakes(db, ...)`` etc.). The sync wrappers run them in a
+``SessionLocal`` session (admin/tests/bots); the ``*_async`` variants run the
+same functions on the async engine (``app.db.database.run_async``) so the
+game loop awaits Postgres directly instead of hopping onto a thread
+pool. A round's stakes and prizes each move in one set-based UPDATE plus
+one multi-row ledger INSERT (``wallet_service.apply_ledger_entries``). Every
+balance change is mirrored into ``wallet_transactions`` so staking a board
+and winning a derash show up in the same ledger as deposits.
 """
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import UUID
 
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, run_async
 from app.models.bingo_game import BingoGame, BingoGameResult
 from app.models.user import User
-from app.services.wallet_service import credit_wallet
+from app.services.wallet_service import LedgerEntry, apply_ledger_entries, credit_wallet
 
 STAKE_TX_TYPE = "BINGO_STAKE"
 WIN_TX_TYPE = "BINGO_WIN"
@@ -32,6 +36,42 @@ def _load_user(db, user_id: str) -> User | None:
         return None
 
 
+def _ledger_entries(
+    amounts: dict[str, Decimal],
+    *,
+    sign: int,
+    transaction_type: str,
+    description: Callable[[Decimal], str],
+) -> tuple[list[LedgerEntry], dict[UUID, str]]:
+    """Ledger entries for every positive amount with a valid user id, plus
+    the UUID -> caller's user_id string map for the returned balances."""
+
+    entries: list[LedgerEntry] = []
+    ids: dict[UUID, str] = {}
+
+    for user_id, amount in amounts.items():
+        if amount <= 0:
+            continue
+
+        try:
+            uid = UUID(user_id)
+        except (ValueError, TypeError):
+            continue
+
+        ids[uid] = user_id
+        entries.append(
+            LedgerEntry(
+                user_id=uid,
+                amount=amount * sign,
+                transaction_type=transaction_type,
+                description=description(amount),
+                reference_type="BINGO",
+            )
+        )
+
+    return entries, ids
+
+
 def charge_stakes(
     charges: dict[str, Decimal],
     game_id: str,
@@ -48,30 +88,10 @@ def charge_stakes(
     if not charges:
         return {}
 
-    paid: dict[str, str] = {}
     db = SessionLocal()
 
     try:
-        for user_id, amount in charges.items():
-            if amount <= 0:
-                continue
-
-            user = _load_user(db, user_id)
-
-            if user is None or user.balance < amount:
-                continue
-
-            credit_wallet(
-                db,
-                user,
-                amount=-amount,
-                transaction_type=STAKE_TX_TYPE,
-                description=f"Bingo stake ({game_id}) - {amount} ETB",
-                reference_type="BINGO",
-            )
-
-            paid[user_id] = str(user.balance)
-
+        paid = _charge_stakes(db, charges, game_id)
         db.commit()
     except Exception:
         db.rollback()
@@ -82,6 +102,32 @@ def charge_stakes(
     return paid
 
 
+async def charge_stakes_async(
+    charges: dict[str, Decimal],
+    game_id: str,
+) -> dict[str, str]:
+    """``charge_stakes`` on the async engine."""
+
+    if not charges:
+        return {}
+
+    return await run_async(_charge_stakes, charges, game_id)
+
+
+def _charge_stakes(db, charges: dict[str, Decimal], game_id: str) -> dict[str, str]:
+    # One guarded set-based debit for the whole round instead of a SELECT +
+    # ORM write per player; anyone who can't cover their stake is skipped.
+    entries, ids = _ledger_entries(
+        charges,
+        sign=-1,
+        transaction_type=STAKE_TX_TYPE,
+        description=lambda amount: f"Bingo stake ({game_id}) - {amount} ETB",
+    )
+    balances = apply_ledger_entries(db, entries, require_funds=True)
+
+    return {ids[uid]: str(balance) for uid, balance in balances.items()}
+
+
 def award_prize(user_id: str, amount: Decimal, game_id: str) -> str | None:
     """Credit the winner's derash. Returns the new balance (string) or None."""
 
@@ -126,30 +172,10 @@ def award_prizes(plan: dict[str, Decimal], game_id: str) -> dict[str, str]:
     if not plan:
         return {}
 
-    balances: dict[str, str] = {}
     db = SessionLocal()
 
     try:
-        for user_id, amount in plan.items():
-            if amount <= 0:
-                continue
-
-            user = _load_user(db, user_id)
-
-            if user is None:
-                continue
-
-            credit_wallet(
-                db,
-                user,
-                amount=amount,
-                transaction_type=WIN_TX_TYPE,
-                description=f"Bingo win ({game_id}) - {amount} ETB",
-                reference_type="BINGO",
-            )
-
-            balances[user_id] = str(user.balance)
-
+        balances = _award_prizes(db, plan, game_id)
         db.commit()
 
         return balances
@@ -160,6 +186,27 @@ def award_prizes(plan: dict[str, Decimal], game_id: str) -> dict[str, str]:
         db.close()
 
 
+async def award_prizes_async(plan: dict[str, Decimal], game_id: str) -> dict[str, str]:
+    """``award_prizes`` on the async engine."""
+
+    if not plan:
+        return {}
+
+    return await run_async(_award_prizes, plan, game_id)
+
+
+def _award_prizes(db, plan: dict[str, Decimal], game_id: str) -> dict[str, str]:
+    entries, ids = _ledger_entries(
+        plan,
+        sign=1,
+        transaction_type=WIN_TX_TYPE,
+        description=lambda amount: f"Bingo win ({game_id}) - {amount} ETB",
+    )
+    balances = apply_ledger_entries(db, entries)
+
+    return {ids[uid]: str(balance) for uid, balance in balances.items()}
+
+
 def get_balance(user_id: str) -> str:
     db = SessionLocal()
 
@@ -227,22 +274,9 @@ def credit_bot_system_gain(
 
     db = SessionLocal()
     try:
-        user = _load_user(db, bot_user_id)
-        if user is None:
-            return None
-
-        credit_wallet(
-            db,
-            user,
-            amount=amount,
-            transaction_type=BOT_SYSTEM_GAIN_TX_TYPE,
-            description=(
-                f"Bingo bot system gain ({game_id}) - real stakes +{amount} ETB"
-            ),
-            reference_type="BINGO_BOT",
-        )
+        balance = _credit_bot_system_gain(db, bot_user_id, amount, game_id)
         db.commit()
-        return str(user.balance)
+        return balance
     except Exception:
         db.rollback()
         raise
@@ -250,6 +284,40 @@ def credit_bot_system_gain(
         db.close()
 
 
+async def credit_bot_system_gain_async(
+    bot_user_id: str,
+    amount: Decimal,
+    game_id: str,
+) -> str | None:
+    if amount <= 0:
+        return None
+
+    return await run_async(_credit_bot_system_gain, bot_user_id, amount, game_id)
+
+
+def _credit_bot_system_gain(
+    db,
+    bot_user_id: str,
+    amount: Decimal,
+    game_id: str,
+) -> str | None:
+    user = _load_user(db, bot_user_id)
+    if user is None:
+        return None
+
+    credit_wallet(
+        db,
+        user,
+        amount=amount,
+        transaction_type=BOT_SYSTEM_GAIN_TX_TYPE,
+        description=(
+            f"Bingo bot system gain ({game_id}) - real stakes +{amount} ETB"
+        ),
+        reference_type="BINGO_BOT",
+    )
+    return str(user.balance)
+
+
 # ---------------------------------------------------------------------------
 # History persistence (BingoGame / BingoGameResult)
 # ---------------------------------------------------------------------------
@@ -269,6 +337,42 @@ def record_round_start(
     history write must never break live gameplay, so failures are swallowed.
     """
 
+    db = SessionLocal()
+
+    try:
+        _record_round_start(db, game_code, room_id, board_price, participants, derash)
+        db.commit()
+    except Exception:
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def record_round_start_async(
+    game_code: str,
+    room_id: str,
+    board_price: Decimal,
+    participants: dict[str, int],
+    derash: Decimal,
+) -> None:
+    """``record_round_start`` on the async engine (equally best-effort)."""
+
+    try:
+        await run_async(
+            _record_round_start, game_code, room_id, board_price, participants, derash
+        )
+    except Exception:
+        pass
+
+
+def _record_round_start(
+    db,
+    game_code: str,
+    room_id: str,
+    board_price: Decimal,
+    participants: dict[str, int],
+    derash: Decimal,
+) -> None:
     if not participants:
         return
 
@@ -277,51 +381,42 @@ def record_round_start(
     if total_boards <= 0:
         return
 
-    db = SessionLocal()
+    # Idempotent: never double-insert a round if start is retried.
+    existing = (
+        db.query(BingoGame)
+        .filter(BingoGame.game_code == game_code)
+        .first()
+    )
 
-    try:
-        # Idempotent: never double-insert a round if start is retried.
-        existing = (
-            db.query(BingoGame)
-            .filter(BingoGame.game_code == game_code)
-            .first()
-        )
-
-        if existing is not None:
-            return
-
-        game = BingoGame(
-            game_code=game_code,
-            room_id=room_id,
-            status="in_progress",
-            board_price=board_price,
-            total_boards=total_boards,
-            total_players=len(participants),
-            derash=derash,
-        )
-        db.add(game)
-        db.flush()
-
-        for user_id, boards in participants.items():
-            try:
-                uid = UUID(user_id)
-            except (ValueError, TypeError):
-                continue
+    if existing is not None:
+        return
 
-            db.add(
-                BingoGameResult(
-                    game_id=game.id,
-                    user_id=uid,
-                    boards_count=boards,
-                    stake_amount=board_price * boards,
-                )
+    game = BingoGame(
+        game_code=game_code,
+        room_id=room_id,
+        status="in_progress",
+        board_price=board_price,
+        total_boards=total_boards,
+        total_players=len(participants),
+        derash=derash,
+    )
+    db.add(game)
+    db.flush()
+
+    for user_id, boards in participants.items():
+        try:
+            uid = UUID(user_id)
+        except (ValueError, TypeError):
+            continue
+
+        db.add(
+            BingoGameResult(
+                game_id=game.id,
+                user_id=uid,
+                boards_count=boards,
+                stake_amount=board_price * boards,
             )
-
-        db.commit()
-    except Exception:
-        db.rollback()
-    finally:
-        db.close()
+        )
 
 
 def record_round_finish(
@@ -347,41 +442,115 @@ def record_round_finish(
     ``system_gain`` defaults to ``system_fee``.
     """
 
-    names = public_winner_names or {}
     db = SessionLocal()
 
     try:
-        game = (
-            db.query(BingoGame)
-            .filter(BingoGame.game_code == game_code)
+        _record_round_finish(
+            db, game_code, winners, winning_pattern, winner_count, system_fee,
+            public_winner_names, system_gain, bot_won, real_stake_total,
+            bot_stake_total,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def record_round_finish_async(
+    game_code: str,
+    winners: dict[str, Decimal],
+    winning_pattern: str | None,
+    winner_count: int,
+    system_fee: Decimal | None = None,
+    public_winner_names: dict[str, str] | None = None,
+    system_gain: Decimal | None = None,
+    bot_won: bool = False,
+    real_stake_total: Decimal | None = None,
+    bot_stake_total: Decimal | None = None,
+) -> None:
+    """``record_round_finish`` on the async engine (equally best-effort)."""
+
+    try:
+        await run_async(
+            _record_round_finish, game_code, winners, winning_pattern,
+            winner_count, system_fee, public_winner_names, system_gain, bot_won,
+            real_stake_total, bot_stake_total,
+        )
+    except Exception:
+        pass
+
+
+def _record_round_finish(
+    db,
+    game_code: str,
+    winners: dict[str, Decimal],
+    winning_pattern: str | None,
+    winner_count: int,
+    system_fee: Decimal | None,
+    public_winner_names: dict[str, str] | None,
+    system_gain: Decimal | None,
+    bot_won: bool,
+    real_stake_total: Decimal | None,
+    bot_stake_total: Decimal | None,
+) -> None:
+    names = public_winner_names or {}
+
+    game = (
+        db.query(BingoGame)
+        .filter(BingoGame.game_code == game_code)
+        .first()
+    )
+
+    if game is None:
+        return
+
+    game.status = "finished"
+    game.winning_pattern = winning_pattern
+    game.winner_count = winner_count
+    game.finished_at = datetime.now(timezone.utc)
+    if system_fee is not None:
+        game.system_fee = system_fee
+    if system_gain is not None:
+        game.system_gain = system_gain
+    elif system_fee is not None:
+        game.system_gain = system_fee
+    game.bot_won = bool(bot_won)
+    if real_stake_total is not None:
+        game.real_stake_total = real_stake_total
+    if bot_stake_total is not None:
+        game.bot_stake_total = bot_stake_total
+
+    for user_id, amount in winners.items():
+        try:
+            uid = UUID(user_id)
+        except (ValueError, TypeError):
+            continue
+
+        result = (
+            db.query(BingoGameResult)
+            .filter(
+                BingoGameResult.game_id == game.id,
+                BingoGameResult.user_id == uid,
+            )
             .first()
         )
 
-        if game is None:
-            return
-
-        game.status = "finished"
-        game.winning_pattern = winning_pattern
-        game.winner_count = winner_count
-        game.finished_at = datetime.now(timezone.utc)
-        if system_fee is not None:
-            game.system_fee = system_fee
-        if system_gain is not None:
-            game.system_gain = system_gain
-        elif system_fee is not None:
-            game.system_gain = system_fee
-        game.bot_won = bool(bot_won)
-        if real_stake_total is not None:
-            game.real_stake_total = real_stake_total
-        if bot_stake_total is not None:
-            game.bot_stake_total = bot_stake_total
-
-        for user_id, amount in winners.items():
+        if result is not None:
+            result.is_winner = True
+            result.amount_won = amount
+            public_name = (names.get(user_id) or "").strip()
+            if public_name:
+                result.public_winner_name = public_name[:80]
+
+    # Bot-only wins still stamp winner rows (amount 0) + public dummy name
+    # so history / admin can see who won without a BINGO_WIN credit.
+    if bot_won and not winners and names:
+        for user_id, public_name in names.items():
             try:
                 uid = UUID(user_id)
             except (ValueError, TypeError):
                 continue
-
             result = (
                 db.query(BingoGameResult)
                 .filter(
@@ -390,42 +559,12 @@ def record_round_finish(
                 )
                 .first()
             )
-
             if result is not None:
                 result.is_winner = True
-                result.amount_won = amount
-                public_name = (names.get(user_id) or "").strip()
-                if public_name:
-                    result.public_winner_name = public_name[:80]
-
-        # Bot-only wins still stamp winner rows (amount 0) + public dummy name
-        # so history / admin can see who won without a BINGO_WIN credit.
-        if bot_won and not winners and names:
-            for user_id, public_name in names.items():
-                try:
-                    uid = UUID(user_id)
-                except (ValueError, TypeError):
-                    continue
-                result = (
-                    db.query(BingoGameResult)
-                    .filter(
-                        BingoGameResult.game_id == game.id,
-                        BingoGameResult.user_id == uid,
-                    )
-                    .first()
-                )
-                if result is not None:
-                    result.is_winner = True
-                    result.amount_won = Decimal("0")
-                    label = (public_name or "").strip()
-                    if label:
-                        result.public_winner_name = label[:80]
-
-        db.commit()
-    except Exception:
-        db.rollback()
-    finally:
-        db.close()
+                result.amount_won = Decimal("0")
+                label = (public_name or "").strip()
+                if label:
+                    result.public_winner_name = label[:80]
 
 
 def record_round_abandoned(game_code: str) -> None:
@@ -434,18 +573,7 @@ def record_round_abandoned(game_code: str) -> None:
     db = SessionLocal()
 
     try:
-        game = (
-            db.query(BingoGame)
-            .filter(BingoGame.game_code == game_code)
-            .first()
-        )
-
-        if game is None or game.status == "finished":
-            return
-
-        game.status = "finished"
-        game.finished_at = datetime.now(timezone.utc)
-
+        _record_round_abandoned(db, game_code)
         db.commit()
     except Exception:
         db.rollback()
@@ -453,6 +581,27 @@ def record_round_abandoned(game_code: str) -> None:
         db.close()
 
 
+async def record_round_abandoned_async(game_code: str) -> None:
+    try:
+        await run_async(_record_round_abandoned, game_code)
+    except Exception:
+        pass
+
+
+def _record_round_abandoned(db, game_code: str) -> None:
+    game = (
+        db.query(BingoGame)
+        .filter(BingoGame.game_code == game_code)
+        .first()
+    )
+
+    if game is None or game.status == "finished":
+        return
+
+    game.status = "finished"
+    game.finished_at = datetime.now(timezone.utc)
+
+
 def get_user_history(
     user_id: str,
     limit: int = 10,
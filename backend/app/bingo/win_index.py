@@ -0,0 +1,132 @@
+"""Incremental per-ball win detection.
+
+Cartelas are deterministic per board id (``app.bingo.cards``), so the
+inverse index "ball number -> every (board, cell bit) holding it" for the
+whole 1..``BINGO_BOARD_POOL_MAX`` pool is computed once per process. A round
+then keeps one 25-bit marked mask per board in an ``array('I')`` and, on
+each ball, only ORs in the bits of the boards that actually contain it and
+tests *those* boards against the pattern masks - O(boards containing the
+ball) instead of re-deriving every card's mask from the full drawn set.
+
+The index is a fast pre-filter: ``app.bingo.service`` still settles through
+``validator.find_winning_boards`` under the room lock, so a stale or
+rebuilt index can never award a prize on its own.
+"""
+
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+
+from app.bingo import cards as cards_module
+from app.bingo.patterns import FREE_COL, FREE_ROW, Pattern, cell_index
+from app.bingo.redis_store import CardState
+
+FREE_MASK = 1 << cell_index(FREE_ROW, FREE_COL)
+
+
+def _row_cells(row):
+    """Yield (ball, bit) for every numbered cell of a 25-number row."""
+
+    for bit, value in enumerate(row):
+        if value:
+            yield value, bit
+
+
+@lru_cache(maxsize=4)
+def pool_index(pool_max: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """``ball_index[ball]`` lists every ``(board_id, bit)`` of boards
+    1..``pool_max`` containing that ball."""
+
+    by_ball: list[list[tuple[int, int]]] = [[] for _ in range(len(cards_module.ALL_NUMBERS) + 1)]
+
+    for board_id in range(1, pool_max + 1):
+        for ball, bit in _row_cells(cards_module.board_row(board_id)):
+            by_ball[ball].append((board_id, bit))
+
+    return tuple(tuple(entries) for entries in by_ball)
+
+
+class RoundWinIndex:
+    """Marked-mask state for one round's cartelas.
+
+    Boards whose grid is the standard deterministic cartela for their id use
+    the shared pool index; anything else (custom grids, ids outside the
+    pool) gets a small per-round index so detection stays exact."""
+
+    def __init__(
+        self,
+        game_id: str | None,
+        cards: dict[str, CardState],
+        pool_max: int,
+    ) -> None:
+        self.game_id = game_id
+        self.applied = 0
+        # Completed card ids, kept (in completion order) until the round is
+        # settled and the index dropped, so a failed settlement is retried.
+        self.completed: dict[str, None] = {}
+
+        self._pool_by_ball = pool_index(pool_max)
+        self._pool_card_ids: dict[int, str] = {}
+        self._extra_by_ball: dict[int, list[tuple[int, int]]] = {}
+        self._extra_card_ids: list[str] = []
+
+        for card_id, card in cards.items():
+            board_id = int(card_id) if card_id.isdigit() else 0
+
+            row = card.row()
+
+            if 1 <= board_id <= pool_max and bytes(row) == cards_module.board_row(board_id):
+                self._pool_card_ids[board_id] = card_id
+                continue
+
+            slot = pool_max + 1 + len(self._extra_card_ids)
+            self._extra_card_ids.append(card_id)
+
+            for ball, bit in _row_cells(row):
+                self._extra_by_ball.setdefault(ball, []).append((slot, bit))
+
+        self._pool_max = pool_max
+        self._masks = array("I", [FREE_MASK]) * (pool_max + 1 + len(self._extra_card_ids))
+
+    def _card_id(self, slot: int) -> str | None:
+        if slot <= self._pool_max:
+            return self._pool_card_ids.get(slot)
+
+        return self._extra_card_ids[slot - self._pool_max - 1]
+
+    def advance(
+        self,
+        drawn: list[int],
+        patterns: tuple[Pattern, ...],
+    ) -> list[str]:
+        """Apply balls drawn since the last call; return every card id that
+        completes any of ``patterns`` - including ones reported by earlier
+        calls, since the caller drops the index once the round settles."""
+
+        masks = self._masks
+        completed = self.completed
+
+        for ball in drawn[self.applied:]:
+            touched = list(self._extra_by_ball.get(ball, ()))
+
+            if 0 < ball < len(self._pool_by_ball):
+                touched.extend(self._pool_by_ball[ball])
+
+            for slot, bit in touched:
+                card_id = self._card_id(slot)
+
+                if card_id is None:
+                    continue
+
+                mask = masks[slot] | (1 << bit)
+                masks[slot] = mask
+
+                for pattern in patterns:
+                    if (mask & pattern.mask) == pattern.mask:
+                        completed[card_id] = None
+                        break
+
+        self.applied = len(drawn)
+
+        return list(completed)
@@ -2,7 +2,8 @@
 
 Auth: JWT passed as ``?token=`` (browsers can't set custom headers on the
 WebSocket handshake), decoded with the same ``decode_access_token`` used by
-the REST API. The handler loop itself only ever parses JSON and delegates
+the REST API and resolved through the shared identity cache
+(``app.core.identity``), so reconnects don't query ``users``. The handler loop itself only ever parses JSON and delegates
 to ``app.bingo.service`` - no heavy work (Redis I/O, validation) happens
 inline beyond what those calls already need.
 """
@@ -12,23 +13,22 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.bingo import game_loop, redis_store, service, wallet
+from app.bingo import cluster, game_loop, redis_store, service, wallet
 from app.bingo.manager import manager
 from app.bingo.service import BingoError
+from app.core import executors, identity
 from app.core.config import settings
-from app.db.database import SessionLocal
-from app.core.security import decode_access_token
-from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 RECEIVE_TIMEOUT_SECONDS = 60
+REDIRECT_CLOSE_CODE = 4307
+OWNER_UNAVAILABLE_CLOSE_CODE = 1013  # "try again later": no live owner yet
 
 
 def _parse_board_id(raw) -> int:
@@ -57,29 +57,44 @@ async def _allow(user_id: str, action: str, limit: int, window_ms: int) -> bool:
         return True
 
 
-def _authenticate(token: str) -> User | None:
-    try:
-        payload = decode_access_token(token)
-    except Exception:
-        return None
+def _redirect_frame(room_id: str) -> dict | None:
+    origin = cluster.owner_url(room_id)
+
+    return {"type": "redirect", "origin": origin} if origin else None
 
-    user_id = payload.get("sub")
 
-    if not user_id:
-        return None
+async def _redirect(websocket: WebSocket, room_id: str) -> None:
+    """Cluster mode: send an accepted socket on to the room's owner."""
 
-    db = SessionLocal()
+    frame = _redirect_frame(room_id)
 
     try:
-        return db.query(User).filter(User.id == UUID(user_id)).first()
+        if frame is not None:
+            await websocket.send_text(json.dumps(frame))
+
+        await websocket.close(code=REDIRECT_CLOSE_CODE if frame else OWNER_UNAVAILABLE_CLOSE_CODE)
     except Exception:
-        return None
-    finally:
-        db.close()
+        pass
+
+
+async def _redirect_moved_rooms() -> None:
+    """Ring change: local sockets of rooms this instance no longer owns follow
+    the room to its new owner (their handlers skip ``leave_room``)."""
+
+    for room_id in manager.local_room_ids():
+        if cluster.is_owner(room_id):
+            continue
 
+        frame = _redirect_frame(room_id)
+        await manager.close_room(
+            room_id,
+            REDIRECT_CLOSE_CODE if frame else OWNER_UNAVAILABLE_CLOSE_CODE,
+            "Room moved",
+            frame,
+        )
 
-def _display_name(user: User) -> str:
-    return user.first_name or user.username or f"Player {str(user.id)[:6]}"
+
+cluster.on_ring_change(_redirect_moved_rooms)
 
 
 @router.websocket("/ws/bingo/{room_id}")
@@ -88,28 +103,34 @@ async def bingo_ws(websocket: WebSocket, room_id: str, token: str | None = None)
         await websocket.close(code=4401)
         return
 
-    user = await asyncio.to_thread(_authenticate, token)
+    user = await identity.authenticate(token)
 
     if user is None:
         await websocket.close(code=4401)
         return
 
-    room = await redis_store.get_room(room_id)
+    room = await redis_store.get_room(room_id, parts=())
 
     if room is None:
         await websocket.close(code=4404)
         return
 
     user_id = str(user.id)
-    display_name = _display_name(user)
+    display_name = user.display_name
 
     await websocket.accept()
+
+    if not cluster.is_owner(room_id):
+        # Cluster mode: this room lives on another instance.
+        await _redirect(websocket, room_id)
+        return
+
     conn_token = await manager.connect(room_id, user_id, display_name, websocket)
 
     try:
         # Always pull the live Postgres balance (not a possibly-stale ORM attr
         # from the closed auth session) so each user's lobby wallet is theirs.
-        balance = await asyncio.to_thread(wallet.get_balance, user_id)
+        balance = await executors.history.run(wallet.get_balance, user_id)
         await service.join_room(room_id, user_id, display_name, balance)
         # Make sure the lobby/game lifecycle loop is running for this room.
         game_loop.ensure_game_loop(room_id)
@@ -130,6 +151,11 @@ async def bingo_ws(websocket: WebSocket, room_id: str, token: str | None = None)
                 # No traffic (not even a ping) - treat as a dead connection.
                 break
 
+            if not cluster.is_owner(room_id):
+                # The ring moved the room mid-session; never mutate it here.
+                await _redirect(websocket, room_id)
+                break
+
             manager.touch(room_id, user_id)
             await _dispatch(room_id, user_id, raw)
 
@@ -145,7 +171,9 @@ async def bingo_ws(websocket: WebSocket, room_id: str, token: str | None = None)
         # and freeze/reset the shared lobby countdown.
         removed_current = await manager.disconnect(room_id, user_id, conn_token)
 
-        if removed_current:
+        # A socket sent on to a new owner reconnects there; the owner keeps
+        # the player's state.
+        if removed_current and cluster.is_owner(room_id):
             try:
                 await service.leave_room(room_id, user_id)
             except BingoError:
@@ -169,7 +197,7 @@ async def _dispatch(room_id: str, user_id: str, raw: str) -> None:
         if message_type == "join":
             # Refresh from the authoritative DB balance so the wallet shown on
             # (re)join / manual refresh reflects deposits & prior stakes/wins.
-            balance = await asyncio.to_thread(wallet.get_balance, user_id)
+            balance = await executors.history.run(wallet.get_balance, user_id)
             room = await service.sync_player_balance(room_id, user_id, balance)
             if room is not None:
                 game_loop.ensure_game_loop(room_id)
@@ -231,6 +259,13 @@ async def _dispatch(room_id: str, user_id: str, raw: str) -> None:
                     "reason": "No winning pattern yet",
                 })
 
+        elif message_type == "resync":
+            # Client missed a ``ball`` (seq gap) - resend the full snapshot.
+            if not await _allow(user_id, "resync", settings.BINGO_RATE_SELECT_MAX, settings.BINGO_RATE_SELECT_WINDOW_MS):
+                return
+
+            await service.send_room_state(room_id, [user_id])
+
         elif message_type == "ping":
             await manager.send_personal(room_id, user_id, {"type": "pong"})
 
@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # JWT subject -> identity cache for socket/REST auth (app.core.identity).
+    AUTH_IDENTITY_CACHE_SIZE: int = 10000
+    AUTH_IDENTITY_CACHE_TTL_SECONDS: float = 60.0
 
     DATABASE_URL: str
 
@@ -21,6 +24,15 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
+    # Async engine (game settlement paths); separate pool from the sync one.
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 20
+    # Blocking DB work pools (app.core.executors). Keep the sum within
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW so workers never queue for a connection.
+    DB_EXECUTOR_SETTLEMENT_WORKERS: int = 6
+    DB_EXECUTOR_HISTORY_WORKERS: int = 4
+    DB_EXECUTOR_ADMIN_WORKERS: int = 2
+    DB_EXECUTOR_AUTH_WORKERS: int = 3
 
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_BOT_USERNAME: str = ""
@@ -33,6 +45,16 @@ class Settings(BaseSettings):
     TELEGRAM_WEBAPP_URL: str = ""
 
     REDIS_URL: str = "redis://localhost:6379"
+    # Pub/Sub events published within this window are coalesced into one
+    # frame per channel (0 = flush on the next event-loop turn).
+    REDIS_FANOUT_BATCH_MS: float = 5.0
+    # Outbound frames buffered per WebSocket before a slow client is dropped.
+    WS_SEND_QUEUE: int = 256
+
+    # Aviator cash-out credits queued within this window commit as one
+    # transaction (at most AVIATOR_CASHOUT_BATCH_MAX cash-outs each).
+    AVIATOR_CASHOUT_BATCH_MS: float = 5.0
+    AVIATOR_CASHOUT_BATCH_MAX: int = 200
 
     # Comma-separated Telegram usernames allowed to use privileged endpoints.
     # Authorization always uses the username stored on the JWT-authenticated user.
@@ -50,6 +72,14 @@ class Settings(BaseSettings):
     BINGO_LOBBY_SECONDS: int = 40          # shared lobby countdown
     BINGO_WINNER_OVERLAY_SECONDS: int = 7  # hold beat + winner splash before next lobby
 
+    # Optional cluster mode: rooms are owned by one instance each (consistent
+    # hash ring over live instances). The owner keeps room state in memory and
+    # snapshots it to Redis write-behind; sockets on other instances get a
+    # ``redirect`` to BINGO_CLUSTER_PUBLIC_URL of the owner.
+    BINGO_CLUSTER_MODE: bool = False
+    BINGO_CLUSTER_PUBLIC_URL: str = ""     # required in cluster mode, e.g. wss://bingo-2.example.com
+    BINGO_CLUSTER_FLUSH_MS: int = 50       # write-behind window for owned rooms
+
     # Per-user abuse throttles (fixed window). Limits are generous enough for
     # fast legitimate tapping but cap runaway clients / scripted floods.
     BINGO_RATE_SELECT_MAX: int = 15        # select/deselect ops ...
@@ -0,0 +1,163 @@
+"""Named, bounded thread pools for blocking database work.
+
+``asyncio.to_thread`` shares the loop's default executor (sized from the CPU
+count) between every caller, so a burst of one kind of blocking call - a wave
+of Lotto claims, a History tab storm - queues Bingo stake checks behind it.
+Each pool here has its own fixed set of workers, sized in settings so the
+pools together fit the sync SQLAlchemy pool (``DB_POOL_SIZE +
+DB_MAX_OVERFLOW``) and a worker never sits waiting for a connection:
+
+- ``settlement``: money movement and balance checks on live game paths
+- ``history``: read-only history, snapshot and wallet-refresh reads
+- ``admin``: admin status and house-bot bookkeeping
+- ``auth``: identity lookups on a cache miss
+
+Every pool counts queue depth, wait time (submit -> worker start) and run
+time; ``stats`` is served from ``/api/health``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorStats:
+    """Counters for one pool (wait = queued before a worker picked the call
+    up, run = time on the worker)."""
+
+    workers: int
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    queued: int = 0
+    queued_max: int = 0
+    running: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+    run_seconds_max: float = 0.0
+
+    def record_submit(self) -> None:
+        self.submitted += 1
+        self.queued += 1
+        self.queued_max = max(self.queued_max, self.queued)
+
+    def record_start(self, waited: float) -> None:
+        self.queued -= 1
+        self.running += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_finish(self, seconds: float, ok: bool) -> None:
+        self.running -= 1
+        self.completed += int(ok)
+        self.failed += int(not ok)
+        self.run_seconds_total += seconds
+        self.run_seconds_max = max(self.run_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        started = max(self.submitted - self.queued, 1)
+        finished = max(self.completed + self.failed, 1)
+        return {
+            **asdict(self),
+            "wait_seconds_avg": self.wait_seconds_total / started,
+            "run_seconds_avg": self.run_seconds_total / finished,
+        }
+
+
+class BoundedExecutor:
+    """A fixed-size thread pool with per-call queue/wait/run accounting.
+    Await ``executor.run(fn, *args, **kwargs)`` like ``asyncio.to_thread``."""
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = max(1, workers)
+        self.stats = ExecutorStats(workers=self.workers)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=f"db-{self.name}",
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        # Like ``to_thread``: the call sees the caller's context variables.
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        submitted_at = time.perf_counter()
+
+        def work() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self.stats.record_start(started_at - submitted_at)
+
+            ok = False
+            try:
+                result = call()
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self.stats.record_finish(time.perf_counter() - started_at, ok)
+
+        with self._lock:
+            self.stats.record_submit()
+
+        future = self._executor().submit(work)
+        future.add_done_callback(self._forget_cancelled)
+
+        return await asyncio.wrap_future(future)
+
+    def _forget_cancelled(self, future) -> None:
+        # A call cancelled before it reached a worker never runs ``work``, so
+        # undo its queue count here. ``wrap_future`` cancels the pool future
+        # in a later loop callback, hence a done callback rather than a check
+        # in ``run``.
+        if future.cancelled():
+            with self._lock:
+                self.stats.queued -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return self.stats.snapshot()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+settlement = BoundedExecutor("settlement", settings.DB_EXECUTOR_SETTLEMENT_WORKERS)
+history = BoundedExecutor("history", settings.DB_EXECUTOR_HISTORY_WORKERS)
+admin = BoundedExecutor("admin", settings.DB_EXECUTOR_ADMIN_WORKERS)
+auth = BoundedExecutor("auth", settings.DB_EXECUTOR_AUTH_WORKERS)
+
+_executors = (settlement, history, admin, auth)
+
+
+def stats() -> dict[str, dict]:
+    return {executor.name: executor.snapshot() for executor in _executors}
+
+
+def shutdown() -> None:
+    for executor in _executors:
+        executor.shutdown()
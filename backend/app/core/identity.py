@@ -0,0 +1,202 @@
+"""Cached JWT -> user identity resolution for WebSocket and REST auth.
+
+Every socket connect (and most REST calls) only needs to know *who* the
+bearer is, yet used to decode the JWT and ``SELECT`` the full ``users`` row.
+``authenticate`` decodes the token locally and looks its ``sub`` up in a
+bounded, thread-safe TTL+LRU cache of ``Identity`` records, so a reconnect
+storm after a deploy costs no Postgres round trips once warm.
+
+Staleness is bounded two ways: entries expire after
+``AUTH_IDENTITY_CACHE_TTL_SECONDS``, and admin actions that change a user
+(deletion, balance adjustment) call ``invalidate``, which drops the entry
+here and publishes the ids on ``auth:identity`` so every other process drops
+them too. Balances are never cached - wallet reads still go to Postgres.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.core import executors
+from app.core.config import settings
+from app.core.redis_fanout import ChannelFanout
+from app.core.security import decode_access_token
+from app.db.database import SessionLocal
+from app.models.user import User
+
+CHANNEL = "auth:identity"
+
+
+@dataclass(frozen=True, slots=True)
+class Identity:
+    id: UUID
+    username: str | None
+    first_name: str | None
+    photo_url: str | None
+    is_active: bool
+    is_bot: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> Identity:
+        return cls(
+            id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            photo_url=user.photo_url,
+            is_active=bool(user.is_active),
+            is_bot=bool(user.is_bot),
+        )
+
+    @property
+    def display_name(self) -> str:
+        return self.first_name or self.username or f"Player {str(self.id)[:6]}"
+
+
+class IdentityCache:
+    """TTL+LRU map of token subject -> ``Identity``. Thread-safe: it is read
+    from the event loop and from sync dependencies in the threadpool."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Identity]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Identity | None:
+        with self._lock:
+            entry = self._entries.get(subject)
+
+            if entry is None:
+                return None
+
+            expires_at, identity = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                return None
+
+            self._entries.move_to_end(subject)
+
+            return identity
+
+    def put(self, subject: str, identity: Identity) -> None:
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, identity)
+            self._entries.move_to_end(subject)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, *subjects: str) -> None:
+        with self._lock:
+            for subject in subjects:
+                self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+cache = IdentityCache(
+    settings.AUTH_IDENTITY_CACHE_SIZE,
+    settings.AUTH_IDENTITY_CACHE_TTL_SECONDS,
+)
+
+
+def token_subject(token: str) -> str | None:
+    """The ``sub`` of a valid token, or None for anything unusable."""
+
+    try:
+        subject = decode_access_token(token).get("sub")
+        UUID(subject)
+    except Exception:
+        return None
+
+    return subject
+
+
+def load_identity(subject: str) -> Identity | None:
+    """Blocking: read one user from Postgres and cache the result."""
+
+    db = SessionLocal()
+
+    try:
+        user = db.query(User).filter(User.id == UUID(subject)).first()
+    except Exception:
+        return None
+    finally:
+        db.close()
+
+    if user is None:
+        return None
+
+    identity = Identity.from_user(user)
+    cache.put(subject, identity)
+
+    return identity
+
+
+async def authenticate(token: str) -> Identity | None:
+    """Resolve a bearer token; only a cache miss leaves the event loop."""
+
+    subject = token_subject(token)
+
+    if subject is None:
+        return None
+
+    return cache.get(subject) or await executors.auth.run(load_identity, subject)
+
+
+async def _dispatch_invalidation(message: dict) -> None:
+    cache.discard(*(str(user_id) for user_id in message.get("user_ids", ())))
+
+
+fanout = ChannelFanout(CHANNEL, _dispatch_invalidation)
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def invalidate(*user_ids: UUID | str) -> None:
+    """Drop users from every process's cache. Safe to call from sync admin
+    handlers running in the threadpool."""
+
+    subjects = [str(user_id) for user_id in user_ids]
+
+    if not subjects:
+        return
+
+    cache.discard(*subjects)
+
+    if _loop is None or _loop.is_closed():
+        return
+
+    payload = json.dumps({"user_ids": subjects})
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is _loop:
+        fanout.publish_encoded(payload)
+    else:
+        _loop.call_soon_threadsafe(fanout.publish_encoded, payload)
+
+
+async def start() -> None:
+    global _loop
+
+    _loop = asyncio.get_running_loop()
+    await fanout.start()
+
+
+async def stop() -> None:
+    global _loop
+
+    await fanout.stop()
+    _loop = None
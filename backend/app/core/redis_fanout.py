@@ -8,6 +8,13 @@ module for a single shared channel per game. Pattern:
    ``_target`` / ``_exclude``).
 3. Other processes receive the message and deliver locally; the origin
    drops the Redis echo so clients never see duplicates.
+
+Publishes go through ``frame_batcher``: events produced within
+``REDIS_FANOUT_BATCH_MS`` are coalesced into one frame per channel and all
+channels are flushed in a single pipeline. A frame carries each event's
+routing fields separately from its already-encoded JSON payload, so
+receivers hand the payload text straight to sockets without a decode /
+re-encode. Plain JSON messages (older publishers) are still accepted.
 """
 
 from __future__ import annotations
@@ -15,25 +22,146 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 
 from app.bingo.redis_store import get_redis
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 ORIGIN_FIELD = "_origin"
 TARGET_FIELD = "_target"
 EXCLUDE_FIELD = "_exclude"
+# Set on frame entries whose payload must be decoded and dispatched as a dict
+# (internal control events rather than client-bound messages).
+CONTROL_FIELD = "_control"
+# Message type of a payload that later frames supersede (e.g. countdown
+# ticks), so receivers can coalesce it without decoding the payload.
+KIND_FIELD = "_kind"
+
+# Frame layout (text, ``\n``-separated): the marker line, then one
+# ``meta JSON`` / ``payload JSON`` line pair per event. ``json.dumps`` never
+# emits a raw newline, and the record-separator marker can't start JSON.
+FRAME_MARKER = "\x1ef1"
+# Keep a single burst from producing one multi-megabyte PUBLISH.
+FRAME_MAX_ENTRIES = 256
 
 Dispatcher = Callable[[dict], Awaitable[None]]
+EncodedDispatcher = Callable[[dict, str], Awaitable[None]]
+
+Entry = tuple[dict, str]
+
+
+def encode_frame(entries: Iterable[Entry]) -> str:
+    lines = [FRAME_MARKER]
+
+    for meta, payload in entries:
+        lines.append(json.dumps(meta, separators=(",", ":")))
+        lines.append(payload)
+
+    return "\n".join(lines)
+
+
+def decode_frame(data: str) -> list[Entry] | None:
+    """Entries of a batched frame, or None if ``data`` is a plain message."""
+
+    if not data.startswith(FRAME_MARKER + "\n"):
+        return None
+
+    lines = data.split("\n")
+
+    return [
+        (json.loads(lines[i]), lines[i + 1])
+        for i in range(1, len(lines) - 1, 2)
+    ]
+
+
+def split_routing(message: dict) -> tuple[dict, dict]:
+    """``(meta, body)``: pull the underscore routing fields out of a message."""
+
+    body = dict(message)
+    meta = {
+        key: body.pop(key)
+        for key in (ORIGIN_FIELD, TARGET_FIELD, EXCLUDE_FIELD)
+        if key in body
+    }
+
+    return meta, body
+
+
+class FrameBatcher:
+    """Process-wide publish buffer shared by every channel."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, list[Entry]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def add(self, channel: str, meta: dict, payload: str) -> None:
+        self._pending.setdefault(channel, []).append((meta, payload))
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.REDIS_FANOUT_BATCH_MS / 1000)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for channel, entries in pending.items():
+                    for start in range(0, len(entries), FRAME_MAX_ENTRIES):
+                        chunk = entries[start:start + FRAME_MAX_ENTRIES]
+                        pipe.publish(channel, encode_frame(chunk))
+                await pipe.execute()
+        except Exception:
+            logger.exception("fanout flush failed for %d channel(s)", len(pending))
+
+
+frame_batcher = FrameBatcher()
+
+
+async def dispatch_entries(
+    entries: Iterable[Entry],
+    dispatch: Dispatcher,
+    dispatch_encoded: EncodedDispatcher | None,
+) -> None:
+    """Route each frame entry to the encoded fast path when possible."""
+
+    for meta, payload in entries:
+        if dispatch_encoded is not None and not meta.get(CONTROL_FIELD):
+            await dispatch_encoded(meta, payload)
+            continue
+
+        try:
+            message = json.loads(payload)
+        except (TypeError, ValueError):
+            continue
+
+        if isinstance(message, dict):
+            message.update(meta)
+            message.pop(CONTROL_FIELD, None)
+            await dispatch(message)
 
 
 class ChannelFanout:
     """Process-wide listener for one Redis Pub/Sub channel."""
 
-    def __init__(self, channel: str, dispatch: Dispatcher) -> None:
+    def __init__(
+        self,
+        channel: str,
+        dispatch: Dispatcher,
+        dispatch_encoded: EncodedDispatcher | None = None,
+    ) -> None:
         self.channel = channel
         self._dispatch = dispatch
+        self._dispatch_encoded = dispatch_encoded
         self._pubsub = None
         self._task: asyncio.Task | None = None
 
@@ -44,6 +172,8 @@ class ChannelFanout:
         self._task = asyncio.create_task(self._listen(), name=f"fanout:{self.channel}")
 
     async def stop(self) -> None:
+        await frame_batcher.flush()
+
         if self._task is not None:
             self._task.cancel()
             try:
@@ -64,8 +194,13 @@ class ChannelFanout:
             self._pubsub = None
 
     async def publish(self, message: dict) -> None:
-        redis = get_redis()
-        await redis.publish(self.channel, json.dumps(message))
+        meta, body = split_routing(message)
+        self.publish_encoded(json.dumps(body), **meta)
+
+    def publish_encoded(self, payload: str, **meta) -> None:
+        """Queue an already-encoded payload; ``meta`` holds routing fields."""
+
+        frame_batcher.add(self.channel, meta, payload)
 
     async def _listen(self) -> None:
         assert self._pubsub is not None
@@ -99,15 +234,19 @@ class ChannelFanout:
                 continue
 
             try:
-                payload = json.loads(data)
+                entries = decode_frame(data)
+                # Plain JSON message from a publisher without batching.
+                message = json.loads(data) if entries is None else None
             except (TypeError, ValueError):
                 continue
 
-            if not isinstance(payload, dict):
-                continue
-
             try:
-                await self._dispatch(payload)
+                if entries is not None:
+                    await dispatch_entries(
+                        entries, self._dispatch, self._dispatch_encoded
+                    )
+                elif isinstance(message, dict):
+                    await self._dispatch(message)
             except Exception:
                 logger.exception("%s fanout dispatch error", self.channel)
 
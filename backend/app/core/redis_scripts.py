@@ -0,0 +1,108 @@
+"""Process-wide registry of server-side Lua scripts, invoked by SHA.
+
+Modules declare each script once at import time with ``register_script`` and
+call the returned handle instead of ``redis.eval(<source>, ...)``, so only
+the 40-byte SHA crosses the wire on lock releases, leader renewals, board
+reservations and rate-limit checks. ``preload_scripts`` SCRIPT LOADs every
+registered script at startup; a NOSCRIPT reply (Redis restart, failover,
+SCRIPT FLUSH) reloads that one script and retries the call once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+logger = logging.getLogger(__name__)
+
+
+class LuaScript:
+    """A registered script. Await ``script(redis, keys=..., args=...)``."""
+
+    __slots__ = ("name", "source", "sha")
+
+    def __init__(self, name: str, source: str) -> None:
+        self.name = name
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    async def __call__(
+        self,
+        redis: Redis,
+        keys: Sequence = (),
+        args: Sequence = (),
+    ):
+        try:
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            logger.info("reloading lua script %s after NOSCRIPT", self.name)
+            await redis.script_load(self.source)
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+
+
+async def eval_many(
+    redis: Redis,
+    calls: Sequence[tuple[LuaScript, Sequence, Sequence]],
+) -> list:
+    """Run several ``(script, keys, args)`` calls in one pipelined round
+    trip; on NOSCRIPT the involved scripts are reloaded and the batch retried
+    once."""
+
+    for attempt in range(2):
+        async with redis.pipeline(transaction=False) as pipe:
+            for script, keys, args in calls:
+                pipe.evalsha(script.sha, len(keys), *keys, *args)
+
+            try:
+                return await pipe.execute()
+            except NoScriptError:
+                if attempt:
+                    raise
+
+        for script in {script for script, _, _ in calls}:
+            await redis.script_load(script.source)
+
+    return []
+
+
+_scripts: dict[str, LuaScript] = {}
+
+
+def register_script(name: str, source: str) -> LuaScript:
+    """Register ``source`` under ``name`` (idempotent for identical source)."""
+
+    existing = _scripts.get(name)
+
+    if existing is not None:
+        if existing.source != source:
+            raise ValueError(f"Lua script {name!r} is already registered")
+        return existing
+
+    script = LuaScript(name, source)
+    _scripts[name] = script
+
+    return script
+
+
+def registered_scripts() -> tuple[LuaScript, ...]:
+    return tuple(_scripts.values())
+
+
+async def preload_scripts(redis: Redis) -> None:
+    """SCRIPT LOAD every registered script in one round trip."""
+
+    scripts = registered_scripts()
+
+    if not scripts:
+        return
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for script in scripts:
+            pipe.script_load(script.source)
+        await pipe.execute()
+
+    logger.info("preloaded %d lua scripts", len(scripts))
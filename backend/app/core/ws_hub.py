@@ -0,0 +1,359 @@
+"""Shared WebSocket hub machinery for the Bingo, Aviator, Dama and Lotto sockets.
+
+Every message is encoded once (``encode``: orjson when installed, stdlib
+``json`` otherwise) and the same text is queued to each recipient. Each socket
+owns a bounded outbound queue drained by a single writer task, so fan-out is
+one O(1) enqueue per socket. Superseded frames (countdown ticks) collapse to
+the newest one, and a client that still overflows its queue - or whose send
+fails or stalls - is closed; its receive loop then runs the normal
+``disconnect`` path, so there is one dead-socket policy for every game.
+
+``SocketHub`` owns connections and writers; ``UserHub`` adds the per-user
+registry and Redis fan-out used by the game-wide Aviator, Dama and Lotto
+hubs. Personalized messages go through ``send`` (one user, encoded for that
+user) rather than ``broadcast``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.core.redis_fanout import (
+    EXCLUDE_FIELD,
+    KIND_FIELD,
+    ORIGIN_FIELD,
+    TARGET_FIELD,
+    ChannelFanout,
+    split_routing,
+)
+
+try:
+    import orjson
+except ImportError:  # optional accelerator - stdlib json below
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Frame types a newer frame of the same type fully replaces: the client only
+# ever needs the latest countdown, so a backlog of them collapses to one.
+COALESCED_TYPES = frozenset({"lobby_tick", "tick"})
+SEND_TIMEOUT_SECONDS = 2.0
+REPLACED_CLOSE_CODE = 4409
+OVERFLOW_CLOSE_CODE = 1013  # "try again later"
+
+
+def encode(message: dict) -> str:
+    """Serialize a client-bound message once for every recipient."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints past 64 bits - let the stdlib handle it
+
+    return json.dumps(message)
+
+
+def frame_kind(message: dict) -> str | None:
+    """The message type when later frames of that type supersede it."""
+
+    kind = message.get("type")
+
+    return kind if kind in COALESCED_TYPES else None
+
+
+@dataclass(eq=False)
+class Connection:
+    websocket: WebSocket
+    user_id: str
+    display_name: str = ""
+    # Unique per physical socket. When a user reopens the Mini App (new tab,
+    # reconnect, React StrictMode double-mount) the newer socket replaces the
+    # older one under the same user_id; the token lets us tell the two apart so
+    # the *older* socket tearing down can never clobber the *newer* live one.
+    token: str = field(default_factory=lambda: uuid.uuid4().hex)
+    last_seen: float = field(default_factory=time.time)
+    # ``(kind, payload)`` frames for the writer; a coalesced kind is queued
+    # once with ``payload=None`` and its newest text lives in ``latest``.
+    outbox: deque[tuple[str | None, str | None]] = field(default_factory=deque)
+    latest: dict[str, str] = field(default_factory=dict)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    writer: asyncio.Task | None = None
+    closed: bool = False
+
+    def enqueue(self, payload: str, kind: str | None = None) -> bool:
+        """Queue a frame for the writer. Returns False only when the queue
+        overflowed (the hub then drops the connection)."""
+
+        if self.closed:
+            return True
+
+        if kind in COALESCED_TYPES:
+            superseded = kind in self.latest
+            self.latest[kind] = payload
+
+            if superseded:
+                return True
+
+            self.outbox.append((kind, None))
+        else:
+            self.outbox.append((None, payload))
+
+        if len(self.outbox) > settings.WS_SEND_QUEUE:
+            return False
+
+        self.ready.set()
+
+        return True
+
+    def next_frame(self) -> str | None:
+        if not self.outbox:
+            return None
+
+        kind, payload = self.outbox.popleft()
+
+        return self.latest.pop(kind) if kind is not None else payload
+
+
+class SocketHub:
+    """Connection lifecycle and per-socket writers; subclasses decide how
+    connections are grouped (per room, per user)."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._closing: set[asyncio.Task] = set()
+        self.instance_id = uuid.uuid4().hex
+
+    def _open(self, websocket: WebSocket, user_id: str, display_name: str = "") -> Connection:
+        conn = Connection(websocket=websocket, user_id=user_id, display_name=display_name)
+        conn.writer = asyncio.create_task(self._write_loop(conn))
+
+        return conn
+
+    def _push(self, conn: Connection, payload: str, kind: str | None = None) -> None:
+        if conn.enqueue(payload, kind):
+            return
+
+        logger.warning(
+            "websocket send queue overflow for user %s; disconnecting", conn.user_id
+        )
+        self._release(conn)
+        task = asyncio.create_task(
+            self._close(conn, OVERFLOW_CLOSE_CODE, "Send queue overflow")
+        )
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _push_all(
+        self,
+        connections: Iterable[Connection],
+        payload: str,
+        kind: str | None = None,
+    ) -> None:
+        for conn in connections:
+            self._push(conn, payload, kind)
+
+    async def _write_loop(self, conn: Connection) -> None:
+        """Single writer for one socket: drain its queue in order."""
+
+        try:
+            while not conn.closed:
+                await conn.ready.wait()
+                conn.ready.clear()
+
+                while (payload := conn.next_frame()) is not None:
+                    await asyncio.wait_for(
+                        conn.websocket.send_text(payload),
+                        timeout=SEND_TIMEOUT_SECONDS,
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Dead or stuck client. Stop writing and close the socket; its
+            # receive loop then runs the normal ``disconnect`` path.
+            conn.writer = None
+            await self._close(conn, 1011, "Send failed")
+
+    def _release(self, conn: Connection) -> None:
+        """Stop a connection's writer and drop anything still queued."""
+
+        conn.closed = True
+        conn.outbox.clear()
+        conn.latest.clear()
+        conn.ready.set()
+
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
+        conn.writer = None
+
+    async def _close(self, conn: Connection, code: int, reason: str) -> None:
+        self._release(conn)
+
+        try:
+            await asyncio.wait_for(
+                conn.websocket.close(code=code, reason=reason),
+                timeout=SEND_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            pass
+
+
+class UserHub(SocketHub):
+    """Game-wide hub: local sockets by user plus Redis Pub/Sub fan-out."""
+
+    # False: a user's new socket replaces (closes) the previous one.
+    multi_session = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._by_user: dict[str, dict[str, Connection]] = {}
+        self._fanout: ChannelFanout | None = None
+
+    def bind_fanout(self, fanout: ChannelFanout) -> None:
+        self._fanout = fanout
+
+    async def connect(self, user_id: str, display_name: str, websocket: WebSocket) -> str:
+        """Register a socket and return its token for ``disconnect``."""
+
+        conn = self._open(websocket, user_id, display_name)
+        stale: list[Connection] = []
+
+        async with self._lock:
+            sessions = self._by_user.setdefault(user_id, {})
+
+            if not self.multi_session:
+                stale = list(sessions.values())
+                sessions.clear()
+
+            sessions[conn.token] = conn
+
+        for old in stale:
+            await self._close(old, REPLACED_CLOSE_CODE, "Replaced by new connection")
+
+        return conn.token
+
+    async def disconnect(self, user_id: str, token: str | None = None) -> bool:
+        """Remove the socket holding ``token`` (every socket of the user when
+        None). A replaced socket's stale token is a no-op returning False."""
+
+        async with self._lock:
+            sessions = self._by_user.get(user_id)
+
+            if not sessions:
+                return False
+
+            if token is None:
+                removed = list(sessions.values())
+                sessions.clear()
+            else:
+                conn = sessions.pop(token, None)
+                removed = [conn] if conn is not None else []
+
+            if not sessions:
+                self._by_user.pop(user_id, None)
+
+        for conn in removed:
+            self._release(conn)
+
+        return bool(removed)
+
+    def touch(self, user_id: str) -> None:
+        for conn in self._by_user.get(user_id, {}).values():
+            conn.last_seen = time.time()
+
+    def online_user_ids(self) -> list[str]:
+        return list(self._by_user.keys())
+
+    def is_connected(self, user_id: str) -> bool:
+        """True when this process holds a live socket for ``user_id``."""
+
+        return bool(self._by_user.get(user_id))
+
+    async def send_local(self, user_id: str, message: dict) -> bool:
+        return await self.send_local_encoded(user_id, encode(message))
+
+    async def send_local_encoded(self, user_id: str, payload: str) -> bool:
+        connections = list(self._by_user.get(user_id, {}).values())
+        self._push_all(connections, payload)
+
+        return bool(connections)
+
+    async def send(self, user_id: str, message: dict) -> bool:
+        """Deliver to ``user_id`` on this process and fan out for other workers.
+
+        Returns True when the socket is local *or* the message was published
+        for another worker (peer may not be on this process).
+        """
+
+        payload = encode(message)
+        delivered = await self.send_local_encoded(user_id, payload)
+
+        if self._fanout is not None:
+            self._fanout.publish_encoded(
+                payload,
+                **{ORIGIN_FIELD: self.instance_id, TARGET_FIELD: user_id},
+            )
+            return True
+
+        return delivered
+
+    async def deliver_local(self, message: dict, *, exclude: str | None = None) -> None:
+        await self.deliver_local_encoded(
+            encode(message), exclude=exclude, kind=frame_kind(message)
+        )
+
+    async def deliver_local_encoded(
+        self,
+        payload: str,
+        *,
+        exclude: str | None = None,
+        kind: str | None = None,
+    ) -> None:
+        for user_id, sessions in list(self._by_user.items()):
+            if user_id != exclude:
+                self._push_all(list(sessions.values()), payload, kind)
+
+    async def broadcast(self, message: dict, *, exclude: str | None = None) -> None:
+        # Encode once: the same text goes to local sockets and onto the wire.
+        payload = encode(message)
+        kind = frame_kind(message)
+        await self.deliver_local_encoded(payload, exclude=exclude, kind=kind)
+
+        if self._fanout is not None:
+            meta = {ORIGIN_FIELD: self.instance_id}
+            if exclude is not None:
+                meta[EXCLUDE_FIELD] = exclude
+            if kind is not None:
+                meta[KIND_FIELD] = kind
+            self._fanout.publish_encoded(payload, **meta)
+
+    async def dispatch_fanout_event(self, message: dict) -> None:
+        """Listener callback for legacy (unframed) Pub/Sub messages."""
+
+        meta, body = split_routing(message)
+        await self.dispatch_fanout_frame(meta, encode(body))
+
+    async def dispatch_fanout_frame(self, meta: dict, payload: str) -> None:
+        if meta.get(ORIGIN_FIELD) == self.instance_id:
+            return
+
+        target = meta.get(TARGET_FIELD)
+
+        if target:
+            await self.send_local_encoded(target, payload)
+            return
+
+        await self.deliver_local_encoded(
+            payload, exclude=meta.get(EXCLUDE_FIELD), kind=meta.get(KIND_FIELD)
+        )
@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-import asyncio
 import time
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity
+from app.core import executors
+from app.core.identity import Identity
 from app.dama import ai_session
 from app.dama import wallet as dama_wallet
-from app.models.user import User
 
 router = APIRouter(prefix="/dama", tags=["dama"])
 
@@ -49,7 +49,7 @@ def stake_presets():
 
 
 @router.post("/ai/start")
-async def start_ai(body: StakeBody, user: User = Depends(get_current_user)):
+async def start_ai(body: StakeBody, user: Identity = Depends(get_current_identity)):
     uid = str(user.id)
     existing = await ai_session.get_ai_session(uid)
     if existing and existing.get("status") == "playing":
@@ -60,7 +60,7 @@ async def start_ai(body: StakeBody, user: User = Depends(get_current_user)):
             turn = existing.get("turn") or "red"
             outcome = "loss" if turn == "red" else "win"
             try:
-                await asyncio.to_thread(
+                await executors.settlement.run(
                     dama_wallet.finish_ai_game, uid, existing["game_code"], outcome
                 )
             except ValueError:
@@ -68,7 +68,7 @@ async def start_ai(body: StakeBody, user: User = Depends(get_current_user)):
             await ai_session.clear_ai_session(uid)
         else:
             # Do not charge again — return the live mid-game session.
-            balance = await asyncio.to_thread(dama_wallet.get_balance, uid)
+            balance = await executors.history.run(dama_wallet.get_balance, uid)
             return {
                 "game_code": existing["game_code"],
                 "stake": existing["stake"],
@@ -82,7 +82,7 @@ async def start_ai(body: StakeBody, user: User = Depends(get_current_user)):
             }
 
     try:
-        result = await asyncio.to_thread(
+        result = await executors.settlement.run(
             dama_wallet.start_ai_game, uid, body.stake
         )
     except ValueError as exc:
@@ -103,7 +103,7 @@ async def start_ai(body: StakeBody, user: User = Depends(get_current_user)):
 
 
 @router.get("/ai/active")
-async def active_ai(user: User = Depends(get_current_user)):
+async def active_ai(user: Identity = Depends(get_current_identity)):
     uid = str(user.id)
     session = await ai_session.get_ai_session(uid)
     if not session or session.get("status") != "playing":
@@ -114,7 +114,7 @@ async def active_ai(user: User = Depends(get_current_user)):
         turn = session.get("turn") or "red"
         outcome = "loss" if turn == "red" else "win"
         try:
-            settled = await asyncio.to_thread(
+            settled = await executors.settlement.run(
                 dama_wallet.finish_ai_game, uid, session["game_code"], outcome
             )
         except ValueError:
@@ -131,7 +131,7 @@ async def active_ai(user: User = Depends(get_current_user)):
 
 
 @router.post("/ai/sync")
-async def sync_ai(body: AiSyncBody, user: User = Depends(get_current_user)):
+async def sync_ai(body: AiSyncBody, user: Identity = Depends(get_current_identity)):
     existing = await ai_session.get_ai_session(str(user.id))
     if not existing or existing.get("game_code") != body.game_code:
         raise HTTPException(status_code=404, detail="No active AI session")
@@ -158,9 +158,9 @@ async def sync_ai(body: AiSyncBody, user: User = Depends(get_current_user)):
 
 
 @router.post("/ai/finish")
-async def finish_ai(body: AiFinishBody, user: User = Depends(get_current_user)):
+async def finish_ai(body: AiFinishBody, user: Identity = Depends(get_current_identity)):
     try:
-        result = await asyncio.to_thread(
+        result = await executors.settlement.run(
             dama_wallet.finish_ai_game, str(user.id), body.game_code, body.outcome
         )
     except ValueError as exc:
@@ -173,6 +173,6 @@ async def finish_ai(body: AiFinishBody, user: User = Depends(get_current_user)):
 def history(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
 ):
     return dama_wallet.get_user_history(str(user.id), limit=limit, offset=offset)
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
 import time
 
+from app.core import executors
 from app.dama import store
 from app.dama import wallet as dama_wallet
 from app.dama.ai_session import TURN_TIMEOUT_SECONDS
@@ -137,8 +137,8 @@ async def send_challenge(from_user_id: str, to_user_id: str, stake_raw) -> dict:
     if them.status != "idle":
         raise DamaError("That player is busy")
 
-    my_bal = await asyncio.to_thread(dama_wallet.get_balance, from_user_id)
-    their_bal = await asyncio.to_thread(dama_wallet.get_balance, to_user_id)
+    my_bal = await executors.settlement.run(dama_wallet.get_balance, from_user_id)
+    their_bal = await executors.settlement.run(dama_wallet.get_balance, to_user_id)
     if my_bal is None or float(my_bal) < float(stake):
         raise DamaError("Insufficient balance for this stake")
     if their_bal is None or float(their_bal) < float(stake):
@@ -277,8 +277,7 @@ async def accept_challenge(user_id: str, challenge_id: str) -> dict:
     # Pre-create match id so the Postgres row can reference it.
     match_id = store.new_match_id()
     try:
-        money = await asyncio.to_thread(
-            dama_wallet.start_online_game,
+        money = await dama_wallet.start_online_game_async(
             red_user_id=challenge.from_user_id,
             black_user_id=challenge.to_user_id,
             stake=stake,
@@ -638,8 +637,7 @@ async def accept_rematch(user_id: str, match_id: str, stake_raw=None) -> dict:
 
     new_match_id = store.new_match_id()
     try:
-        money = await asyncio.to_thread(
-            dama_wallet.start_online_game,
+        money = await dama_wallet.start_online_game_async(
             red_user_id=old.red_user_id,
             black_user_id=old.black_user_id,
             stake=stake,
@@ -683,8 +681,7 @@ async def _settle_match(match: store.MatchState, reason: str | None = None) -> d
     if match.settled:
         return {"ok": True, "already_finished": True, "balances": {}}
     try:
-        result = await asyncio.to_thread(
-            dama_wallet.settle_online_game,
+        result = await dama_wallet.settle_online_game_async(
             match_id=match.id,
             winner_side=match.winner,
             red_user_id=match.red_user_id,
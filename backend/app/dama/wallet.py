@@ -1,4 +1,9 @@
-"""Dama wallet: stakes, prizes, and profile history."""
+"""Dama wallet: stakes, prizes, and profile history.
+
+Online matches open and settle through ``start_online_game_async`` /
+``settle_online_game_async``, which run the same ORM core as the sync
+functions on the async engine - charge + history rows (and settlement +
+payout) in a single transaction each."""
 
 from __future__ import annotations
 
@@ -8,10 +13,10 @@ from datetime import datetime, timezone
 from decimal import Decimal, ROUND_DOWN
 from uuid import UUID
 
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, run_async
 from app.models.dama_game import DamaGame, DamaGameResult
 from app.models.user import User
-from app.services.wallet_service import credit_wallet
+from app.services.wallet_service import LedgerEntry, apply_ledger_entries, credit_wallet
 
 STAKE_TX_TYPE = "DAMA_STAKE"
 WIN_TX_TYPE = "DAMA_WIN"
@@ -54,6 +59,16 @@ def _load_user(db, user_id: str) -> User | None:
         return None
 
 
+def _user_uuids(user_ids: list[str]) -> dict[UUID, str]:
+    ids: dict[UUID, str] = {}
+    for user_id in user_ids:
+        try:
+            ids[UUID(user_id)] = user_id
+        except (ValueError, TypeError):
+            continue
+    return ids
+
+
 def _game_code() -> str:
     alphabet = string.ascii_uppercase + string.digits
     return "DM" + "".join(secrets.choice(alphabet) for _ in range(8))
@@ -76,27 +91,12 @@ def charge_users(user_ids: list[str], stake: Decimal, game_code: str) -> dict[st
 
     db = SessionLocal()
     try:
-        users: list[User] = []
-        for uid in user_ids:
-            user = _load_user(db, uid)
-            if user is None or user.balance < stake:
-                return {}
-            users.append(user)
-
-        paid: dict[str, str] = {}
-        for user in users:
-            credit_wallet(
-                db,
-                user,
-                amount=-stake,
-                transaction_type=STAKE_TX_TYPE,
-                description=f"Dama stake ({game_code}) - {stake} ETB",
-                reference_type="DAMA",
-            )
-            paid[str(user.id)] = str(user.balance)
-
+        paid = _charge_users(db, user_ids, stake, game_code)
         db.commit()
         return paid
+    except ValueError:
+        db.rollback()
+        return {}
     except Exception:
         db.rollback()
         raise
@@ -104,26 +104,41 @@ def charge_users(user_ids: list[str], stake: Decimal, game_code: str) -> dict[st
         db.close()
 
 
+def _charge_users(db, user_ids: list[str], stake: Decimal, game_code: str) -> dict[str, str]:
+    """All-or-nothing inside the caller's transaction: when anyone can't pay
+    this raises ``ValueError`` and the caller's rollback undoes the debits
+    that did go through."""
+
+    ids = _user_uuids(user_ids)
+    if len(ids) != len(set(user_ids)):
+        raise ValueError("Insufficient balance")
+
+    balances = apply_ledger_entries(
+        db,
+        [
+            LedgerEntry(
+                user_id=uid,
+                amount=-stake,
+                transaction_type=STAKE_TX_TYPE,
+                description=f"Dama stake ({game_code}) - {stake} ETB",
+                reference_type="DAMA",
+            )
+            for uid in ids
+        ],
+        require_funds=True,
+    )
+    if len(balances) != len(ids):
+        raise ValueError("Insufficient balance")
+    return {ids[uid]: str(balance) for uid, balance in balances.items()}
+
+
 def refund_users(user_ids: list[str], stake: Decimal, game_code: str) -> dict[str, str]:
     if stake <= 0 or not user_ids:
         return {}
 
     db = SessionLocal()
     try:
-        balances: dict[str, str] = {}
-        for uid in user_ids:
-            user = _load_user(db, uid)
-            if user is None:
-                continue
-            credit_wallet(
-                db,
-                user,
-                amount=stake,
-                transaction_type=REFUND_TX_TYPE,
-                description=f"Dama refund ({game_code}) - {stake} ETB",
-                reference_type="DAMA",
-            )
-            balances[uid] = str(user.balance)
+        balances = _refund_users(db, user_ids, stake, game_code)
         db.commit()
         return balances
     except Exception:
@@ -133,25 +148,33 @@ def refund_users(user_ids: list[str], stake: Decimal, game_code: str) -> dict[st
         db.close()
 
 
+def _refund_users(db, user_ids: list[str], stake: Decimal, game_code: str) -> dict[str, str]:
+    ids = _user_uuids(user_ids)
+    balances = apply_ledger_entries(
+        db,
+        [
+            LedgerEntry(
+                user_id=uid,
+                amount=stake,
+                transaction_type=REFUND_TX_TYPE,
+                description=f"Dama refund ({game_code}) - {stake} ETB",
+                reference_type="DAMA",
+            )
+            for uid in ids
+        ],
+    )
+    return {ids[uid]: str(balance) for uid, balance in balances.items()}
+
+
 def award_prize(user_id: str, amount: Decimal, game_code: str) -> str | None:
     if amount <= 0:
         return None
 
     db = SessionLocal()
     try:
-        user = _load_user(db, user_id)
-        if user is None:
-            return None
-        credit_wallet(
-            db,
-            user,
-            amount=amount,
-            transaction_type=WIN_TX_TYPE,
-            description=f"Dama win ({game_code}) - {amount} ETB",
-            reference_type="DAMA",
-        )
+        balance = _award_prize(db, user_id, amount, game_code)
         db.commit()
-        return str(user.balance)
+        return balance
     except Exception:
         db.rollback()
         raise
@@ -159,6 +182,23 @@ def award_prize(user_id: str, amount: Decimal, game_code: str) -> str | None:
         db.close()
 
 
+def _award_prize(db, user_id: str, amount: Decimal, game_code: str) -> str | None:
+    if amount <= 0:
+        return None
+    user = _load_user(db, user_id)
+    if user is None:
+        return None
+    credit_wallet(
+        db,
+        user,
+        amount=amount,
+        transaction_type=WIN_TX_TYPE,
+        description=f"Dama win ({game_code}) - {amount} ETB",
+        reference_type="DAMA",
+    )
+    return str(user.balance)
+
+
 def start_ai_game(user_id: str, stake: Decimal) -> dict:
     """Charge player stake and open an AI match. House matches the stake conceptually."""
 
@@ -299,61 +339,95 @@ def start_online_game(
     stake: Decimal,
     match_id: str,
 ) -> dict:
-    stake = parse_stake(stake)
-    pot = pot_for(stake)
-    fee = fee_for(pot)
-    prize = prize_for(pot, fee)
-    code = _game_code()
-
-    paid = charge_users([red_user_id, black_user_id], stake, code)
-    if red_user_id not in paid or black_user_id not in paid:
-        raise ValueError("Both players need enough balance for this stake")
-
     db = SessionLocal()
     try:
-        game = DamaGame(
-            game_code=code,
-            mode="online",
-            status="in_progress",
+        result = _start_online_game(
+            db,
+            red_user_id=red_user_id,
+            black_user_id=black_user_id,
             stake=stake,
-            pot=pot,
-            system_fee=fee,
-            prize_pool=prize,
             match_id=match_id,
         )
-        db.add(game)
-        db.flush()
-        for uid in (red_user_id, black_user_id):
-            db.add(
-                DamaGameResult(
-                    game_id=game.id,
-                    user_id=UUID(uid),
-                    stake_amount=stake,
-                    is_winner=False,
-                    amount_won=Decimal("0"),
-                    outcome="loss",
-                )
-            )
         db.commit()
-        return {
-            "game_code": code,
-            "stake": str(stake),
-            "pot": str(pot),
-            "system_fee": str(fee),
-            "prize_pool": str(prize),
-            "balances": paid,
-        }
+        return result
     except Exception:
         db.rollback()
-        try:
-            refund_users([red_user_id, black_user_id], stake, code)
-        except Exception:
-            pass
         raise
     finally:
         db.close()
 
 
+async def start_online_game_async(
+    *,
+    red_user_id: str,
+    black_user_id: str,
+    stake: Decimal,
+    match_id: str,
+) -> dict:
+    return await run_async(
+        _start_online_game,
+        red_user_id=red_user_id,
+        black_user_id=black_user_id,
+        stake=stake,
+        match_id=match_id,
+    )
+
+
+def _start_online_game(
+    db,
+    *,
+    red_user_id: str,
+    black_user_id: str,
+    stake: Decimal,
+    match_id: str,
+) -> dict:
+    """Charge both players and open the match in the caller's transaction:
+    a failed history insert rolls the stakes back with it."""
+
+    stake = parse_stake(stake)
+    pot = pot_for(stake)
+    fee = fee_for(pot)
+    prize = prize_for(pot, fee)
+    code = _game_code()
+
+    try:
+        paid = _charge_users(db, [red_user_id, black_user_id], stake, code)
+    except ValueError:
+        raise ValueError("Both players need enough balance for this stake") from None
+
+    game = DamaGame(
+        game_code=code,
+        mode="online",
+        status="in_progress",
+        stake=stake,
+        pot=pot,
+        system_fee=fee,
+        prize_pool=prize,
+        match_id=match_id,
+    )
+    db.add(game)
+    db.flush()
+    for uid in (red_user_id, black_user_id):
+        db.add(
+            DamaGameResult(
+                game_id=game.id,
+                user_id=UUID(uid),
+                stake_amount=stake,
+                is_winner=False,
+                amount_won=Decimal("0"),
+                outcome="loss",
+            )
+        )
+    return {
+        "game_code": code,
+        "stake": str(stake),
+        "pot": str(pot),
+        "system_fee": str(fee),
+        "prize_pool": str(prize),
+        "balances": paid,
+    }
+
+
 def settle_online_game(
     *,
     match_id: str,
@@ -365,77 +439,109 @@ def settle_online_game(
 
     db = SessionLocal()
     try:
-        game = (
-            db.query(DamaGame)
-            .filter(DamaGame.match_id == match_id, DamaGame.mode == "online")
-            .order_by(DamaGame.created_at.desc())
-            .first()
+        result = _settle_online_game(
+            db,
+            match_id=match_id,
+            winner_side=winner_side,
+            red_user_id=red_user_id,
+            black_user_id=black_user_id,
         )
-        if game is None:
-            return {"ok": False, "reason": "missing"}
-        if game.status != "in_progress":
-            return {
-                "ok": True,
-                "already_finished": True,
-                "game_code": game.game_code,
-                "prize_pool": str(game.prize_pool),
-            }
-
-        game.status = "finished"
-        game.finished_at = datetime.now(timezone.utc)
-        game.winner_side = winner_side
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-        results = {
-            str(r.user_id): r
-            for r in db.query(DamaGameResult).filter(DamaGameResult.game_id == game.id)
-        }
 
-        balances: dict[str, str] = {}
-        prize = Decimal("0")
+async def settle_online_game_async(
+    *,
+    match_id: str,
+    winner_side: str | None,
+    red_user_id: str,
+    black_user_id: str,
+) -> dict:
+    return await run_async(
+        _settle_online_game,
+        match_id=match_id,
+        winner_side=winner_side,
+        red_user_id=red_user_id,
+        black_user_id=black_user_id,
+    )
 
-        if winner_side == "draw":
-            for uid in (red_user_id, black_user_id):
-                r = results.get(uid)
-                if r:
-                    r.outcome = "draw"
-                    r.amount_won = game.stake
-            db.commit()
-            balances = refund_users([red_user_id, black_user_id], game.stake, game.game_code)
-        elif winner_side in ("red", "black"):
-            winner_id = red_user_id if winner_side == "red" else black_user_id
-            loser_id = black_user_id if winner_side == "red" else red_user_id
-            prize = game.prize_pool
-            game.winner_user_id = UUID(winner_id)
-            wr = results.get(winner_id)
-            lr = results.get(loser_id)
-            if wr:
-                wr.is_winner = True
-                wr.amount_won = prize
-                wr.outcome = "win"
-            if lr:
-                lr.outcome = "loss"
-            db.commit()
-            bal = award_prize(winner_id, prize, game.game_code)
-            if bal:
-                balances[winner_id] = bal
-        else:
-            db.commit()
 
+def _settle_online_game(
+    db,
+    *,
+    match_id: str,
+    winner_side: str | None,
+    red_user_id: str,
+    black_user_id: str,
+) -> dict:
+    game = (
+        db.query(DamaGame)
+        .filter(DamaGame.match_id == match_id, DamaGame.mode == "online")
+        .order_by(DamaGame.created_at.desc())
+        .with_for_update()
+        .first()
+    )
+    if game is None:
+        return {"ok": False, "reason": "missing"}
+    if game.status != "in_progress":
         return {
             "ok": True,
-            "already_finished": False,
+            "already_finished": True,
             "game_code": game.game_code,
             "prize_pool": str(game.prize_pool),
-            "system_fee": str(game.system_fee),
-            "winner_side": winner_side,
-            "balances": balances,
-            "amount_won": str(prize),
         }
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+
+    game.status = "finished"
+    game.finished_at = datetime.now(timezone.utc)
+    game.winner_side = winner_side
+
+    results = {
+        str(r.user_id): r
+        for r in db.query(DamaGameResult).filter(DamaGameResult.game_id == game.id)
+    }
+
+    balances: dict[str, str] = {}
+    prize = Decimal("0")
+
+    if winner_side == "draw":
+        for uid in (red_user_id, black_user_id):
+            r = results.get(uid)
+            if r:
+                r.outcome = "draw"
+                r.amount_won = game.stake
+        balances = _refund_users(db, [red_user_id, black_user_id], game.stake, game.game_code)
+    elif winner_side in ("red", "black"):
+        winner_id = red_user_id if winner_side == "red" else black_user_id
+        loser_id = black_user_id if winner_side == "red" else red_user_id
+        prize = game.prize_pool
+        game.winner_user_id = UUID(winner_id)
+        wr = results.get(winner_id)
+        lr = results.get(loser_id)
+        if wr:
+            wr.is_winner = True
+            wr.amount_won = prize
+            wr.outcome = "win"
+        if lr:
+            lr.outcome = "loss"
+        bal = _award_prize(db, winner_id, prize, game.game_code)
+        if bal:
+            balances[winner_id] = bal
+
+    return {
+        "ok": True,
+        "already_finished": False,
+        "game_code": game.game_code,
+        "prize_pool": str(game.prize_pool),
+        "system_fee": str(game.system_fee),
+        "winner_side": winner_side,
+        "balances": balances,
+        "amount_won": str(prize),
+    }
 
 
 def get_user_history(user_id: str, limit: int = 10, offset: int = 0) -> dict:
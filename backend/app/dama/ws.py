@@ -5,16 +5,13 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.core.security import decode_access_token
+from app.core import identity
 from app.dama import service
 from app.dama.manager import hub
 from app.dama.service import DamaError
-from app.db.database import SessionLocal
-from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
@@ -22,43 +19,20 @@ router = APIRouter()
 RECEIVE_TIMEOUT_SECONDS = 60
 
 
-def _authenticate(token: str) -> User | None:
-    try:
-        payload = decode_access_token(token)
-    except Exception:
-        return None
-
-    user_id = payload.get("sub")
-    if not user_id:
-        return None
-
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.id == UUID(user_id)).first()
-    except Exception:
-        return None
-    finally:
-        db.close()
-
-
-def _display_name(user: User) -> str:
-    return user.first_name or user.username or f"Player {str(user.id)[:6]}"
-
-
 @router.websocket("/ws/dama")
 async def dama_ws(websocket: WebSocket, token: str | None = None):
     if not token:
         await websocket.close(code=4401)
         return
 
-    user = await asyncio.to_thread(_authenticate, token)
+    user = await identity.authenticate(token)
     if user is None:
         await websocket.close(code=4401)
         return
 
     user_id = str(user.id)
-    display_name = _display_name(user)
-    photo_url = getattr(user, "photo_url", None)
+    display_name = user.display_name
+    photo_url = user.photo_url
 
     await websocket.accept()
     conn_token = await hub.connect(user_id, display_name, websocket)
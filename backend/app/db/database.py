@@ -1,4 +1,9 @@
+from collections.abc import Callable
+from typing import TypeVar
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
@@ -21,6 +26,77 @@ SessionLocal = sessionmaker(
 )
 
 
+# Parallel async engine (psycopg 3 async) for the game settlement paths, so
+# the loops await Postgres directly instead of hopping through the default
+# thread pool. Created on first use: importing the app must not require the
+# async driver (tests run against SQLite through ``SessionLocal``).
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+_async_engine: AsyncEngine | None = None
+
+T = TypeVar("T")
+
+
+def async_database_url(url: str) -> str:
+    """``DATABASE_URL`` rewritten for the psycopg 3 driver, which SQLAlchemy
+    runs in async mode under ``create_async_engine``."""
+
+    parsed = make_url(url)
+
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+psycopg")
+
+    return parsed.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_pre_ping=True,
+            pool_size=settings.DB_ASYNC_POOL_SIZE,
+            max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    return _async_engine
+
+
+def async_session() -> AsyncSession:
+    return AsyncSessionLocal(bind=get_async_engine())
+
+
+async def run_async(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run ``fn(db, *args, **kwargs)`` - plain sync ORM code - on the async
+    engine and commit. ``AsyncSession.run_sync`` executes it in a greenlet on
+    the event loop, so the same session logic serves both the sync wrappers
+    and the game loops without a thread hop."""
+
+    async with async_session() as db:
+        try:
+            result = await db.run_sync(fn, *args, **kwargs)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    return result
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 Base = declarative_base()
 
 from typing import Generator
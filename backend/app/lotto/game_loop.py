@@ -13,8 +13,10 @@ import time
 import uuid
 from datetime import timedelta
 
+from app.core import executors
 from app.db.database import SessionLocal
 from app.lotto import service
+from app.core.redis_scripts import register_script
 from app.lotto.manager import hub
 from app.models.lotto_game import LottoWinner
 from app.models.user import User
@@ -28,21 +30,27 @@ ACTIVE_POLL_SECONDS = 0.25
 IDLE_POLL_SECONDS = 1.0
 FINGERPRINT_MAX = 64
 
-_RENEW_LEADER_SCRIPT = """
+_RENEW_LEADER_SCRIPT = register_script(
+    "lotto.renew_leader",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('pexpire', KEYS[1], ARGV[2])
 else
     return 0
 end
-"""
+""",
+)
 
-_RELEASE_LEADER_SCRIPT = """
+_RELEASE_LEADER_SCRIPT = register_script(
+    "lotto.release_leader",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('del', KEYS[1])
 else
     return 0
 end
-"""
+""",
+)
 
 _task: asyncio.Task | None = None
 _leader_id = uuid.uuid4().hex
@@ -149,8 +157,8 @@ async def _renew_leader() -> bool:
     from app.bingo.redis_store import get_redis
 
     redis = get_redis()
-    result = await redis.eval(
-        _RENEW_LEADER_SCRIPT, 1, LEADER_KEY, _leader_id, LEADER_TTL_MS
+    result = await _RENEW_LEADER_SCRIPT(
+        redis, keys=[LEADER_KEY], args=[_leader_id, LEADER_TTL_MS]
     )
     return bool(result)
 
@@ -159,7 +167,7 @@ async def _release_leader() -> None:
     from app.bingo.redis_store import get_redis
 
     redis = get_redis()
-    await redis.eval(_RELEASE_LEADER_SCRIPT, 1, LEADER_KEY, _leader_id)
+    await _RELEASE_LEADER_SCRIPT(redis, keys=[LEADER_KEY], args=[_leader_id])
 
 
 async def _run_as_leader() -> None:
@@ -175,7 +183,7 @@ async def _run_as_leader() -> None:
 
         try:
             changed, wallet_updates, sleep_for, pre_draw_ids, winner_ids = (
-                await asyncio.to_thread(_process)
+                await executors.settlement.run(_process)
             )
             try:
                 from app.lotto import house_bot as lotto_house_bot
@@ -201,7 +209,7 @@ async def _run_as_leader() -> None:
                     }
                 )
             for user_id, balance in wallet_updates.items():
-                await hub.send_user(
+                await hub.send(
                     user_id, {"type": "wallet", "balance": balance}
                 )
             if pre_draw_ids or winner_ids:
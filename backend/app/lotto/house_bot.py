@@ -27,7 +27,6 @@ Redis tick locks prevent overlapping mutations.
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import random
@@ -39,7 +38,9 @@ from uuid import UUID, uuid4
 
 from app.bingo import house_bot as bingo_bot
 from app.bingo import redis_store
+from app.core import executors
 from app.core.config import settings
+from app.core.redis_scripts import register_script
 from app.lotto import service
 
 logger = logging.getLogger(__name__)
@@ -55,13 +56,16 @@ BOT_TICK_LOCK_TTL_MS = 2500
 RESERVE_MIN_BOUND = 1
 RESERVE_MAX_BOUND = 25
 
-_RELEASE_TICK_LOCK_SCRIPT = """
+_RELEASE_TICK_LOCK_SCRIPT = register_script(
+    "lotto.bot_release_tick_lock",
+    """
 if redis.call('get', KEYS[1]) == ARGV[1] then
     return redis.call('del', KEYS[1])
 else
     return 0
 end
-"""
+""",
+)
 
 
 def clamp_reserve(value: int) -> int:
@@ -225,11 +229,8 @@ async def _acquire_tick_lock(stake_key: str, token: str) -> bool:
 
 async def _release_tick_lock(stake_key: str, token: str) -> None:
     redis = redis_store.get_redis()
-    await redis.eval(
-        _RELEASE_TICK_LOCK_SCRIPT,
-        1,
-        BOT_TICK_LOCK_KEY.format(stake=stake_key),
-        token,
+    await _RELEASE_TICK_LOCK_SCRIPT(
+        redis, keys=[BOT_TICK_LOCK_KEY.format(stake=stake_key)], args=[token]
     )
 
 
@@ -437,7 +438,7 @@ async def tick_stake(
     try:
         bot_user_id = await bingo_bot.ensure_bot_user_async()
         clock = time.time() if now is None else now
-        info = await asyncio.to_thread(_inspect_open_round, stake, bot_user_id)
+        info = await executors.settlement.run(_inspect_open_round, stake, bot_user_id)
 
         if info is None or not info.get("open"):
             await clear_intent(stake_key)
@@ -454,7 +455,7 @@ async def tick_stake(
         if not enabled:
             await clear_intent(stake_key)
             if bot_held:
-                return await asyncio.to_thread(
+                return await executors.settlement.run(
                     _release_numbers_sync,
                     round_id=round_uuid,
                     bot_user_id=bot_user_id,
@@ -473,7 +474,7 @@ async def tick_stake(
             rng = random.Random(int(clock * 10) ^ (hash(stake_key) & 0xFFFF))
             take = min(len(bot_held), rng.randint(1, 3))
             rng.shuffle(bot_held)
-            return await asyncio.to_thread(
+            return await executors.settlement.run(
                 _release_numbers_sync,
                 round_id=round_uuid,
                 bot_user_id=bot_user_id,
@@ -544,7 +545,7 @@ async def tick_stake(
             return None
 
         await bingo_bot.ensure_bot_funds(bot_user_id)
-        return await asyncio.to_thread(
+        return await executors.settlement.run(
             _claim_numbers_sync,
             stake=stake,
             bot_user_id=bot_user_id,
@@ -579,7 +580,7 @@ async def bot_status() -> dict:
     if bot_user_id:
         try:
             for stake in service.STAKES:
-                info = await asyncio.to_thread(_inspect_open_round, stake, bot_user_id)
+                info = await executors.admin.run(_inspect_open_round, stake, bot_user_id)
                 if info and info.get("open"):
                     held = len(info.get("bot_held") or [])
                     numbers_held += held
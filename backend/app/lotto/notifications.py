@@ -181,7 +181,7 @@ async def _try_dama_send(user_id: str, message: dict) -> bool:
 async def _try_aviator_send(user_id: str, message: dict) -> bool:
     from app.aviator.manager import hub as aviator_hub
 
-    return bool(await aviator_hub.send(user_id, message))
+    return await aviator_hub.send_local(user_id, message)
 
 
 def schedule_pre_draw(round_id: str | UUID) -> None:
@@ -9,12 +9,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity
 from app.api.dependencies import get_db
+from app.core.identity import Identity
 from app.lotto import service
 from app.lotto.game_loop import ensure_game_loop
 from app.lotto.manager import hub
-from app.models.user import User
 
 router = APIRouter(prefix="/lotto", tags=["lotto"])
 
@@ -28,7 +28,7 @@ class ReserveRequest(BaseModel):
 @router.get("/snapshot")
 @router.get("/rooms")
 def rooms(
-    _: User = Depends(get_current_user),
+    _: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     return service.snapshot(db)
@@ -37,7 +37,7 @@ def rooms(
 @router.post("/reserve")
 async def reserve(
     payload: ReserveRequest,
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     try:
@@ -60,7 +60,7 @@ async def reserve(
         }
     )
     # This is sent only to this user's sockets; room broadcasts never contain it.
-    await hub.send_user(
+    await hub.send(
         str(user.id), {"type": "wallet", "balance": result["balance"]}
     )
     # Pre-draw notices when this reservation filled the room (idempotent).
@@ -78,7 +78,7 @@ async def reserve(
 def lotto_history(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     return service.history(db, user.id, limit, offset)
@@ -18,7 +18,7 @@ from app.models.lotto_game import (
     LottoWinner,
 )
 from app.models.user import User
-from app.services.wallet_service import credit_wallet
+from app.services.wallet_service import LedgerEntry, apply_ledger_entries, credit_wallet
 
 STAKES = (Decimal("10.00"), Decimal("25.00"), Decimal("50.00"), Decimal("100.00"))
 CAPACITY = 25
@@ -752,6 +752,7 @@ def settle_due_round(db: Session, round_id: UUID) -> bool:
         round_.version += 1
         winner_is_bot: list[bool] = []
         bot_prizes = Decimal("0.00")
+        payouts: list[LedgerEntry] = []
         for rank, (number, prize) in enumerate(zip(winning_numbers, prizes), start=1):
             reservation = reservations[number]
             user = users[reservation.user_id]
@@ -760,24 +761,27 @@ def settle_due_round(db: Session, round_id: UUID) -> bool:
             prize_q = Decimal(prize).quantize(MONEY)
             if is_bot:
                 bot_prizes += prize_q
-            tx = credit_wallet(
-                db,
-                user,
-                amount=prize,
-                transaction_type="LOTTO_PAYOUT",
-                description=f"Lotto {round_.round_code} rank {rank}, number {number}",
-                reference_type=f"LOTTO_WIN_{rank}",
-                reference_id=round_.id,
+            payouts.append(
+                LedgerEntry(
+                    user_id=user.id,
+                    amount=prize,
+                    transaction_type="LOTTO_PAYOUT",
+                    description=f"Lotto {round_.round_code} rank {rank}, number {number}",
+                    reference_type=f"LOTTO_WIN_{rank}",
+                    reference_id=round_.id,
+                )
             )
-            db.flush()
+        # All three ranks pay out in one UPDATE + one ledger INSERT.
+        apply_ledger_entries(db, payouts)
+        for rank, (number, payout) in enumerate(zip(winning_numbers, payouts), start=1):
             db.add(
                 LottoWinner(
                     round_id=round_.id,
                     rank=rank,
                     number=number,
-                    user_id=user.id,
-                    prize=prize,
-                    payout_transaction_id=tx.id,
+                    user_id=payout.user_id,
+                    prize=payout.amount,
+                    payout_transaction_id=payout.id,
                 )
             )
         bot_prizes = bot_prizes.quantize(MONEY)
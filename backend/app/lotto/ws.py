@@ -4,35 +4,20 @@ from __future__ import annotations
 
 import asyncio
 import json
-from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.core.security import decode_access_token
+from app.bingo import wallet as bingo_wallet
+from app.core import executors, identity
 from app.db.database import SessionLocal
 from app.lotto import service
 from app.lotto.game_loop import ensure_game_loop
 from app.lotto.manager import hub
-from app.models.user import User
 
 router = APIRouter()
 RECEIVE_TIMEOUT_SECONDS = 45
 
 
-def _authenticate(token: str) -> User | None:
-    try:
-        subject = decode_access_token(token).get("sub")
-        if not subject:
-            return None
-        db = SessionLocal()
-        try:
-            return db.query(User).filter(User.id == UUID(subject)).first()
-        finally:
-            db.close()
-    except Exception:
-        return None
-
-
 def _snapshot() -> dict:
     db = SessionLocal()
     try:
@@ -46,18 +31,22 @@ async def lotto_ws(websocket: WebSocket, token: str | None = None):
     if not token:
         await websocket.close(code=4401)
         return
-    user = await asyncio.to_thread(_authenticate, token)
+    user = await identity.authenticate(token)
     if user is None:
         await websocket.close(code=4401)
         return
 
     await websocket.accept()
-    connection = await hub.connect(str(user.id), websocket)
+    user_id = str(user.id)
+    connection = await hub.connect(user_id, "", websocket)
     ensure_game_loop()
     try:
-        await websocket.send_text(json.dumps(await asyncio.to_thread(_snapshot)))
+        await websocket.send_text(json.dumps(await executors.history.run(_snapshot)))
         await websocket.send_text(
-            json.dumps({"type": "wallet", "balance": str(user.balance)})
+            json.dumps({
+                "type": "wallet",
+                "balance": await executors.history.run(bingo_wallet.get_balance, user_id),
+            })
         )
         while True:
             try:
@@ -75,9 +64,9 @@ async def lotto_ws(websocket: WebSocket, token: str | None = None):
                 await websocket.send_text(json.dumps({"type": "pong"}))
             elif message.get("type") == "snapshot":
                 await websocket.send_text(
-                    json.dumps(await asyncio.to_thread(_snapshot))
+                    json.dumps(await executors.history.run(_snapshot))
                 )
     except WebSocketDisconnect:
         pass
     finally:
-        await hub.disconnect(connection)
+        await hub.disconnect(user_id, connection)
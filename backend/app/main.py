@@ -12,33 +12,42 @@ from app.bot.bot_runner import (
     stop_bot,
 )
 
-from app.bingo import game_loop, redis_store, service
+from app.bingo import cluster, game_loop, redis_store, service
 from app.bingo.manager import manager as bingo_manager
 from app.bingo.pubsub import PubSubListener
 from app.bingo.ws import router as bingo_ws_router
 from app.dama.ws import router as dama_ws_router
 from app.dama.manager import CHANNEL as DAMA_CHANNEL
 from app.dama.manager import dispatch_fanout_event as dama_dispatch
+from app.dama.manager import dispatch_fanout_frame as dama_dispatch_frame
 from app.dama.manager import hub as dama_hub
 from app.aviator.ws import router as aviator_ws_router
 from app.aviator.manager import CHANNEL as AVIATOR_CHANNEL
 from app.aviator.manager import dispatch_fanout_event as aviator_dispatch
+from app.aviator.manager import dispatch_fanout_frame as aviator_dispatch_frame
 from app.aviator.manager import hub as aviator_hub
 from app.aviator.game_loop import ensure_game_loop, stop_game_loop as stop_aviator_loop
+from app.aviator.wallet import cashout_writer
 from app.lotto.game_loop import (
     ensure_game_loop as ensure_lotto_loop,
     stop_game_loop as stop_lotto_loop,
 )
 from app.lotto.manager import CHANNEL as LOTTO_CHANNEL
 from app.lotto.manager import dispatch_fanout_event as lotto_dispatch
+from app.lotto.manager import dispatch_fanout_frame as lotto_dispatch_frame
 from app.lotto.manager import hub as lotto_hub
 from app.lotto.ws import router as lotto_ws_router
+from app.core import executors, identity
 from app.core.redis_fanout import ChannelFanout
+from app.core.redis_scripts import preload_scripts
+from app.db.database import dispose_async_engine
 
-bingo_pubsub_listener = PubSubListener(service.dispatch_pubsub_event)
-aviator_fanout = ChannelFanout(AVIATOR_CHANNEL, aviator_dispatch)
-dama_fanout = ChannelFanout(DAMA_CHANNEL, dama_dispatch)
-lotto_fanout = ChannelFanout(LOTTO_CHANNEL, lotto_dispatch)
+bingo_pubsub_listener = PubSubListener(
+    service.dispatch_pubsub_event, service.dispatch_pubsub_frame
+)
+aviator_fanout = ChannelFanout(AVIATOR_CHANNEL, aviator_dispatch, aviator_dispatch_frame)
+dama_fanout = ChannelFanout(DAMA_CHANNEL, dama_dispatch, dama_dispatch_frame)
+lotto_fanout = ChannelFanout(LOTTO_CHANNEL, lotto_dispatch, lotto_dispatch_frame)
 
 
 @asynccontextmanager
@@ -47,20 +56,21 @@ async def lifespan(app: FastAPI):
     # startup
     await start_bot()
 
+    await preload_scripts(redis_store.get_redis())
+    await cluster.start()
+    await identity.start()
+
     bingo_manager.bind_pubsub(bingo_pubsub_listener)
     bingo_manager.bind_dispatch(service.dispatch_pubsub_event)
     await bingo_pubsub_listener.start()
 
     aviator_hub.bind_fanout(aviator_fanout)
-    aviator_hub.bind_dispatch(aviator_dispatch)
     await aviator_fanout.start()
 
     dama_hub.bind_fanout(dama_fanout)
-    dama_hub.bind_dispatch(dama_dispatch)
     await dama_fanout.start()
 
     lotto_hub.bind_fanout(lotto_fanout)
-    lotto_hub.bind_dispatch(lotto_dispatch)
     await lotto_fanout.start()
 
     ensure_game_loop()
@@ -83,10 +93,15 @@ async def lifespan(app: FastAPI):
     await stop_aviator_loop()
     await stop_lotto_loop()
     await game_loop.stop_all()
+    await cluster.stop()
+    await identity.stop()
     await bingo_pubsub_listener.stop()
     await aviator_fanout.stop()
     await dama_fanout.stop()
     await lotto_fanout.stop()
+    await cashout_writer.flush()
+    await dispose_async_engine()
+    executors.shutdown()
     await redis_store.close_redis()
 
 app = FastAPI(
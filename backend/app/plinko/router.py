@@ -9,9 +9,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.api.current_user import get_current_user
+from app.api.current_user import get_current_identity
 from app.api.dependencies import get_db
-from app.models.user import User
+from app.core.identity import Identity
 from app.plinko import service
 from app.plinko.config import (
     ALLOWED_RISKS,
@@ -35,7 +35,7 @@ class PlayRequest(BaseModel):
 @router.post("/play")
 def play_plinko(
     payload: PlayRequest,
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     try:
@@ -57,14 +57,14 @@ def play_plinko(
 def plinko_history(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_identity),
     db: Session = Depends(get_db),
 ):
     return service.history(db, user.id, limit, offset)
 
 
 @router.get("/presets")
-def presets(_: User = Depends(get_current_user)):
+def presets(_: Identity = Depends(get_current_identity)):
     return {
         "rows": list(ALLOWED_ROWS),
         "risks": list(ALLOWED_RISKS),
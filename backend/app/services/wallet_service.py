@@ -1,5 +1,11 @@
+from dataclasses import dataclass, field
 from decimal import Decimal
+from uuid import UUID, uuid4
 
+from sqlalchemy import Numeric, case, column, insert, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from app.models.user import User
 from app.models.wallet_transaction import WalletTransaction
 
 
@@ -33,4 +39,99 @@ def credit_wallet(
 
     db.add(transaction)
 
-    return transaction
\ No newline at end of file
+    return transaction
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerEntry:
+    """One balance change for ``apply_ledger_entries`` (negative = debit).
+    ``id`` becomes the ``WalletTransaction`` id, so callers can reference
+    the ledger row before it is written."""
+
+    user_id: UUID
+    amount: Decimal
+    transaction_type: str
+    description: str
+    reference_type: str | None = None
+    reference_id: UUID | None = None
+    id: UUID = field(default_factory=uuid4)
+
+
+def _balance_deltas(db, deltas: dict[UUID, Decimal]):
+    """A selectable of ``(user_id, amount)`` for the UPDATE to join against:
+    ``(VALUES ...)`` on Postgres, a ``CASE`` on the id elsewhere (SQLite has
+    no column aliases for VALUES)."""
+
+    if db.get_bind().dialect.name == "postgresql":
+        delta = values(
+            column("user_id", PGUUID(as_uuid=True)),
+            column("amount", Numeric(12, 2)),
+            name="deltas",
+        ).data(list(deltas.items()))
+        return delta.c.amount, User.id == delta.c.user_id
+
+    return case(deltas, value=User.id), User.id.in_(list(deltas))
+
+
+def apply_ledger_entries(
+    db,
+    entries: list[LedgerEntry],
+    *,
+    require_funds: bool = False,
+) -> dict[UUID, Decimal]:
+    """Apply ``entries`` with one ``UPDATE ... RETURNING`` and one multi-row
+    ``INSERT`` into ``wallet_transactions``, whatever the number of users.
+
+    Balances move in SQL (``balance = balance + delta``), so concurrent
+    writers can't lose an update. With ``require_funds`` a user whose net
+    change would take them below zero is left untouched and skipped. Returns
+    user_id -> new balance for every user that was updated; entries for
+    anyone else (missing or skipped) write no ledger row.
+    """
+
+    deltas: dict[UUID, Decimal] = {}
+    for entry in entries:
+        deltas[entry.user_id] = deltas.get(entry.user_id, Decimal("0")) + entry.amount
+
+    if not deltas:
+        return {}
+
+    amount, joined = _balance_deltas(db, deltas)
+    stmt = update(User).where(joined)
+    if require_funds:
+        stmt = stmt.where(User.balance + amount >= 0)
+    rows = db.execute(
+        stmt.values(balance=User.balance + amount)
+        .returning(User.id, User.balance)
+        .execution_options(synchronize_session="fetch")
+    ).all()
+    balances = {user_id: balance for user_id, balance in rows}
+
+    # Replay each user's entries in order from their pre-update balance so
+    # every ledger row carries its own before/after.
+    running = {user_id: balances[user_id] - deltas[user_id] for user_id in balances}
+    ledger: list[dict] = []
+    for entry in entries:
+        if entry.user_id not in running:
+            continue
+        before = running[entry.user_id]
+        running[entry.user_id] = before + entry.amount
+        ledger.append(
+            {
+                "id": entry.id,
+                "user_id": entry.user_id,
+                "transaction_type": entry.transaction_type,
+                "amount": entry.amount,
+                "balance_before": before,
+                "balance_after": before + entry.amount,
+                "status": "COMPLETED",
+                "reference_type": entry.reference_type,
+                "reference_id": entry.reference_id,
+                "description": entry.description,
+            }
+        )
+
+    if ledger:
+        db.execute(insert(WalletTransaction), ledger)
+
+    return balances
@@ -0,0 +1,43 @@
+"""Tests for the async SQLAlchemy engine helpers (app.db.database)."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from app.db import database
+
+
+class AsyncDatabaseTests(unittest.IsolatedAsyncioTestCase):
+    def test_postgres_url_uses_async_psycopg_driver(self):
+        self.assertEqual(
+            database.async_database_url("postgresql://u:p@db:5432/bingo"),
+            "postgresql+psycopg://u:p@db:5432/bingo",
+        )
+        self.assertEqual(database.async_database_url("sqlite:///./x.db"), "sqlite:///./x.db")
+
+    async def test_run_async_commits_or_rolls_back_the_shared_core(self):
+        session = mock.MagicMock()
+        session.__aenter__ = mock.AsyncMock(return_value=session)
+        session.__aexit__ = mock.AsyncMock(return_value=None)
+        session.commit = mock.AsyncMock()
+        session.rollback = mock.AsyncMock()
+
+        async def run_sync(fn, *args, **kwargs):
+            return fn("sync-session", *args, **kwargs)
+
+        session.run_sync = mock.AsyncMock(side_effect=run_sync)
+
+        def core(db, amount, *, game_id):
+            if amount < 0:
+                raise ValueError("negative")
+            return f"{db}:{amount}:{game_id}"
+
+        with mock.patch.object(database, "async_session", return_value=session):
+            result = await database.run_async(core, 5, game_id="g1")
+            with self.assertRaises(ValueError):
+                await database.run_async(core, -1, game_id="g1")
+
+        self.assertEqual(result, "sync-session:5:g1")
+        session.commit.assert_awaited_once()
+        session.rollback.assert_awaited_once()
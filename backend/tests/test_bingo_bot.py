@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import random
 import time
 import unittest
@@ -10,10 +11,11 @@ from contextlib import asynccontextmanager
 from decimal import Decimal
 from unittest import TestCase, mock
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.admin import service as admin_service
+from app.aviator import wallet as aviator_wallet
 from app.bingo import house_bot, service as bingo_service, wallet
 from app.bingo.dummy_names import DUMMY_FIRST_NAMES, pick_dummy_name
 from app.bingo.house_bot import (
@@ -119,8 +121,8 @@ class BotWinSettleAccountingTests(unittest.IsolatedAsyncioTestCase):
             ],
         )
 
-        award_mock = mock.Mock()
-        gain_mock = mock.Mock(return_value="110.00")
+        award_mock = mock.AsyncMock()
+        gain_mock = mock.AsyncMock(return_value="110.00")
         finish_calls: list = []
         broadcasts: list[dict] = []
 
@@ -138,14 +140,14 @@ class BotWinSettleAccountingTests(unittest.IsolatedAsyncioTestCase):
             mock.patch("app.bingo.service.room_lock", fake_lock),
             mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
             mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()),
-            mock.patch("app.bingo.service.wallet.award_prizes", award_mock),
+            mock.patch("app.bingo.service.wallet.award_prizes_async", award_mock),
             mock.patch(
-                "app.bingo.service.wallet.credit_bot_system_gain",
+                "app.bingo.service.wallet.credit_bot_system_gain_async",
                 gain_mock,
             ),
             mock.patch(
-                "app.bingo.service.wallet.record_round_finish",
-                side_effect=capture_finish,
+                "app.bingo.service.wallet.record_round_finish_async",
+                new=mock.AsyncMock(side_effect=capture_finish),
             ),
             mock.patch(
                 "app.bingo.service.manager.broadcast",
@@ -238,8 +240,8 @@ class BotWinSettleAccountingTests(unittest.IsolatedAsyncioTestCase):
             ],
         )
 
-        award_mock = mock.Mock(return_value={human_id: "130.00"})
-        gain_mock = mock.Mock()
+        award_mock = mock.AsyncMock(return_value={human_id: "130.00"})
+        gain_mock = mock.AsyncMock()
         finish_calls: list = []
 
         @asynccontextmanager
@@ -253,14 +255,14 @@ class BotWinSettleAccountingTests(unittest.IsolatedAsyncioTestCase):
             mock.patch("app.bingo.service.room_lock", fake_lock),
             mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
             mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()),
-            mock.patch("app.bingo.service.wallet.award_prizes", award_mock),
+            mock.patch("app.bingo.service.wallet.award_prizes_async", award_mock),
             mock.patch(
-                "app.bingo.service.wallet.credit_bot_system_gain",
+                "app.bingo.service.wallet.credit_bot_system_gain_async",
                 gain_mock,
             ),
             mock.patch(
-                "app.bingo.service.wallet.record_round_finish",
-                side_effect=capture_finish,
+                "app.bingo.service.wallet.record_round_finish_async",
+                new=mock.AsyncMock(side_effect=capture_finish),
             ),
             mock.patch(
                 "app.bingo.service.manager.broadcast",
@@ -473,14 +475,17 @@ class BotPublicWinnerSettleTests(unittest.IsolatedAsyncioTestCase):
             mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
             mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()),
             mock.patch(
-                "app.bingo.service.wallet.award_prizes",
-                return_value={bot_id: "100.00"},
+                "app.bingo.service.wallet.award_prizes_async",
+                new=mock.AsyncMock(return_value={bot_id: "100.00"}),
             ),
             mock.patch(
-                "app.bingo.service.wallet.credit_bot_system_gain",
-                return_value="100.00",
+                "app.bingo.service.wallet.credit_bot_system_gain_async",
+                new=mock.AsyncMock(return_value="100.00"),
+            ),
+            mock.patch(
+                "app.bingo.service.wallet.record_round_finish_async",
+                new=mock.AsyncMock(),
             ),
-            mock.patch("app.bingo.service.wallet.record_round_finish"),
             mock.patch(
                 "app.bingo.service.manager.broadcast",
                 new=mock.AsyncMock(side_effect=capture_broadcast),
@@ -786,7 +791,7 @@ class HouseBotIsolatedTests(unittest.IsolatedAsyncioTestCase):
                 new=mock.AsyncMock(return_value=ReserveResult.TAKEN),
             ) as reserve,
             mock.patch(
-                "app.bingo.house_bot.asyncio.to_thread",
+                "app.bingo.house_bot.executors.settlement.run",
                 new=mock.AsyncMock(return_value="1000"),
             ),
             mock.patch.object(house_bot, "ensure_bot_funds", new=mock.AsyncMock()),
@@ -836,7 +841,9 @@ class HouseBotIsolatedTests(unittest.IsolatedAsyncioTestCase):
             broadcast.assert_not_awaited()
 
 
-class BotWalletAndAdminTests(TestCase):
+class WalletDatabaseFixture:
+    """In-memory SQLite with the house bot (10.00) and one player (100.00)."""
+
     def setUp(self):
         engine = create_engine("sqlite+pysqlite:///:memory:")
         Base.metadata.create_all(engine)
@@ -872,6 +879,9 @@ class BotWalletAndAdminTests(TestCase):
 
         return mock.patch("app.bingo.wallet.SessionLocal", side_effect=factory)
 
+
+class BotWalletAndAdminTests(WalletDatabaseFixture, TestCase):
+
     def test_ensure_bot_balance_topup_ledger(self):
         with self._patch_session():
             balance = wallet.ensure_bot_balance(str(self.bot.id))
@@ -927,6 +937,39 @@ class BotWalletAndAdminTests(TestCase):
         self.assertEqual(stakes, 1)
         self.assertEqual(wins, 1)
 
+    def test_charge_stakes_debits_affordable_players_in_one_update(self):
+        statements: list[str] = []
+        event.listen(
+            self.Session.kw["bind"],
+            "before_cursor_execute",
+            lambda _conn, _cur, sql, *_args: statements.append(sql),
+        )
+
+        with self._patch_session():
+            paid = wallet.charge_stakes(
+                {
+                    str(self.bot.id): Decimal("20.00"),  # only has 10
+                    str(self.human.id): Decimal("30.00"),
+                    "not-a-uuid": Decimal("5.00"),
+                },
+                "MBBULK1",
+            )
+
+        self.assertEqual(paid, {str(self.human.id): "70.00"})
+        self.assertEqual(sum(sql.startswith("UPDATE users") for sql in statements), 1)
+
+        db = self.Session()
+        bot = db.query(User).filter(User.id == self.bot.id).one()
+        self.assertEqual(bot.balance, Decimal("10.00"))
+        tx = db.query(WalletTransaction).filter(
+            WalletTransaction.transaction_type == wallet.STAKE_TX_TYPE,
+        ).one()
+        self.assertEqual(tx.user_id, self.human.id)
+        self.assertEqual(
+            (tx.amount, tx.balance_before, tx.balance_after),
+            (Decimal("-30.00"), Decimal("100.00"), Decimal("70.00")),
+        )
+
     def test_bot_win_credits_real_stake_system_gain(self):
         """Bot win: balance rises by real_stake_total via BINGO_BOT_SYSTEM_GAIN."""
         game_id = "MBGAIN2"
@@ -1142,3 +1185,67 @@ class BotWalletAndAdminTests(TestCase):
         self.assertTrue(row.is_winner)
         self.assertEqual(row.public_winner_name, dummy)
         self.assertNotEqual(row.public_winner_name, "Bright Bot")
+
+
+class AviatorCashoutWriterTests(WalletDatabaseFixture, unittest.IsolatedAsyncioTestCase):
+    def test_batch_credits_once_per_bet(self):
+        bet_a, bet_b = uuid.uuid4().hex, uuid.uuid4().hex
+        cashouts = [
+            aviator_wallet.Cashout(str(self.human.id), Decimal("25.00"), "AV1", bet_a),
+            aviator_wallet.Cashout(str(self.bot.id), Decimal("15.50"), "AV1", bet_b),
+            aviator_wallet.Cashout(str(uuid.uuid4()), Decimal("5.00"), "AV1", uuid.uuid4().hex),
+        ]
+
+        results = aviator_wallet._credit_cashouts(self.db, cashouts)
+        again = aviator_wallet._credit_cashouts(self.db, cashouts[:2])
+        self.db.commit()
+
+        self.assertEqual((results[bet_a], results[bet_b]), ("125.00", "25.50"))
+        self.assertIsInstance(results[cashouts[2].bet_id], ValueError)
+        self.assertEqual((again[bet_a], again[bet_b]), ("125.00", "25.50"))
+        self.db.refresh(self.human)
+        self.assertEqual(self.human.balance, Decimal("125.00"))
+        rows = self.db.query(WalletTransaction).filter_by(transaction_type="AVIATOR_CASHOUT").all()
+        self.assertEqual(len(rows), 2)
+
+    async def test_concurrent_cash_outs_share_one_transaction(self):
+        batches: list[int] = []
+
+        async def fake_run_async(fn, cashouts):
+            batches.append(len(cashouts))
+            return {c.bet_id: f"{c.amount}" for c in cashouts}
+
+        writer = aviator_wallet.CashoutWriter()
+        with (
+            mock.patch.object(aviator_wallet, "cashout_writer", writer),
+            mock.patch.object(aviator_wallet, "run_async", side_effect=fake_run_async),
+        ):
+            balances = await asyncio.gather(
+                *(
+                    aviator_wallet.credit_cashout_async("u", Decimal(n), "AV1", f"bet-{n}")
+                    for n in (1, 2, 3)
+                )
+            )
+
+        self.assertEqual(batches, [3])
+        self.assertEqual(balances, ["1", "2", "3"])
+
+    async def test_failed_batch_is_retried_one_by_one(self):
+        async def fake_run_async(fn, cashouts):
+            if any(c.bet_id == "bad" for c in cashouts):
+                raise RuntimeError("boom")
+            return {c.bet_id: "1.00" for c in cashouts}
+
+        writer = aviator_wallet.CashoutWriter()
+        with (
+            mock.patch.object(aviator_wallet, "cashout_writer", writer),
+            mock.patch.object(aviator_wallet, "run_async", side_effect=fake_run_async),
+        ):
+            good, bad = await asyncio.gather(
+                aviator_wallet.credit_cashout_async("u", Decimal("1"), "AV1", "good"),
+                aviator_wallet.credit_cashout_async("u", Decimal("1"), "AV1", "bad"),
+                return_exceptions=True,
+            )
+
+        self.assertEqual(good, "1.00")
+        self.assertIsInstance(bad, RuntimeError)
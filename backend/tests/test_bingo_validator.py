@@ -0,0 +1,115 @@
+"""Batch Bingo validator: backend parity and a per-card loop comparison."""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+import unittest
+from unittest import mock
+
+from app.bingo import validator
+from app.bingo.cards import board_row, generate_card_for_board
+from app.bingo.patterns import DEFAULT_PATTERNS, PATTERN_REGISTRY
+from app.bingo.validator import (
+    drawn_bitset,
+    find_winning_boards,
+    find_winning_pattern,
+    flatten_card,
+)
+
+ALL_PATTERNS = tuple(PATTERN_REGISTRY.values())
+
+
+def _boards(count: int) -> tuple[list[int], list]:
+    board_ids = list(range(1, count + 1))
+    # Cycle the 400-board pool so 10,000-board stacks stay realistic.
+    grids = [generate_card_for_board((i - 1) % 400 + 1) for i in board_ids]
+    return board_ids, grids
+
+
+def _per_card_loop(board_ids, grids, drawn, patterns):
+    winners = []
+    drawn_numbers = set(drawn)
+    for board_id, grid in zip(board_ids, grids):
+        pattern = find_winning_pattern(grid, drawn_numbers, patterns)
+        if pattern is not None:
+            winners.append((board_id, pattern))
+    return winners
+
+
+class BatchValidatorTests(unittest.TestCase):
+    def test_matches_per_card_loop_on_both_backends(self):
+        board_ids, grids = _boards(400)
+        stacks = {
+            "tuples": [flatten_card(grid) for grid in grids],
+            # Pool boards reach the validator as cached ``bytes`` rows.
+            "bytes": [board_row(board_id) for board_id in board_ids],
+            "mixed": [
+                board_row(board_id) if board_id % 2 else flatten_card(grid)
+                for board_id, grid in zip(board_ids, grids)
+            ],
+        }
+        rng = random.Random(7)
+
+        for size in (0, 5, 20, 40, 75):
+            drawn = rng.sample(range(1, 76), size)
+            expected = _per_card_loop(board_ids, grids, drawn, ALL_PATTERNS)
+
+            for rows, stack in stacks.items():
+                with self.subTest(drawn=size, rows=rows, backend="python"):
+                    with mock.patch.object(validator, "np", None):
+                        got = find_winning_boards(stack, board_ids, drawn_bitset(drawn), ALL_PATTERNS)
+                    self.assertEqual(got, expected)
+
+                if validator.np is not None:
+                    with self.subTest(drawn=size, rows=rows, backend="numpy"):
+                        got = find_winning_boards(stack, board_ids, drawn_bitset(drawn), ALL_PATTERNS)
+                        self.assertEqual(got, expected)
+
+    def test_free_center_counts_as_marked(self):
+        grid = generate_card_for_board(1)
+        middle_row = [value for value in grid[2] if value is not None]
+
+        hits = find_winning_boards([flatten_card(grid)], ["1"], drawn_bitset(middle_row))
+
+        self.assertEqual([(board, p.name) for board, p in hits], [("1", "row_2")])
+
+    def test_empty_stack(self):
+        self.assertEqual(find_winning_boards([], [], drawn_bitset([1, 2])), [])
+
+
+@unittest.skipUnless(os.environ.get("BINGO_BENCHMARK"), "set BINGO_BENCHMARK=1 to run")
+class BatchValidatorBenchmark(unittest.TestCase):
+    """Compares the batch API with the per-card loop at 400 and 10,000 boards.
+    With numpy the batch must beat the loop at 10,000 boards; the pure-Python
+    fallback only has to stay within 2x of it."""
+
+    def test_batch_vs_per_card_loop(self):
+        drawn = random.Random(11).sample(range(1, 76), 30)
+        bits = drawn_bitset(drawn)
+
+        for count in (400, 10_000):
+            board_ids, grids = _boards(count)
+            stack = [flatten_card(grid) for grid in grids]
+
+            started = time.perf_counter()
+            expected = _per_card_loop(board_ids, grids, drawn, DEFAULT_PATTERNS)
+            loop_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            got = find_winning_boards(stack, board_ids, bits, DEFAULT_PATTERNS)
+            batch_ms = (time.perf_counter() - started) * 1000
+
+            self.assertEqual(got, expected)
+            if count < 10_000:
+                continue
+            budget = loop_ms if validator.np is not None else 2 * loop_ms
+            self.assertLess(
+                batch_ms,
+                budget,
+                f"{count} boards: per-card loop {loop_ms:.2f} ms, batch {batch_ms:.2f} ms",
+            )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for the named, bounded DB executors (app.core.executors)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import unittest
+
+from app.core.executors import BoundedExecutor
+
+
+class BoundedExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_pool_runs_blocking_calls_and_counts_queue_and_timing(self):
+        executor = BoundedExecutor("test", workers=1)
+        release = threading.Event()
+        self.addCleanup(executor.shutdown)
+
+        def blocking(value):
+            release.wait(1)
+            return (threading.current_thread().name, value)
+
+        first = asyncio.create_task(executor.run(blocking, 1))
+        second = asyncio.create_task(executor.run(blocking, 2))
+        await asyncio.sleep(0.05)
+
+        snap = executor.snapshot()
+        self.assertEqual((snap["running"], snap["queued"]), (1, 1))
+
+        release.set()
+        (name, value), (_, other) = await asyncio.gather(first, second)
+
+        self.assertTrue(name.startswith("db-test"))
+        self.assertEqual((value, other), (1, 2))
+        with self.assertRaises(ZeroDivisionError):
+            await executor.run(lambda: 1 / 0)
+
+        snap = executor.snapshot()
+        self.assertEqual((snap["completed"], snap["failed"]), (2, 1))
+        self.assertEqual((snap["running"], snap["queued"], snap["queued_max"]), (0, 0, 1))
+        self.assertGreater(snap["wait_seconds_max"], 0.0)
+
+    async def test_cancelled_queued_call_leaves_the_queue_count(self):
+        executor = BoundedExecutor("test", workers=1)
+        release = threading.Event()
+        self.addCleanup(executor.shutdown)
+
+        busy = asyncio.create_task(executor.run(release.wait, 1))
+        waiting = asyncio.create_task(executor.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        await asyncio.sleep(0)  # let wrap_future cancel the pool future
+
+        release.set()
+        await busy
+
+        snap = executor.snapshot()
+        self.assertEqual((snap["queued"], snap["running"], snap["completed"]), (0, 0, 1))
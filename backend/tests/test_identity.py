@@ -0,0 +1,65 @@
+"""Tests for the cached JWT -> identity lookup (app.core.identity)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+import uuid
+from unittest import mock
+
+from app.core import identity
+from app.core.security import create_access_token
+
+
+class IdentityCacheTests(unittest.IsolatedAsyncioTestCase):
+    def _identity(self, user_id):
+        return identity.Identity(
+            id=user_id, username="u", first_name=None, photo_url=None,
+            is_active=True, is_bot=False,
+        )
+
+    def test_cache_evicts_least_recently_used_and_expired(self):
+        cache = identity.IdentityCache(max_entries=2, ttl_seconds=60)
+        ids = [uuid.uuid4() for _ in range(3)]
+        cache.put("a", self._identity(ids[0]))
+        cache.put("b", self._identity(ids[1]))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", self._identity(ids[2]))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a").id, ids[0])
+
+        with mock.patch("app.core.identity.time.monotonic", return_value=10**9):
+            self.assertIsNone(cache.get("a"))
+
+    async def test_authenticate_queries_users_once_until_invalidated(self):
+        user_id = uuid.uuid4()
+        token = create_access_token(str(user_id))
+        cache = identity.IdentityCache(max_entries=10, ttl_seconds=60)
+        fanout = mock.Mock()
+
+        def load(subject):
+            found = self._identity(user_id)
+            cache.put(subject, found)
+            return found
+
+        with (
+            mock.patch.object(identity, "cache", cache),
+            mock.patch.object(identity, "fanout", fanout),
+            mock.patch.object(identity, "load_identity", side_effect=load) as loader,
+            mock.patch.object(identity, "_loop", asyncio.get_running_loop()),
+        ):
+            first = await identity.authenticate(token)
+            second = await identity.authenticate(token)
+            self.assertIsNone(await identity.authenticate("not-a-jwt"))
+
+            await asyncio.to_thread(identity.invalidate, user_id)
+            await asyncio.sleep(0)
+            await identity.authenticate(token)
+
+        self.assertEqual(first, second)
+        self.assertEqual(loader.call_count, 2)
+        fanout.publish_encoded.assert_called_once_with(
+            json.dumps({"user_ids": [str(user_id)]})
+        )
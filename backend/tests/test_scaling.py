@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import unittest
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from decimal import Decimal
 from unittest import mock
 
-from app.aviator import store
+from redis.exceptions import NoScriptError
+
+from app.aviator import service, store
 from app.aviator.service import place_bet
-from app.bingo.redis_store import PlayerState, RoomState, ROOM_TTL_SECONDS
+from app.bingo import cluster, redis_store
+from app.bingo.redis_store import CardState, PlayerState, RoomState, ROOM_TTL_SECONDS
+from app.bingo import game_loop as bingo_loop
 from app.bingo import service as bingo_service
+from app.bingo.cards import generate_card_for_board, shuffled_draw_order
+from app.bingo import validator
+from app.bingo.patterns import DEFAULT_PATTERNS
+from app.bingo.validator import find_winning_pattern
+from app.bingo.win_index import RoundWinIndex
+from app.core import redis_fanout, redis_scripts
 from app.core.redis_fanout import ORIGIN_FIELD
 from app.lotto import game_loop as lotto_loop
 
@@ -29,18 +44,14 @@ class AviatorDeltaBroadcastTests(unittest.IsolatedAsyncioTestCase):
 
         with (
             mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
-            mock.patch("app.aviator.service.store.save_round", new=mock.AsyncMock()),
-            mock.patch("app.aviator.service._round_mutation_lock") as lock_ctx,
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=None)),
+            mock.patch("app.aviator.service.store.add_bet", new=mock.AsyncMock(return_value="ok")) as add_bet,
             mock.patch(
-                "app.aviator.service.aviator_wallet.charge_bet",
-                return_value="90.00",
+                "app.aviator.service.aviator_wallet.charge_bet_async",
+                new=mock.AsyncMock(return_value="90.00"),
             ),
-            mock.patch("app.aviator.service.asyncio.to_thread", new=mock.AsyncMock(return_value="90.00")),
             mock.patch("app.aviator.service.hub.broadcast", side_effect=fake_broadcast),
         ):
-            lock_ctx.return_value.__aenter__ = mock.AsyncMock(return_value=None)
-            lock_ctx.return_value.__aexit__ = mock.AsyncMock(return_value=None)
-
             result = await place_bet("user-1", "Alice", "10", slot=0)
 
         self.assertEqual(result["type"], "bet_placed")
@@ -55,6 +66,323 @@ class AviatorDeltaBroadcastTests(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("round", payload)
         self.assertNotIn("bets", payload)
         self.assertEqual(payload["bet"]["user_id"], "user-1")
+        add_bet.assert_awaited_once()
+
+    def test_round_core_is_stored_without_bets_and_totals_are_cents(self):
+        rnd = store.LiveRound(round_id="r1", round_code="ABC123", phase="flying")
+        rnd.bets = [store.LiveBet(bet_id="b1", user_id="u1", display_name="A", stake="10.00", slot=0)]
+        rnd.apply_totals("1050", None, "3")
+
+        self.assertNotIn("bets", rnd.core_dict())
+        self.assertNotIn("total_stake", rnd.core_dict())
+        self.assertEqual((rnd.total_stake, rnd.total_payout), ("10.50", "0.00"))
+        self.assertEqual(rnd.to_dict()["player_count"], 3)
+        self.assertEqual(str(rnd.pool_left()), "10.50")
+
+
+class AviatorBetTransitionTests(unittest.IsolatedAsyncioTestCase):
+    def _flying_round(self):
+        return store.LiveRound(
+            round_id="r1",
+            round_code="ABC123",
+            phase="flying",
+            crash_multiplier=50.0,
+            flying_started_at=1.0,
+        )
+
+    async def test_bet_that_loses_the_race_is_refunded(self):
+        rnd = store.LiveRound(
+            round_id="r1",
+            round_code="ABC123",
+            phase="betting",
+            betting_ends_at=9_999_999_999.0,
+        )
+
+        with (
+            mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=None)),
+            mock.patch("app.aviator.service.store.add_bet", new=mock.AsyncMock(return_value="exists")),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.charge_bet_async",
+                new=mock.AsyncMock(return_value="90.00"),
+            ),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.refund_bet_async",
+                new=mock.AsyncMock(return_value="100.00"),
+            ) as refund,
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()) as broadcast,
+        ):
+            with self.assertRaisesRegex(service.AviatorError, "already have a bet"):
+                await place_bet("user-1", "Alice", "10", slot=0)
+
+        refund.assert_awaited_once()
+        broadcast.assert_not_awaited()
+
+    async def test_stake_is_refunded_when_adding_the_bet_fails(self):
+        rnd = store.LiveRound(
+            round_id="r1",
+            round_code="ABC123",
+            phase="betting",
+            betting_ends_at=9_999_999_999.0,
+        )
+        placed: list[store.LiveBet] = []
+
+        async def add_bet(_rnd, bet, _now):
+            placed.append(bet)
+            raise TimeoutError("redis timeout")
+
+        for landed in (False, True):
+            placed.clear()
+
+            async def get_bet(_round_id, _user_id):
+                # The first lookup is place_bet's own pre-check.
+                return placed[0] if landed and placed else None
+
+            with (
+                self.subTest(landed=landed),
+                mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+                mock.patch("app.aviator.service.store.get_bet", side_effect=get_bet),
+                mock.patch("app.aviator.service.store.add_bet", side_effect=add_bet),
+                mock.patch(
+                    "app.aviator.service.aviator_wallet.charge_bet_async",
+                    new=mock.AsyncMock(return_value="90.00"),
+                ),
+                mock.patch(
+                    "app.aviator.service.aviator_wallet.refund_bet_async",
+                    new=mock.AsyncMock(return_value="100.00"),
+                ) as refund,
+            ):
+                with self.assertRaises(TimeoutError):
+                    await place_bet("user-1", "Alice", "10")
+
+                # A bet the timed-out script did write keeps its stake.
+                self.assertEqual(refund.await_count, 0 if landed else 1)
+
+    async def test_cash_out_claims_the_bet_before_crediting(self):
+        rnd = self._flying_round()
+        bet = store.LiveBet(bet_id=uuid.uuid4().hex, user_id="user-1", display_name="A", stake="10.00", slot=0)
+        order: list[str] = []
+
+        async def claim(_rnd, target, _mult):
+            order.append(f"claim:{target.status}")
+            return "ok"
+
+        async def credit(*_args):
+            order.append("credit")
+            return "125.00"
+
+        async def clear(bet_id):
+            order.append(f"clear:{bet_id}")
+
+        with (
+            mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=bet)),
+            mock.patch("app.aviator.service.store.cash_out_bet", side_effect=claim),
+            mock.patch("app.aviator.service.aviator_wallet.credit_cashout_async", side_effect=credit),
+            mock.patch("app.aviator.service.store.clear_pending_credit", side_effect=clear),
+            mock.patch("app.aviator.service.current_multiplier", return_value=2.5),
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()),
+        ):
+            result = await service.cash_out("user-1")
+
+        self.assertEqual(order, ["claim:cashed", "credit", f"clear:{bet.bet_id}"])
+        self.assertEqual(result["bet"]["status"], "cashed")
+        self.assertEqual(result["balance"], "125.00")
+
+    async def test_cash_out_rejected_by_script_never_credits(self):
+        rnd = self._flying_round()
+        bet = store.LiveBet(bet_id=uuid.uuid4().hex, user_id="user-1", display_name="A", stake="10.00", slot=0)
+
+        with (
+            mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=bet)),
+            mock.patch("app.aviator.service.store.cash_out_bet", new=mock.AsyncMock(return_value="crashed")),
+            mock.patch("app.aviator.service.aviator_wallet.credit_cashout_async", new=mock.AsyncMock()) as credit,
+            mock.patch("app.aviator.service.current_multiplier", return_value=2.5),
+        ):
+            with self.assertRaisesRegex(service.AviatorError, "Too late"):
+                await service.cash_out("user-1")
+
+        credit.assert_not_awaited()
+
+    async def test_failed_credit_puts_the_bet_back(self):
+        rnd = self._flying_round()
+        bet = store.LiveBet(bet_id=uuid.uuid4().hex, user_id="user-1", display_name="A", stake="10.00", slot=0)
+
+        with (
+            mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=bet)),
+            mock.patch("app.aviator.service.store.cash_out_bet", new=mock.AsyncMock(return_value="ok")),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.credit_cashout_async",
+                new=mock.AsyncMock(side_effect=ValueError("User not found")),
+            ),
+            mock.patch(
+                "app.aviator.service.store.revert_cash_out", new=mock.AsyncMock(return_value=True)
+            ) as revert,
+            mock.patch("app.aviator.service.current_multiplier", return_value=2.5),
+        ):
+            with self.assertRaises(ValueError):
+                await service.cash_out("user-1")
+
+        reverted, win = revert.await_args.args[1:]
+        self.assertEqual((reverted.status, win), ("active", "25.00"))
+
+    async def test_auto_cash_out_target_is_validated_and_stored(self):
+        rnd = store.LiveRound(
+            round_id="r1",
+            round_code="ABC123",
+            phase="betting",
+            betting_ends_at=9_999_999_999.0,
+        )
+
+        with (
+            mock.patch("app.aviator.service.store.get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch("app.aviator.service.store.get_bet", new=mock.AsyncMock(return_value=None)),
+            mock.patch("app.aviator.service.store.add_bet", new=mock.AsyncMock(return_value="ok")),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.charge_bet_async",
+                new=mock.AsyncMock(return_value="90.00"),
+            ) as charge,
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()),
+        ):
+            result = await place_bet("user-1", "Alice", "10", auto_cashout_at="2.505")
+            with self.assertRaisesRegex(service.AviatorError, "Auto cash-out"):
+                await place_bet("user-1", "Alice", "10", auto_cashout_at=1.0)
+
+        self.assertEqual(result["bet"]["auto_cashout_at"], 2.5)
+        charge.assert_awaited_once()
+
+    async def test_auto_cash_out_skips_bets_cashed_by_hand(self):
+        rnd = self._flying_round()
+        bets = [
+            store.LiveBet(bet_id=f"b{n}", user_id=f"u{n}", display_name="A", stake="10", slot=0, auto_cashout_at=2.0)
+            for n in (1, 2)
+        ]
+        queue = service.auto_cashout_queue(rnd, bets)
+
+        async def claim(_rnd, bet, mult):
+            if bet.bet_id == "b1":
+                raise service.AviatorError("Bet already cashed out or no active bet exists")
+            return replace(bet, status="cashed", cashout_at=mult, win="20.00")
+
+        with (
+            mock.patch("app.aviator.service._claim_cash_out", side_effect=claim),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.credit_cashout_async",
+                new=mock.AsyncMock(return_value="120.00"),
+            ),
+            mock.patch("app.aviator.service.store.clear_pending_credit", new=mock.AsyncMock()) as clear,
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()) as broadcast,
+            mock.patch("app.aviator.service.hub.send", new=mock.AsyncMock()) as send,
+        ):
+            await service.run_auto_cashouts(rnd, queue, now=queue[0][0] - 0.01)
+            await service.drain_auto_cashouts(1.0)
+            broadcast.assert_not_awaited()
+            await service.run_auto_cashouts(rnd, queue, now=queue[0][0])
+            await service.drain_auto_cashouts(1.0)
+
+        self.assertEqual(queue, [])
+        broadcast.assert_awaited_once()
+        self.assertEqual(broadcast.await_args.kwargs, {"exclude": "u2"})
+        user_id, frame = send.await_args.args
+        self.assertEqual(user_id, "u2")
+        self.assertEqual((frame["bet_id"], frame["multiplier"], frame["balance"]), ("b2", 2.0, "120.00"))
+        clear.assert_awaited_once_with("b2")
+
+    async def test_failed_auto_cash_out_is_retried_not_lost(self):
+        rnd = self._flying_round()
+        bets = [
+            store.LiveBet(bet_id=f"b{n}", user_id=f"u{n}", display_name="A", stake="10", slot=0, auto_cashout_at=2.0)
+            for n in (1, 2)
+        ]
+        queue = service.auto_cashout_queue(rnd, bets)
+        due_at = queue[0][0]
+        claims = {"b1": [ConnectionError("redis down")]}
+
+        async def claim(_rnd, bet, mult):
+            if claims.get(bet.bet_id):
+                raise claims[bet.bet_id].pop()
+            return replace(bet, status="cashed", cashout_at=mult, win="20.00")
+
+        with (
+            mock.patch.object(service, "AUTO_CASHOUT_RETRY_SECONDS", 0.0),
+            mock.patch("app.aviator.service._claim_cash_out", side_effect=claim),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.credit_cashout_async",
+                new=mock.AsyncMock(side_effect=[OSError("db busy"), "120.00", "130.00"]),
+            ) as credit,
+            mock.patch("app.aviator.service.store.revert_cash_out", new=mock.AsyncMock()) as revert,
+            mock.patch("app.aviator.service.store.clear_pending_credit", new=mock.AsyncMock()),
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()),
+            mock.patch("app.aviator.service.hub.send", new=mock.AsyncMock()) as send,
+        ):
+            await service.run_auto_cashouts(rnd, queue, now=due_at)
+            # The claim that errored goes back on the queue ...
+            self.assertEqual([entry[2] for entry in queue], ["b1"])
+            await service.drain_auto_cashouts(1.0)
+            await service.run_auto_cashouts(rnd, queue, now=due_at)
+            await service.drain_auto_cashouts(1.0)
+
+        # ... and the claimed bet's failed credit is retried, never reverted.
+        self.assertEqual(queue, [])
+        self.assertEqual(credit.await_count, 3)
+        revert.assert_not_awaited()
+        self.assertEqual(sorted(c.args[0] for c in send.await_args_list), ["u1", "u2"])
+
+    async def test_uncredited_auto_cash_out_stays_pending_and_unannounced(self):
+        rnd = self._flying_round()
+        bet = store.LiveBet(bet_id="b1", user_id="u1", display_name="A", stake="10", slot=0, auto_cashout_at=2.0)
+        queue = service.auto_cashout_queue(rnd, [bet])
+
+        async def claim(_rnd, bet, mult):
+            return replace(bet, status="cashed", cashout_at=mult, win="20.00")
+
+        with (
+            mock.patch.object(service, "AUTO_CASHOUT_RETRY_SECONDS", 0.0),
+            mock.patch("app.aviator.service._claim_cash_out", side_effect=claim),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.credit_cashout_async",
+                new=mock.AsyncMock(side_effect=OSError("db down")),
+            ) as credit,
+            mock.patch("app.aviator.service.store.clear_pending_credit", new=mock.AsyncMock()) as clear,
+            mock.patch("app.aviator.service.hub.broadcast", new=mock.AsyncMock()) as broadcast,
+            mock.patch("app.aviator.service.hub.send", new=mock.AsyncMock()) as send,
+        ):
+            await service.run_auto_cashouts(rnd, queue, now=queue[0][0])
+            await service.drain_auto_cashouts(1.0)
+
+        self.assertEqual(credit.await_count, service.AUTO_CASHOUT_CREDIT_ATTEMPTS)
+        clear.assert_not_awaited()
+        broadcast.assert_not_awaited()
+        send.assert_not_awaited()
+
+    async def test_reconcile_credits_and_clears_pending_cash_outs(self):
+        paid = store.LiveBet(bet_id="b1", user_id="u1", display_name="A", stake="10", slot=0, win="20.00")
+        stuck = store.LiveBet(bet_id="b2", user_id="u2", display_name="B", stake="10", slot=0, win="30.00")
+
+        async def credit(user_id, win, round_code, bet_id):
+            if bet_id == "b2":
+                raise OSError("db down")
+            return "120.00"
+
+        with (
+            mock.patch(
+                "app.aviator.service.store.get_pending_credits",
+                new=mock.AsyncMock(return_value=[(paid, "R1"), (stuck, "R1")]),
+            ),
+            mock.patch(
+                "app.aviator.service.aviator_wallet.credit_cashout_async", side_effect=credit
+            ) as credit_mock,
+            mock.patch("app.aviator.service.store.clear_pending_credit", new=mock.AsyncMock()) as clear,
+        ):
+            await service.reconcile_cashouts()
+
+        self.assertEqual(
+            [c.args for c in credit_mock.call_args_list],
+            [("u1", Decimal("20.00"), "R1", "b1"), ("u2", Decimal("30.00"), "R1", "b2")],
+        )
+        clear.assert_awaited_once_with("b1")
 
 
 class BingoLeavePruneTests(unittest.IsolatedAsyncioTestCase):
@@ -74,12 +402,8 @@ class BingoLeavePruneTests(unittest.IsolatedAsyncioTestCase):
             mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(side_effect=[room, room])),
             mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()) as save,
             mock.patch(
-                "app.bingo.service.redis_store.get_board_map",
-                new=mock.AsyncMock(return_value={7: "u1", 8: "u2"}),
-            ),
-            mock.patch(
-                "app.bingo.service.redis_store.release_all_boards",
-                new=mock.AsyncMock(return_value=1),
+                "app.bingo.service.redis_store.release_user_boards",
+                new=mock.AsyncMock(return_value=[7]),
             ) as release_all,
             mock.patch("app.bingo.service.manager.broadcast", side_effect=fake_broadcast),
             mock.patch(
@@ -137,6 +461,1009 @@ class BingoLeavePruneTests(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("gone", result.players)
 
 
+class _RecordingPipe:
+    """Applies the subset of hash/list commands ``redis_store`` queues onto a
+    plain dict, so the split room layout can be round-tripped without Redis."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, object] = {}
+        self.results: list = []
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        target = self.data.setdefault(key, {})
+        if mapping:
+            target.update({k: str(v) for k, v in mapping.items()})
+        if field is not None:
+            target[field] = str(value)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(str(v) for v in values)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def expire(self, key, _seconds):
+        pass
+
+    def hgetall(self, key):
+        self.results.append(dict(self.data.get(key, {})))
+
+    def lrange(self, key, _start, _end):
+        self.results.append(list(self.data.get(key, [])))
+
+
+class _LeaseRedis:
+    """Room-lease scripts and the WATCHed write-behind pipeline over one
+    shared dict, standing in for Redis across several "instances"."""
+
+    def __init__(self) -> None:
+        self.recorded = _RecordingPipe()
+        self.data = self.recorded.data
+        self.executed = 0
+
+    async def evalsha(self, sha, numkeys, *rest):
+        keys, args = rest[:numkeys], rest[numkeys:]
+        held = self.data.get(keys[0])
+
+        if sha == redis_store._CLAIM_ROOM_LEASE_SCRIPT.sha:
+            if held is not None:
+                owner, epoch = held.split(":")
+                return int(epoch) if owner == args[0] else -1
+            epoch = self.data[keys[1]] = self.data.get(keys[1], 0) + 1
+            self.data[keys[0]] = f"{args[0]}:{epoch}"
+            return epoch
+
+        if sha == redis_store._RENEW_ROOM_LEASE_SCRIPT.sha:
+            if held != args[0]:
+                return 0
+            if len(args) == 1:
+                del self.data[keys[0]]
+            return 1
+
+        raise AssertionError(f"unexpected script {sha}")
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipe:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def watch(self, *keys):
+                pass
+
+            async def mget(self, keys):
+                return [redis.data.get(key) for key in keys]
+
+            def multi(self):
+                pass
+
+            def __getattr__(self, name):
+                return getattr(redis.recorded, name)
+
+            async def execute(self):
+                redis.executed += 1
+                return []
+
+        return Pipe()
+
+
+class BingoSplitRoomLayoutTests(unittest.TestCase):
+    def _round_trip(self, room: RoomState, parts) -> RoomState | None:
+        pipe = _RecordingPipe()
+        redis_store._queue_room_write(pipe, room, redis_store.ROOM_PARTS)
+        redis_store._queue_room_read(pipe, room.room_id, parts)
+        return redis_store._room_from_parts(pipe.results, parts)
+
+    def test_room_round_trips_through_field_level_keys(self):
+        room = RoomState(room_id="split1", name="Lobby", status="in_progress")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        room.cards["7"] = CardState(card_id="7", user_id="u1", numbers=[[1]])
+        room.drawn = [5, 12, 60]
+        room.current_ball = 60
+        room.selections = {"u1": [7]}
+
+        loaded = self._round_trip(room, redis_store.ROOM_PARTS)
+
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.status, "in_progress")
+        self.assertEqual(loaded.drawn, [5, 12, 60])
+        self.assertEqual(loaded.current_ball, 60)
+        self.assertEqual(loaded.selections, {"u1": [7]})
+        self.assertEqual(loaded.players["u1"].display_name, "One")
+        self.assertEqual(loaded.cards["7"].user_id, "u1")
+
+    def test_partial_read_skips_unrequested_parts(self):
+        room = RoomState(room_id="split2", name="Lobby")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        room.cards["7"] = CardState(card_id="7", user_id="u1", numbers=[[1]])
+
+        loaded = self._round_trip(room, ("players",))
+
+        self.assertIn("u1", loaded.players)
+        self.assertEqual(loaded.cards, {})
+        self.assertEqual(loaded.drawn, [])
+
+    def test_loaded_parts_are_tracked_but_not_persisted(self):
+        room = RoomState(room_id="split5", name="Lobby", loaded_parts=("players",))
+        pipe = _RecordingPipe()
+
+        redis_store._queue_room_write(pipe, room, redis_store.ROOM_PARTS)
+
+        self.assertNotIn("loaded_parts", pipe.data[redis_store._meta_key("split5")])
+        self.assertNotIn("loaded_parts", json.loads(room.to_json()))
+        self.assertEqual(RoomState.from_json(room.to_json()).loaded_parts, redis_store.ROOM_PARTS)
+
+    def test_pool_cards_are_stored_by_board_id_only(self):
+        room = RoomState(room_id="split3", name="Lobby")
+        room.cards["42"] = CardState(card_id="42", user_id="u1")
+        pipe = _RecordingPipe()
+
+        redis_store._queue_room_write(pipe, room, redis_store.ROOM_PARTS)
+
+        stored = pipe.data[redis_store._cards_key("split3")]["42"]
+        self.assertNotIn("numbers", stored)
+        loaded = self._round_trip(room, ("cards",))
+        self.assertEqual(loaded.cards["42"].grid(), generate_card_for_board(42))
+
+    def test_room_state_sends_marks_as_bitmask(self):
+        room = RoomState(room_id="split4", name="Lobby", status="in_progress")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        room.cards["1"] = CardState(card_id="1", user_id="u1")
+        top_left = generate_card_for_board(1)[0][0]
+        room.drawn = [top_left]
+
+        message = bingo_service.room_state_message(room, "u1")
+
+        self.assertEqual(message["cards"], [{"card_id": "1", "marks": (1 << 12) | 1}])
+
+    def test_sync_payloads_splice_overlay_onto_shared_snapshot(self):
+        room = RoomState(room_id="split5", name="Lobby", status="in_progress")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One", balance="40")
+        room.players["u2"] = PlayerState(user_id="u2", display_name="Two", balance="15")
+        room.cards["9"] = CardState(card_id="9", user_id="u1")
+        room.cards["3"] = CardState(card_id="3", user_id="u1")
+        room.cards["5"] = CardState(card_id="5", user_id="u2")
+        room.drawn = [7, 22]
+
+        with mock.patch("app.bingo.service.time.time", return_value=1000.0):
+            payloads = bingo_service.room_state_payloads(room, ["u1", "u2"])
+            expected = {
+                uid: bingo_service.room_state_message(room, uid) for uid in ("u1", "u2")
+            }
+
+        for uid in ("u1", "u2"):
+            self.assertEqual(json.loads(payloads[uid]), expected[uid])
+        self.assertEqual(json.loads(payloads["u1"])["my_boards"], [3, 9])
+        self.assertEqual(json.loads(payloads["u2"])["player_balance"], "15")
+
+    def test_missing_meta_hash_means_no_room(self):
+        self.assertIsNone(redis_store._room_from_parts([{}], ()))
+
+
+class BingoLockFreeDrawTests(unittest.IsolatedAsyncioTestCase):
+    async def test_draw_broadcasts_constant_size_ball_delta(self):
+        with (
+            mock.patch(
+                "app.bingo.game_loop.redis_store.draw_ball",
+                new=mock.AsyncMock(return_value=(redis_store.DrawResult.DRAWN, [4, 19])),
+            ),
+            mock.patch("app.bingo.game_loop.room_lock") as lock_ctx,
+            mock.patch("app.bingo.game_loop.manager.broadcast", new=mock.AsyncMock()) as broadcast,
+        ):
+            outcome = await bingo_loop._draw_number("r1")
+
+        self.assertEqual(outcome, "drawn")
+        lock_ctx.assert_not_called()
+        broadcast.assert_awaited_once_with(
+            "r1", {"type": "ball", "seq": 2, "number": 19}
+        )
+
+    async def test_missing_sequence_is_reseeded_from_remaining_balls(self):
+        room = RoomState(room_id="r1", name="Lobby", status="in_progress", drawn=[1, 2])
+        draw = mock.AsyncMock(side_effect=[
+            (redis_store.DrawResult.EXHAUSTED, [1, 2]),
+            (redis_store.DrawResult.DRAWN, [1, 2, 30]),
+        ])
+
+        with (
+            mock.patch("app.bingo.game_loop.redis_store.draw_ball", new=draw),
+            mock.patch("app.bingo.game_loop.room_lock") as lock_ctx,
+            mock.patch(
+                "app.bingo.game_loop.redis_store.get_room",
+                new=mock.AsyncMock(return_value=room),
+            ),
+            mock.patch(
+                "app.bingo.game_loop.redis_store.set_draw_sequence",
+                new=mock.AsyncMock(),
+            ) as seed,
+            mock.patch("app.bingo.game_loop.manager.broadcast", new=mock.AsyncMock()),
+        ):
+            lock_ctx.return_value.__aenter__ = mock.AsyncMock(return_value=None)
+            lock_ctx.return_value.__aexit__ = mock.AsyncMock(return_value=None)
+
+            outcome = await bingo_loop._draw_number("r1")
+
+        self.assertEqual(outcome, "drawn")
+        reseeded = seed.await_args.args[1]
+        self.assertEqual(sorted(reseeded), list(range(3, 76)))
+
+
+class BingoBoardIndexTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reserve_checks_cap_against_user_counter(self):
+        redis = mock.Mock()
+        redis.evalsha = mock.AsyncMock(return_value=1)
+
+        with mock.patch("app.bingo.redis_store.get_redis", return_value=redis):
+            result = await redis_store.reserve_board("r1", "u1", 12, 5, 400)
+
+        self.assertEqual(result, redis_store.ReserveResult.CLAIMED)
+        sha, numkeys, *rest = redis.evalsha.await_args.args
+        self.assertEqual(sha, redis_store._RESERVE_BOARD_SCRIPT.sha)
+        self.assertEqual(numkeys, 3)
+        self.assertEqual(
+            rest[:3],
+            ["bingo:room:r1:boards", "bingo:room:r1:board_counts", "bingo:room:r1:user_boards:u1"],
+        )
+        self.assertNotIn("hvals", redis_store._RESERVE_BOARD_SCRIPT.source)
+        self.assertIn("hincrby", redis_store._RESERVE_BOARD_SCRIPT.source)
+
+    def test_board_scripts_only_touch_declared_keys(self):
+        for script in (
+            redis_store._RESERVE_BOARD_SCRIPT,
+            redis_store._RELEASE_BOARD_SCRIPT,
+            redis_store._RELEASE_ALL_BOARDS_SCRIPT,
+            redis_store._CLEAR_BOARDS_SCRIPT,
+        ):
+            self.assertNotIn("..", script.source, script.name)
+
+    async def test_clear_boards_retries_when_holders_change(self):
+        redis = mock.Mock()
+        redis.hkeys = mock.AsyncMock(side_effect=[["u1"], ["u1", "u2"]])
+        redis.evalsha = mock.AsyncMock(side_effect=[-1, 2])
+
+        with mock.patch("app.bingo.redis_store.get_redis", return_value=redis):
+            await redis_store.clear_boards("r1")
+
+        _, numkeys, *rest = redis.evalsha.await_args.args
+        self.assertEqual(numkeys, 4)
+        self.assertEqual(
+            rest,
+            [
+                "bingo:room:r1:boards",
+                "bingo:room:r1:board_counts",
+                "bingo:room:r1:user_boards:u1",
+                "bingo:room:r1:user_boards:u2",
+                "u1",
+                "u2",
+            ],
+        )
+
+    async def test_select_board_reads_only_the_callers_boards(self):
+        room = RoomState(room_id="r1", name="Lobby", status="lobby", board_price="10")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+
+        with (
+            mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
+            mock.patch(
+                "app.bingo.service.redis_store.get_user_boards",
+                new=mock.AsyncMock(return_value=[3, 4]),
+            ) as user_boards,
+            mock.patch(
+                "app.bingo.service.redis_store.get_board_map",
+                new=mock.AsyncMock(side_effect=AssertionError("full scan")),
+            ),
+            mock.patch(
+                "app.bingo.service.executors.settlement.run",
+                new=mock.AsyncMock(return_value="25"),
+            ),
+            mock.patch("app.bingo.service.redis_store.reserve_board", new=mock.AsyncMock()) as reserve,
+        ):
+            with self.assertRaises(bingo_service.BingoError):
+                await bingo_service.select_board("r1", "u1", 9)
+
+        user_boards.assert_awaited_once_with("r1", "u1")
+        reserve.assert_not_awaited()
+
+
+class BingoFairRoomLockTests(unittest.IsolatedAsyncioTestCase):
+    async def test_waiter_sleeps_until_release_notification(self):
+        acquire = mock.AsyncMock(side_effect=[0, 1])
+        release = mock.AsyncMock(return_value=1)
+        before = redis_store.room_lock_stats()
+
+        with (
+            mock.patch("app.bingo.redis_store.get_redis", return_value=mock.Mock()),
+            mock.patch.object(redis_store, "_ACQUIRE_LOCK_SCRIPT", new=acquire),
+            mock.patch.object(redis_store, "_RELEASE_LOCK_SCRIPT", new=release),
+            mock.patch.object(redis_store._room_lock_wakeups, "ensure_listening"),
+            mock.patch.object(redis_store, "ROOM_LOCK_FALLBACK_POLL_SECONDS", 5.0),
+        ):
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, redis_store._room_lock_wakeups.notify, "r1")
+            started = loop.time()
+
+            async with redis_store.room_lock("r1"):
+                waited = loop.time() - started
+
+        self.assertLess(waited, 1.0)
+        self.assertEqual(acquire.await_count, 2)
+        keys = acquire.await_args.kwargs["keys"]
+        self.assertEqual(keys, ["bingo:room:r1:lock", "bingo:room:r1:lock:queue"])
+        release.assert_awaited_once()
+        self.assertEqual(
+            release.await_args.kwargs["args"][1:], [redis_store.ROOM_LOCK_CHANNEL, "r1"]
+        )
+        after = redis_store.room_lock_stats()
+        self.assertEqual(after["acquired"], before["acquired"] + 1)
+        self.assertEqual(after["contended"], before["contended"] + 1)
+
+    async def test_timeout_gives_up_ticket(self):
+        abandon = mock.AsyncMock(return_value=1)
+
+        with (
+            mock.patch("app.bingo.redis_store.get_redis", return_value=mock.Mock()),
+            mock.patch.object(
+                redis_store, "_ACQUIRE_LOCK_SCRIPT", new=mock.AsyncMock(return_value=0)
+            ),
+            mock.patch.object(redis_store, "_ABANDON_LOCK_SCRIPT", new=abandon),
+            mock.patch.object(redis_store._room_lock_wakeups, "ensure_listening"),
+            mock.patch.object(redis_store, "ROOM_LOCK_MAX_WAIT_SECONDS", 0.05),
+        ):
+            with self.assertRaises(TimeoutError):
+                async with redis_store.room_lock("r1"):
+                    pass
+
+        abandon.assert_awaited_once()
+        self.assertNotIn("r1", redis_store._room_lock_wakeups._events)
+
+    async def test_lock_stats_are_admin_only(self):
+        from app.admin import router as admin_router
+        from app.admin.helpers import require_admin
+
+        route = next(r for r in admin_router.router.routes if r.path == "/admin/runtime")
+        self.assertIn(require_admin, [dep.call for dep in route.dependant.dependencies])
+        with mock.patch.object(admin_router.executors, "stats", return_value={}):
+            stats = await route.endpoint(_=mock.Mock())
+        self.assertEqual(stats["bingo_room_lock"], redis_store.room_lock_stats())
+
+
+class LuaScriptRegistryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_calls_by_sha_and_reloads_on_noscript(self):
+        script = redis_scripts.register_script(
+            "test.echo", "return ARGV[1]"
+        )
+        redis = mock.Mock()
+        redis.evalsha = mock.AsyncMock(side_effect=[NoScriptError("NOSCRIPT"), "hi"])
+        redis.script_load = mock.AsyncMock(return_value=script.sha)
+
+        result = await script(redis, keys=["k"], args=["hi"])
+
+        self.assertEqual(result, "hi")
+        redis.script_load.assert_awaited_once_with("return ARGV[1]")
+        redis.evalsha.assert_awaited_with(script.sha, 1, "k", "hi")
+
+    def test_registration_is_idempotent_per_name(self):
+        first = redis_scripts.register_script("test.same", "return 1")
+
+        self.assertIs(redis_scripts.register_script("test.same", "return 1"), first)
+        with self.assertRaises(ValueError):
+            redis_scripts.register_script("test.same", "return 2")
+        self.assertIn(redis_store._DRAW_BALL_SCRIPT, redis_scripts.registered_scripts())
+
+
+class AviatorFlightSyncTests(unittest.IsolatedAsyncioTestCase):
+    async def test_flight_sends_sparse_sync_ticks_and_crashes_on_time(self):
+        from app.aviator import game_loop as aviator_loop
+        from app.aviator.crash import seconds_to_reach
+
+        clock = [1000.0]
+
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+
+        rnd = store.LiveRound(
+            round_id="r1", round_code="R1", phase="betting", betting_ends_at=clock[0] - 1
+        )
+        phases: list[tuple[str, float]] = []
+        ticks: list[float] = []
+
+        async def record_phase(r, mult=None):
+            phases.append((r.phase, clock[0]))
+
+        async def record_tick(r):
+            ticks.append(clock[0])
+
+        auto_bet = store.LiveBet(
+            bet_id="b1", user_id="u1", display_name="A", stake="10", slot=0, auto_cashout_at=2.0
+        )
+        late_bet = store.LiveBet(
+            bet_id="b2", user_id="u2", display_name="B", stake="10", slot=0, auto_cashout_at=4.0
+        )
+        autos: list[tuple[float, float]] = []
+
+        async def record_auto(r, bet, mult):
+            autos.append((mult, clock[0]))
+            return replace(bet, status="cashed", cashout_at=mult, win="20.00")
+
+        db_commit = asyncio.Event()
+
+        async def slow_credit(*args):
+            await db_commit.wait()
+            return "120.00"
+
+        with (
+            mock.patch.object(
+                aviator_loop, "_renew_leader",
+                new=mock.AsyncMock(side_effect=lambda: len(phases) < 3),
+            ),
+            mock.patch.object(aviator_loop, "asyncio", mock.Mock(sleep=fake_sleep)),
+            mock.patch.object(aviator_loop, "time", mock.Mock(time=lambda: clock[0])),
+            mock.patch.object(aviator_loop, "generate_crash_point", return_value=3.0),
+            mock.patch.object(aviator_loop.store, "create_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch.object(aviator_loop.store, "get_current_round", new=mock.AsyncMock(return_value=rnd)),
+            mock.patch.object(aviator_loop.store, "save_round", new=mock.AsyncMock()),
+            mock.patch.object(aviator_loop.store, "get_bets", new=mock.AsyncMock(return_value=[auto_bet, late_bet])),
+            mock.patch.object(aviator_loop.service, "broadcast_phase", side_effect=record_phase),
+            mock.patch.object(aviator_loop.service, "broadcast_tick", side_effect=record_tick),
+            mock.patch.object(aviator_loop.service, "settle_round", new=mock.AsyncMock()),
+            mock.patch.object(aviator_loop.service, "reconcile_cashouts", new=mock.AsyncMock()) as reconcile,
+            mock.patch.object(aviator_loop.service.store, "clear_pending_credit", new=mock.AsyncMock()),
+            mock.patch.object(aviator_loop.service, "_claim_cash_out", side_effect=record_auto),
+            mock.patch.object(
+                aviator_loop.service.aviator_wallet,
+                "credit_cashout_async",
+                side_effect=slow_credit,
+            ),
+            mock.patch.object(aviator_loop.service.hub, "broadcast", new=mock.AsyncMock()),
+            mock.patch.object(aviator_loop.service.hub, "send", new=mock.AsyncMock()) as send,
+        ):
+            # The wallet write is still pending when the round crashes: the
+            # loop never waits on it.
+            await aviator_loop._run_as_leader()
+            reconcile.assert_awaited_once()
+            send.assert_not_awaited()
+            db_commit.set()
+            await aviator_loop.service.drain_auto_cashouts(1.0)
+
+        flight = seconds_to_reach(3.0)
+        # The 2.0x auto cash-out is settled at its own target, on time; the
+        # 4.0x one is past the crash point and simply loses.
+        self.assertEqual(len(autos), 1)
+        self.assertEqual(autos[0][0], 2.0)
+        self.assertAlmostEqual(autos[0][1] - phases[1][1], seconds_to_reach(2.0))
+        self.assertEqual(send.await_args.args[1]["balance"], "120.00")
+        self.assertEqual([phase for phase, _ in phases], ["betting", "flying", "crashed"])
+        self.assertEqual(len(ticks), int(flight))  # ~1/s instead of ~8/s
+        self.assertAlmostEqual(phases[2][1] - phases[1][1], flight)
+
+
+class BingoSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_in_progress_room_waits_before_each_draw(self):
+        room = RoomState(room_id="r1", name="Lobby", status="in_progress")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        slot = bingo_loop._RoomSlot("r1")
+
+        with (
+            mock.patch(
+                "app.bingo.game_loop.redis_store.get_room",
+                new=mock.AsyncMock(return_value=room),
+            ),
+            mock.patch(
+                "app.bingo.game_loop._draw_number",
+                new=mock.AsyncMock(return_value="drawn"),
+            ) as draw,
+            mock.patch(
+                "app.bingo.game_loop.service.auto_detect_winners",
+                new=mock.AsyncMock(side_effect=[(room, False), (room, True)]),
+            ),
+        ):
+            first = await bingo_loop._advance_room(slot)
+            draw.assert_not_awaited()
+            second = await bingo_loop._advance_room(slot)
+            third = await bingo_loop._advance_room(slot)
+
+        self.assertGreater(first, 0)
+        self.assertGreater(second, 0)
+        self.assertEqual(third, 0.0)
+        self.assertEqual(draw.await_count, 2)
+        self.assertFalse(slot.draw_armed)
+
+    async def test_leases_are_claimed_in_one_batch_and_gate_steps(self):
+        scheduler = bingo_loop._Scheduler()
+        rooms = ["a", "b", "c"]
+        held = {bingo_loop.room_shard("a")}
+        pipe = mock.AsyncMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.sadd = mock.Mock()
+        pipe.smembers = mock.Mock()
+        pipe.execute.return_value = [3, set(rooms)]
+        redis = mock.Mock()
+        redis.pipeline.return_value = pipe
+
+        async def claim(_redis, calls):
+            return [int(keys[0].endswith(f":{next(iter(held))}")) for _, keys, _ in calls]
+
+        with (
+            mock.patch("app.bingo.game_loop.redis_store.get_redis", return_value=redis),
+            mock.patch("app.bingo.game_loop.eval_many", side_effect=claim) as batch,
+        ):
+            for room_id in rooms:
+                scheduler.rooms[room_id] = bingo_loop._RoomSlot(room_id)
+            await scheduler._refresh_leases()
+
+        batch.assert_awaited_once()
+        self.assertEqual(scheduler.shards, held)
+        scheduled = {room_id for _, _, room_id in scheduler._heap}
+        self.assertEqual(
+            scheduled, {r for r in rooms if bingo_loop.room_shard(r) in held}
+        )
+
+    async def test_room_dropped_by_another_leader_survives_a_rejoin(self):
+        redis = _SharedSetRedis()
+        leader, follower = bingo_loop._Scheduler(), bingo_loop._Scheduler()
+
+        async def claim(_redis, calls):
+            return [1] * len(calls)
+
+        with (
+            mock.patch("app.bingo.game_loop.redis_store.get_redis", return_value=redis),
+            mock.patch("app.bingo.game_loop.eval_many", side_effect=claim),
+            mock.patch.object(leader, "_run", new=mock.AsyncMock()),
+            mock.patch.object(follower, "_run", new=mock.AsyncMock()),
+        ):
+            follower.ensure("r1")
+            await follower._refresh_leases()
+            await leader._refresh_leases()
+            self.assertIn("r1", leader.rooms)
+
+            await leader.drop("r1")
+            follower.ensure("r1")  # player rejoins on the follower
+            await follower._refresh_leases()
+            await leader._refresh_leases()
+
+        self.assertIn("r1", redis.members)
+        self.assertIn("r1", follower.rooms)
+        self.assertIn("r1", leader.rooms)
+
+
+class _SharedSetRedis:
+    """The ``ACTIVE_ROOMS_KEY`` set shared by several schedulers."""
+
+    def __init__(self) -> None:
+        self.members: set[str] = set()
+
+    async def srem(self, _key, *members):
+        self.members.difference_update(members)
+
+    def pipeline(self, transaction=False):
+        return _SharedSetPipe(self)
+
+
+class _SharedSetPipe:
+    def __init__(self, redis: _SharedSetRedis) -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    def sadd(self, _key, *members):
+        self.ops.append(("sadd", members))
+
+    def smembers(self, _key):
+        self.ops.append(("smembers", ()))
+
+    async def execute(self):
+        results = []
+        for op, members in self.ops:
+            if op == "sadd":
+                self.redis.members.update(members)
+                results.append(len(members))
+            else:
+                results.append(set(self.redis.members))
+        return results
+
+
+class BingoSendQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_writer_coalesces_ticks_and_keeps_order(self):
+        from app.bingo.manager import ConnectionManager
+
+        hub = ConnectionManager()
+        websocket = mock.AsyncMock()
+        await hub.connect("r1", "u1", "One", websocket)
+
+        for remaining in (5, 4, 3):
+            await hub.deliver_local("r1", {"type": "lobby_tick", "remaining": remaining})
+        await hub.deliver_local("r1", {"type": "ball", "number": 7})
+        for _ in range(100):
+            if websocket.send_text.await_count >= 2:
+                break
+            await asyncio.sleep(0.01)
+
+        sent = [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+        self.assertEqual(
+            sent,
+            [
+                {"type": "lobby_tick", "remaining": 3},
+                {"type": "ball", "number": 7},
+            ],
+        )
+        await hub.disconnect("r1", "u1")
+
+    async def test_overflowing_client_is_disconnected(self):
+        from app.bingo.manager import ConnectionManager
+        from app.core.ws_hub import OVERFLOW_CLOSE_CODE
+
+        hub = ConnectionManager()
+        stuck = asyncio.Event()
+        websocket = mock.AsyncMock()
+
+        async def stuck_send(_payload):
+            await stuck.wait()
+
+        websocket.send_text.side_effect = stuck_send
+        await hub.connect("r1", "u1", "One", websocket)
+
+        with mock.patch("app.core.ws_hub.settings") as settings:
+            settings.WS_SEND_QUEUE = 3
+            for number in range(6):
+                await hub.deliver_local("r1", {"type": "ball", "number": number})
+            await asyncio.sleep(0.01)
+
+        websocket.close.assert_awaited_once()
+        self.assertEqual(websocket.close.await_args.kwargs["code"], OVERFLOW_CLOSE_CODE)
+        self.assertTrue(await hub.disconnect("r1", "u1"))
+
+
+class UserHubTests(unittest.IsolatedAsyncioTestCase):
+    async def test_broadcast_encodes_once_for_every_socket(self):
+        from app.core import ws_hub
+        from app.lotto.manager import LottoHub
+
+        hub = LottoHub()
+        fanout = mock.Mock()
+        hub.bind_fanout(fanout)
+        sockets = [mock.AsyncMock() for _ in range(3)]
+        await hub.connect("u1", "", sockets[0])
+        await hub.connect("u1", "", sockets[1])
+        await hub.connect("u2", "", sockets[2])
+
+        with mock.patch.object(ws_hub, "encode", wraps=ws_hub.encode) as encode:
+            await hub.broadcast({"type": "rooms_updated", "rooms": []})
+            await asyncio.sleep(0.01)
+
+        encode.assert_called_once()
+        payloads = {s.send_text.await_args.args[0] for s in sockets}
+        self.assertEqual(len(payloads), 1)
+        fanout.publish_encoded.assert_called_once_with(
+            payloads.pop(), **{ORIGIN_FIELD: hub.instance_id}
+        )
+
+    async def test_targeted_frame_reaches_only_that_users_sockets(self):
+        from app.aviator.manager import AviatorHub
+        from app.core.redis_fanout import TARGET_FIELD
+
+        hub = AviatorHub()
+        old, new, other = mock.AsyncMock(), mock.AsyncMock(), mock.AsyncMock()
+        stale_token = await hub.connect("u1", "One", old)
+        await hub.connect("u1", "One", new)
+        await hub.connect("u2", "Two", other)
+
+        await hub.dispatch_fanout_frame({TARGET_FIELD: "u1"}, '{"type":"wallet"}')
+        await asyncio.sleep(0.01)
+
+        old.close.assert_awaited_once()
+        old.send_text.assert_not_awaited()
+        new.send_text.assert_awaited_once_with('{"type":"wallet"}')
+        other.send_text.assert_not_awaited()
+        self.assertFalse(await hub.disconnect("u1", stale_token))
+        self.assertTrue(hub.is_connected("u1"))
+
+
+class BingoClusterTests(unittest.IsolatedAsyncioTestCase):
+    def test_ring_is_stable_and_moves_few_rooms(self):
+        rooms = [f"room-{n}" for n in range(500)]
+        two = cluster.HashRing({"a": "wss://a", "b": "wss://b"})
+        three = cluster.HashRing({"a": "wss://a", "b": "wss://b", "c": "wss://c"})
+
+        self.assertEqual(
+            [two.owner(r) for r in rooms],
+            [cluster.HashRing({"b": "", "a": ""}).owner(r) for r in rooms],
+        )
+        moved = [r for r in rooms if two.owner(r) != three.owner(r)]
+        self.assertTrue(all(three.owner(r) == "c" for r in moved))
+        self.assertLess(len(moved), len(rooms) // 2)
+        self.assertIsNone(cluster.HashRing({}).owner("room-1"))
+
+    async def test_owner_serves_room_from_memory_and_writes_behind(self):
+        room = RoomState(room_id="r1", name="Lobby")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        store = redis_store._OwnedRooms()
+        load = mock.AsyncMock(return_value=room)
+        redis = _LeaseRedis()
+
+        with (
+            mock.patch.object(redis_store, "_owned_rooms", store),
+            mock.patch.object(redis_store, "_load_room", new=load),
+            mock.patch.object(redis_store.cluster, "enabled", return_value=True),
+            mock.patch.object(redis_store.cluster, "is_owner", return_value=True),
+            mock.patch("app.bingo.redis_store.get_redis", return_value=redis),
+            mock.patch("app.bingo.redis_store.settings") as settings,
+        ):
+            settings.BINGO_CLUSTER_FLUSH_MS = 1
+            first = await redis_store.get_room("r1", parts=("players",))
+            first.status = "in_progress"
+            first.players["u1"].connected = False
+            again = await redis_store.get_room("r1", parts=("players",))
+            self.assertEqual(again.status, "lobby")
+            self.assertTrue(again.players["u1"].connected)
+
+            async with redis_store.room_lock("r1"):
+                await redis_store.save_room(first)
+
+            saved = await redis_store.get_room("r1", parts=("players",))
+            self.assertEqual(saved.status, "in_progress")
+            self.assertFalse(saved.players["u1"].connected)
+            self.assertEqual(redis.executed, 0)
+            await asyncio.sleep(0.05)
+
+        load.assert_awaited_once()
+        self.assertEqual(redis.executed, 1)
+        self.assertEqual(redis.data[redis_store._meta_key("r1")]["status"], json.dumps("in_progress"))
+        self.assertEqual(redis.data[redis_store._owner_key("r1")], f"{cluster.instance_id}:1")
+
+    async def test_room_lease_fences_a_stale_owner(self):
+        room = RoomState(room_id="r1", name="Lobby")
+        redis = _LeaseRedis()
+        old, new = redis_store._OwnedRooms(), redis_store._OwnedRooms()
+
+        with (
+            mock.patch.object(redis_store, "_load_room", new=mock.AsyncMock(return_value=room)),
+            mock.patch.object(redis_store.cluster, "enabled", return_value=True),
+            mock.patch("app.bingo.redis_store.get_redis", return_value=redis),
+            mock.patch.object(redis_store.cluster, "instance_id", "old"),
+        ):
+            stale = await old.get("r1", redis_store.ROOM_PARTS)
+
+            # While the old owner's lease stands nobody else may serve the room.
+            with mock.patch.object(redis_store.cluster, "instance_id", "new"):
+                with self.assertRaises(redis_store.RoomLeaseError):
+                    await new.get("r1", redis_store.ROOM_PARTS)
+
+                # Once it lapses the new owner claims the next epoch ...
+                del redis.data[redis_store._owner_key("r1")]
+                current = await new.get("r1", redis_store.ROOM_PARTS)
+                current.status = "in_progress"
+                await new.put(current, ())
+                await new.flush(["r1"])
+
+            # ... and the old owner's late write-behind is refused.
+            stale.status = "finished"
+            await old.put(stale, ())
+            with self.assertRaises(redis_store.RoomLeaseError):
+                await old.flush(["r1"])
+
+        self.assertEqual(redis.executed, 2)
+        self.assertEqual(redis.data[redis_store._meta_key("r1")]["status"], json.dumps("in_progress"))
+        self.assertEqual(redis.data[redis_store._owner_key("r1")], "new:2")
+        self.assertNotIn("r1", old._rooms)
+
+    async def test_settlement_waits_for_the_room_lease(self):
+        grid = generate_card_for_board(7)
+        room = RoomState(room_id="r1", name="Lobby", status="in_progress", game_id="G1", board_price="10")
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        room.cards["7"] = CardState(card_id="7", user_id="u1")
+        room.drawn = [value for value in grid[2] if value is not None]
+
+        @asynccontextmanager
+        async def fake_lock(_room_id):
+            yield
+
+        with (
+            mock.patch("app.bingo.service.room_lock", fake_lock),
+            mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
+            mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()),
+            mock.patch(
+                "app.bingo.service.redis_store.commit_room",
+                new=mock.AsyncMock(side_effect=redis_store.RoomLeaseError("moved")),
+            ),
+            mock.patch("app.bingo.service.wallet.award_prizes_async", new=mock.AsyncMock()) as award,
+            mock.patch("app.bingo.service.wallet.record_round_finish_async", new=mock.AsyncMock()) as finish,
+            mock.patch("app.bingo.house_bot.cached_bot_user_id", return_value=None),
+        ):
+            with self.assertRaises(redis_store.RoomLeaseError):
+                await bingo_service._settle_winners("r1")
+
+        award.assert_not_awaited()
+        finish.assert_not_awaited()
+
+    def test_scheduler_leads_ring_owned_rooms_in_cluster_mode(self):
+        scheduler = bingo_loop._Scheduler()
+
+        with (
+            mock.patch.object(bingo_loop.cluster, "enabled", return_value=True),
+            mock.patch.object(
+                bingo_loop.cluster, "is_owner", side_effect=lambda r: r == "mine"
+            ),
+        ):
+            self.assertTrue(scheduler.leads("mine"))
+            self.assertFalse(scheduler.leads("theirs"))
+
+    async def test_cluster_mode_needs_a_public_url(self):
+        with mock.patch.object(cluster, "settings") as settings:
+            settings.BINGO_CLUSTER_MODE = True
+            settings.BINGO_CLUSTER_PUBLIC_URL = ""
+            with self.assertRaisesRegex(RuntimeError, "BINGO_CLUSTER_PUBLIC_URL"):
+                await cluster.start()
+
+        self.assertIsNone(cluster._task)
+
+    async def test_join_is_rejected_off_the_owner(self):
+        with (
+            mock.patch.object(bingo_service.cluster, "is_owner", return_value=False),
+            mock.patch.object(bingo_service.cluster, "owner_url", return_value="wss://b"),
+            mock.patch("app.bingo.service.get_room", new=mock.AsyncMock()) as get_room,
+        ):
+            with self.assertRaises(bingo_service.RoomNotOwnedError) as caught:
+                await bingo_service.join_room("r1", "u1", "One", "10.00")
+
+        self.assertEqual(caught.exception.origin, "wss://b")
+        get_room.assert_not_awaited()
+
+    async def test_ring_change_redirects_sockets_of_moved_rooms(self):
+        from app.bingo import ws as bingo_ws
+        from app.bingo.manager import ConnectionManager
+
+        manager = ConnectionManager()
+        sockets = {room_id: mock.AsyncMock() for room_id in ("mine", "moved")}
+        for room_id, websocket in sockets.items():
+            await manager.connect(room_id, "u1", "One", websocket)
+
+        with (
+            mock.patch.object(bingo_ws, "manager", manager),
+            mock.patch.object(bingo_ws.cluster, "is_owner", side_effect=lambda r: r == "mine"),
+            mock.patch.object(bingo_ws.cluster, "owner_url", return_value="wss://b"),
+        ):
+            await bingo_ws._redirect_moved_rooms()
+
+        sockets["mine"].close.assert_not_awaited()
+        moved = sockets["moved"]
+        moved.send_text.assert_awaited_once()
+        self.assertEqual(json.loads(moved.send_text.await_args.args[0]), {"type": "redirect", "origin": "wss://b"})
+        self.assertEqual(moved.close.await_args.kwargs["code"], bingo_ws.REDIRECT_CLOSE_CODE)
+
+
+class BingoWinIndexTests(unittest.TestCase):
+    def test_incremental_index_matches_full_validation(self):
+        cards = {
+            str(board_id): CardState(
+                card_id=str(board_id),
+                user_id="u1",
+                numbers=generate_card_for_board(board_id),
+            )
+            for board_id in range(1, 401, 7)
+        }
+        # One non-deterministic grid exercises the per-round fallback index.
+        cards["custom"] = CardState(
+            card_id="custom",
+            user_id="u2",
+            numbers=[[1, 2, 3, 4, 5]] * 5,
+        )
+        index = RoundWinIndex("G1", cards, 400)
+        drawn: list[int] = []
+        first_hit: list[str] = []
+
+        for ball in shuffled_draw_order():
+            drawn.append(ball)
+            completed = index.advance(drawn, DEFAULT_PATTERNS)
+            expected = {
+                card_id
+                for card_id, card in cards.items()
+                if find_winning_pattern(card.numbers, set(drawn)) is not None
+            }
+            self.assertTrue(set(completed) <= expected)
+            if expected and not first_hit:
+                first_hit = completed
+                self.assertEqual(set(completed), expected)
+
+        self.assertTrue(first_hit)
+
+
+class BingoAutoDetectRetryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_settlement_is_retried_on_the_next_ball(self):
+        grid = generate_card_for_board(1)
+        room = RoomState(room_id="auto1", name="Lobby", status="in_progress", game_id="G1")
+        room.cards["1"] = CardState(card_id="1", user_id="u1")
+        room.drawn = [value for value in grid[2] if value is not None]
+        spare = next(n for n in range(1, 76) if all(n not in row for row in grid))
+        settle = mock.AsyncMock(side_effect=[RuntimeError("db down"), (room, True)])
+
+        with (
+            mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
+            mock.patch("app.bingo.service._settle_winners", new=settle),
+            mock.patch.dict(bingo_service._win_indexes, clear=True),
+        ):
+            with self.assertRaises(RuntimeError):
+                await bingo_service.auto_detect_winners("auto1")
+            room.drawn = [*room.drawn, spare]
+            _, won = await bingo_service.auto_detect_winners("auto1")
+
+        self.assertTrue(won)
+        self.assertEqual(settle.await_count, 2)
+
+
+@unittest.skipUnless(validator.np is not None, "numpy backend not installed")
+class BingoPoolCardNumpyTests(unittest.IsolatedAsyncioTestCase):
+    """Pool cartelas reach the numpy validator as ``card.row()`` bytes."""
+
+    def _room(self) -> RoomState:
+        grid = generate_card_for_board(7)
+        room = RoomState(
+            room_id="pool1", name="Lobby", status="in_progress", game_id="G1", board_price="10", derash="20.00"
+        )
+        room.players["u1"] = PlayerState(user_id="u1", display_name="One")
+        room.players["u2"] = PlayerState(user_id="u2", display_name="Two")
+        room.cards["7"] = CardState(card_id="7", user_id="u1")
+        room.cards["8"] = CardState(card_id="8", user_id="u2")
+        room.drawn = [value for value in grid[2] if value is not None]
+        return room
+
+    def _patches(self, room: RoomState):
+        @asynccontextmanager
+        async def fake_lock(_room_id):
+            yield
+
+        return (
+            mock.patch("app.bingo.service.room_lock", fake_lock),
+            mock.patch("app.bingo.service.get_room", new=mock.AsyncMock(return_value=room)),
+            mock.patch("app.bingo.service.save_room", new=mock.AsyncMock()),
+        )
+
+    async def test_settle_pays_the_winning_pool_card(self):
+        room = self._room()
+        self.assertIsInstance(room.cards["7"].row(), bytes)
+        lock, get_room, save_room = self._patches(room)
+        award = mock.AsyncMock(return_value={})
+
+        with (
+            lock,
+            get_room,
+            save_room,
+            mock.patch("app.bingo.service.wallet.award_prizes_async", award),
+            mock.patch("app.bingo.service.wallet.record_round_finish_async", new=mock.AsyncMock()),
+            mock.patch("app.bingo.service.manager.broadcast", new=mock.AsyncMock()),
+            mock.patch("app.bingo.service.broadcast_room_sync", new=mock.AsyncMock()),
+            mock.patch("app.bingo.house_bot.cached_bot_user_id", return_value=None),
+        ):
+            settled, won = await bingo_service._settle_winners("pool1")
+
+        self.assertTrue(won)
+        self.assertEqual(settled.winning_card_id, "7")
+        self.assertEqual(list(award.await_args.args[0]), ["u1"])
+
+    async def test_claim_validates_a_pool_card(self):
+        room = self._room()
+        lock, get_room, save_room = self._patches(room)
+        settle = mock.AsyncMock(return_value=(room, True))
+
+        with lock, get_room, save_room, mock.patch("app.bingo.service._settle_winners", new=settle):
+            valid, pattern, _ = await bingo_service.claim_bingo("pool1", "u1", "7")
+            rejected, _, _ = await bingo_service.claim_bingo("pool1", "u2", "8")
+
+        self.assertTrue(valid)
+        self.assertEqual(pattern.name, "row_2")
+        self.assertFalse(rejected)
+        settle.assert_awaited_once()
+
+
 class LottoLeaderLockTests(unittest.TestCase):
     def test_follower_does_not_run_process_when_lock_held(self):
         """Follower path sleeps and retries; _process is only called as leader."""
@@ -181,5 +1508,54 @@ class FanoutOriginSmokeTests(unittest.TestCase):
         self.assertEqual(ORIGIN_FIELD, "_origin")
 
 
+class FanoutFrameTests(unittest.IsolatedAsyncioTestCase):
+    def test_frame_round_trip_keeps_payload_text(self):
+        payloads = [json.dumps({"type": "tick", "m": 1.5}), json.dumps({"text": "a\nb"})]
+        frame = redis_fanout.encode_frame([({ORIGIN_FIELD: "p1"}, payloads[0]), ({}, payloads[1])])
+
+        self.assertEqual(
+            redis_fanout.decode_frame(frame),
+            [({ORIGIN_FIELD: "p1"}, payloads[0]), ({}, payloads[1])],
+        )
+        self.assertIsNone(redis_fanout.decode_frame(payloads[0]))
+
+    async def test_burst_is_published_as_one_frame_per_channel(self):
+        pipe = mock.AsyncMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.publish = mock.Mock()
+        redis = mock.Mock()
+        redis.pipeline.return_value = pipe
+        batcher = redis_fanout.FrameBatcher()
+
+        with (
+            mock.patch("app.core.redis_fanout.get_redis", return_value=redis),
+            mock.patch("app.core.redis_fanout.settings") as settings,
+        ):
+            settings.REDIS_FANOUT_BATCH_MS = 1.0
+            for n in range(5):
+                batcher.add("aviator:events", {ORIGIN_FIELD: "p1"}, json.dumps({"n": n}))
+            batcher.add("lotto:events", {}, "{}")
+            await asyncio.sleep(0.05)
+
+        pipe.execute.assert_awaited_once()
+        published = dict(call.args for call in pipe.publish.call_args_list)
+        self.assertEqual(set(published), {"aviator:events", "lotto:events"})
+        entries = redis_fanout.decode_frame(published["aviator:events"])
+        self.assertEqual([json.loads(p)["n"] for _, p in entries], [0, 1, 2, 3, 4])
+
+    async def test_entries_skip_decode_unless_control(self):
+        encoded = mock.AsyncMock()
+        decoded = mock.AsyncMock()
+        entries = [
+            ({ORIGIN_FIELD: "p2"}, '{"type": "tick"}'),
+            ({redis_fanout.CONTROL_FIELD: 1}, '{"type": "_room_sync"}'),
+        ]
+
+        await redis_fanout.dispatch_entries(entries, decoded, encoded)
+
+        encoded.assert_awaited_once_with({ORIGIN_FIELD: "p2"}, '{"type": "tick"}')
+        decoded.assert_awaited_once_with({"type": "_room_sync"})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -420,8 +420,7 @@ export default function BingoGame({
       ? roomState.cards
       : (roomState.my_boards ?? []).map((boardId) => ({
           card_id: String(boardId),
-          numbers: [] as BingoCard["numbers"],
-          marks: [] as BingoCard["marks"],
+          marks: 0 as BingoCard["marks"],
         }));
   const isPlayer = playCards.length > 0;
   const youWon =
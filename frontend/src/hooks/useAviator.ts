@@ -5,13 +5,19 @@ import { aviatorWebSocketUrl } from "../services/aviator";
 import type {
   AviatorBetRow,
   AviatorClientMessage,
+  AviatorCurve,
   AviatorRoundState,
   AviatorServerMessage,
 } from "../types/aviator";
 
-/** Must match backend `crash.py`. */
+/** Fallback until the server sends its curve; matches backend `crash.py`. */
 export const AVIATOR_START_MULT = 1.0;
 export const AVIATOR_MULT_GROWTH = 0.075;
+const DEFAULT_CURVE: AviatorCurve = {
+  start: AVIATOR_START_MULT,
+  growth: AVIATOR_MULT_GROWTH,
+  max: 15,
+};
 
 interface UseAviatorOptions {
   token: string | null;
@@ -19,9 +25,19 @@ interface UseAviatorOptions {
   onBalance?: (balance: string) => void;
 }
 
-function predictMultiplier(flyingStartedAt: number, crashCap?: number | null): number {
-  const elapsed = Math.max(0, Date.now() / 1000 - flyingStartedAt);
-  let mult = AVIATOR_START_MULT * Math.exp(AVIATOR_MULT_GROWTH * elapsed);
+/**
+ * The server only sends the flight start plus a sync frame about once a
+ * second, so the live multiplier is extrapolated here. `clockOffset` is
+ * server minus local clock (seconds), taken from each frame's `server_now`.
+ */
+function predictMultiplier(
+  flyingStartedAt: number,
+  curve: AviatorCurve,
+  clockOffset: number,
+  crashCap?: number | null,
+): number {
+  const elapsed = Math.max(0, Date.now() / 1000 + clockOffset - flyingStartedAt);
+  let mult = Math.min(curve.max, curve.start * Math.exp(curve.growth * elapsed));
   if (crashCap != null && crashCap > 0) mult = Math.min(mult, crashCap);
   // Keep full precision for animation; the UI rounds only when rendering text.
   return mult;
@@ -38,6 +54,8 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
 
   const roundRef = useRef(round);
   const serverMultRef = useRef(AVIATOR_START_MULT);
+  const curveRef = useRef<AviatorCurve>(DEFAULT_CURVE);
+  const clockOffsetRef = useRef(0);
   const animFrameRef = useRef<number | null>(null);
   const pendingActionRef = useRef<"bet" | "cashout" | null>(null);
 
@@ -61,7 +79,12 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
       let target = serverMultRef.current;
 
       if (rnd?.phase === "flying" && rnd.flying_started_at) {
-        target = predictMultiplier(rnd.flying_started_at, rnd.crash_multiplier);
+        target = predictMultiplier(
+          rnd.flying_started_at,
+          curveRef.current,
+          clockOffsetRef.current,
+          rnd.crash_multiplier,
+        );
       } else if (rnd?.phase === "crashed" && rnd.crash_multiplier) {
         target = rnd.crash_multiplier;
       }
@@ -103,9 +126,18 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
     setPendingAction(null);
     pendingActionRef.current = null;
     serverMultRef.current = AVIATOR_START_MULT;
+    clockOffsetRef.current = 0;
   }, [enabled]);
 
+  const syncClock = useCallback((serverNow: number | undefined) => {
+    if (typeof serverNow === "number") {
+      clockOffsetRef.current = serverNow - Date.now() / 1000;
+    }
+  }, []);
+
   const applyRound = useCallback((data: AviatorRoundState & { history?: number[] }) => {
+    syncClock(data.server_now);
+    if (data.curve) curveRef.current = data.curve;
     setRound(data);
     if (data.history) setHistory(data.history);
     if (data.multiplier != null) {
@@ -118,7 +150,7 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
       setMultiplier(data.crash_multiplier);
       serverMultRef.current = data.crash_multiplier;
     }
-  }, []);
+  }, [syncClock]);
 
   const applyBalance = useCallback((value: string | undefined) => {
     if (!value) return;
@@ -168,6 +200,7 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
           applyRound(data);
           break;
         case "tick":
+          syncClock(data.server_now);
           setMultiplier(data.multiplier);
           serverMultRef.current = data.multiplier;
           setRound((prev) => (prev ? { ...prev, phase: data.phase } : prev));
@@ -208,7 +241,7 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
           break;
       }
     },
-    [applyRound, applyBalance, mergeBetDelta],
+    [applyRound, applyBalance, mergeBetDelta, syncClock],
   );
 
   const { status, send } = useWebSocket<AviatorServerMessage, AviatorClientMessage>({
@@ -221,12 +254,12 @@ export function useAviator({ token, enabled, onBalance }: UseAviatorOptions) {
     sendRef.current = send;
   }, [send]);
 
-  const placeBet = useCallback((stake: string, slot = 0) => {
+  const placeBet = useCallback((stake: string, slot = 0, autoCashoutAt?: number) => {
     if (pendingActionRef.current) return;
     pendingActionRef.current = "bet";
     setPendingAction("bet");
     setError(null);
-    sendRef.current({ type: "bet", stake, slot });
+    sendRef.current({ type: "bet", stake, slot, auto_cashout_at: autoCashoutAt });
   }, []);
 
   const cashOut = useCallback((slot?: number, betId?: string) => {
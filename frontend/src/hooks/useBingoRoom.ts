@@ -63,11 +63,14 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
   const BOARD_TAP_COOLDOWN_MS = 200;
   const CLAIM_COOLDOWN_MS = 2500;
 
+  // Set when the server redirects us to the instance that owns this room.
+  const [socketOrigin, setSocketOrigin] = useState<string | null>(null);
+
   const url = useMemo(() => {
     if (!roomId || !token) return null;
 
-    return bingoWebSocketUrl(roomId, token);
-  }, [roomId, token]);
+    return bingoWebSocketUrl(roomId, token, socketOrigin);
+  }, [roomId, token, socketOrigin]);
 
   const flashToast = useCallback((message: string) => {
     setToast(message);
@@ -97,6 +100,15 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
   }, []);
 
   const sendRef = useRef<((msg: BingoClientMessage) => void) | null>(null);
+  // Mirror of `drawn` readable synchronously inside the message handler, so
+  // sequence-numbered `ball` deltas can be applied (or a gap detected)
+  // without waiting for a React render.
+  const drawnRef = useRef<number[]>([]);
+
+  const applyDrawn = useCallback((next: number[]) => {
+    drawnRef.current = next;
+    setDrawn(next);
+  }, []);
 
   const handleMessage = useCallback(
     (message: BingoServerMessage) => {
@@ -106,7 +118,7 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
           setPlayerCount(
             message.player_count ?? message.players.filter((p) => p.connected).length,
           );
-          setDrawn(message.drawn);
+          applyDrawn(message.drawn);
           setCurrentBall(message.current_ball);
           syncCountdown(message.seconds_left, message.status === "lobby");
           // Rehydrate the winner overlay after a refresh/reconnect: if the
@@ -171,10 +183,27 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
           syncCountdown(message.seconds_left, true);
           break;
 
-        case "ball":
-          setDrawn(message.drawn);
-          setCurrentBall(message.number);
+        case "ball": {
+          if (message.drawn) {
+            applyDrawn(message.drawn);
+            setCurrentBall(message.number);
+            break;
+          }
+          const known = drawnRef.current;
+          if (message.seq === known.length + 1) {
+            applyDrawn([...known, message.number]);
+            setCurrentBall(message.number);
+          } else if (
+            message.seq > known.length + 1 ||
+            known[message.seq - 1] !== message.number
+          ) {
+            // Missed at least one ball, or still holding a previous round's
+            // draws (missed its reset room_state) - the room_state reply
+            // restores the full drawn list and current ball.
+            sendRef.current?.({ type: "resync" });
+          }
           break;
+        }
 
         case "game_over":
           setGameOver(message);
@@ -213,6 +242,10 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
           break;
         }
 
+        case "redirect":
+          setSocketOrigin(message.origin);
+          break;
+
         case "pong":
         case "bingo_result":
           if (message.type === "bingo_result" && !message.valid) {
@@ -225,7 +258,7 @@ export function useBingoRoom(roomId: string | null, token: string | null): UseBi
           break;
       }
     },
-    [flashLottoNotice, flashToast, syncCountdown],
+    [applyDrawn, flashLottoNotice, flashToast, syncCountdown],
   );
 
   const { status, send, reconnectAttempt, latencyMs } = useWebSocket<
@@ -40,8 +40,13 @@ export async function findOrCreateRoom(): Promise<RoomSummary> {
   return response.data;
 }
 
-export function bingoWebSocketUrl(roomId: string, token: string): string {
+export function bingoWebSocketUrl(
+  roomId: string,
+  token: string,
+  origin?: string | null,
+): string {
   const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  const base = origin || `${protocol}//${window.location.host}`;
 
-  return `${protocol}//${window.location.host}/ws/bingo/${roomId}?token=${encodeURIComponent(token)}`;
+  return `${base}/ws/bingo/${roomId}?token=${encodeURIComponent(token)}`;
 }
@@ -9,6 +9,15 @@ export interface AviatorBetRow {
   status: "active" | "cashed" | "lost";
   cashout_at?: number | null;
   win?: string | null;
+  /** Target the server cashes this bet out at, if set when betting. */
+  auto_cashout_at?: number | null;
+}
+
+/** Multiplier curve: mult = start * exp(growth * seconds), capped at max. */
+export interface AviatorCurve {
+  start: number;
+  growth: number;
+  max: number;
 }
 
 export interface AviatorRoundState {
@@ -20,6 +29,9 @@ export interface AviatorRoundState {
   betting_ends_at?: number | null;
   betting_seconds_left?: number;
   flying_started_at?: number | null;
+  /** Server clock (epoch seconds) when the frame was built. */
+  server_now?: number;
+  curve?: AviatorCurve;
   total_stake?: string;
   total_payout?: string;
   pool_remaining?: string;
@@ -31,7 +43,7 @@ export interface AviatorRoundState {
 export type AviatorClientMessage =
   | { type: "ping" }
   | { type: "snapshot" }
-  | { type: "bet"; stake: string; slot?: number }
+  | { type: "bet"; stake: string; slot?: number; auto_cashout_at?: number }
   | { type: "cashout"; bet_id?: string; slot?: number };
 
 export type AviatorServerMessage =
@@ -41,6 +53,7 @@ export type AviatorServerMessage =
       round_id: string;
       multiplier: number;
       phase: AviatorPhase;
+      server_now?: number;
     }
   | {
       type: "bet_placed";
@@ -2,12 +2,15 @@ export type RoomStatus = "lobby" | "in_progress" | "finished";
 
 export type BingoCell = number | null;
 export type BingoCardGrid = BingoCell[][];
-export type BingoMarksGrid = boolean[][];
+// 25-bit row-major marked mask (bit = row * 5 + col), FREE center included.
+export type BingoMarksMask = number;
 
 export interface BingoCard {
   card_id: string;
-  numbers: BingoCardGrid;
-  marks: BingoMarksGrid;
+  // Only present for non-standard grids; pool boards are rendered from
+  // card_id with the shared deterministic generator (utils/cartela.ts).
+  numbers?: BingoCardGrid;
+  marks: BingoMarksMask;
 }
 
 export interface RoomPlayer {
@@ -81,6 +84,7 @@ export type BingoClientMessage =
   | { type: "deselect_board"; board_id: number }
   | { type: "deselect_all" }
   | { type: "claim_bingo"; card_id: string }
+  | { type: "resync" }
   | { type: "ping" };
 
 // ---------------------------------------------------------------------------
@@ -182,8 +186,19 @@ export interface LottoNoticeMessage {
 
 export interface BallMessage {
   type: "ball";
+  // 1-based position of this ball in the round. A gap means a missed frame:
+  // the client asks for a `resync` to get the full drawn list back.
+  seq: number;
   number: number;
-  drawn: number[];
+  // Only sent by older servers (full list on every ball).
+  drawn?: number[];
+}
+
+// Cluster mode: the room lives on another backend instance. Reconnect to
+// the same path on `origin` (scheme + host, e.g. "wss://bingo-2.example.com").
+export interface RedirectMessage {
+  type: "redirect";
+  origin: string;
 }
 
 export interface BingoResultMessage {
@@ -228,6 +243,7 @@ export type BingoServerMessage =
   | BingoResultMessage
   | GameOverMessage
   | ErrorMessage
+  | RedirectMessage
   | PongMessage;
 
 export const BINGO_COLUMN_LETTERS = ["B", "I", "N", "G", "O"] as const;